@@ -13,16 +13,21 @@ import os
 # Add src to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.analyzers.content import ContentAnalyzer
-from src.analyzers.grammar import GrammarAnalyzer
-from src.analyzers.sentiment import SentimentAnalyzer
-from src.analyzers.metrics import MetricsAnalyzer
+from src import config
 from src.analyzers.semantic import SemanticAnalyzer
+from src.engine import evaluate_text
+from src.engine.incremental import IncrementalEvaluator
+from src.engine.preview import LivePreview
+from src.store import cohort_summary, get_feature_store, record_evaluation, student_progress, text_hash
+from src.store.embeddings import find_similar
+from src.store.percentiles import ordinal
+from src.store.rankings import RANKING_CATEGORIES, find_outliers, top_and_bottom
 from src.utils.feedback_generator import (
     generate_comprehensive_feedback,
     generate_why_explanation
 )
 from src.utils.pdf_generator import generate_pdf_report
+from src.utils.telemetry import get_telemetry, load_snapshot, stage_timer
 from datetime import datetime
 
 # Page configuration
@@ -253,6 +258,14 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def load_whisper_model(name):
+    """Load a Whisper model once per server process instead of on every upload"""
+    import whisper
+    
+    with stage_timer("model_load.whisper"):
+        return whisper.load_model(name)
+
 def get_score_badge(score, max_score):
     """Return HTML for score badge based on percentage"""
     percentage = (score / max_score) * 100
@@ -401,46 +414,374 @@ def create_bar_chart(categories, scores, max_scores):
     
     return fig
 
-def evaluate_text(text, audio_duration=None):
-    """Evaluate the input text and return results
+def create_latency_chart(stages):
+    """Create a grouped horizontal bar chart of p50/p95/p99 latency (ms) per stage"""
+    names = list(stages)
+    fig = go.Figure()
     
-    Args:
-        text (str): The text to evaluate
-        audio_duration (float, optional): Duration of audio in minutes for accurate WPM calculation
-    """
-    # Content Analysis
-    content_analyzer = ContentAnalyzer(text)
-    keywords_result = content_analyzer.check_keywords()
-    flow_result = content_analyzer.check_flow()
-    salutation_result = content_analyzer.check_salutation()
-    
-    # Grammar Analysis
-    grammar_analyzer = GrammarAnalyzer(text)
-    grammar_result = grammar_analyzer.count_grammar_errors()
-    filler_result = grammar_analyzer.count_filler_words()
-    
-    # Sentiment Analysis
-    sentiment_analyzer = SentimentAnalyzer(text)
-    sentiment_result = sentiment_analyzer.analyze_sentiment()
-    
-    # Metrics Analysis
-    metrics_analyzer = MetricsAnalyzer(text)
-    # Use actual audio duration if available, otherwise default to 1 minute
-    speech_rate_result = metrics_analyzer.calculate_speech_rate(
-        duration_minutes=audio_duration if audio_duration else 1.0
+    for percentile, color in [('p50', '#10B981'), ('p95', '#F59E0B'), ('p99', '#EF4444')]:
+        values = [(stages[name][percentile] or 0) * 1000 for name in names]
+        fig.add_trace(go.Bar(
+            y=names,
+            x=values,
+            orientation='h',
+            name=percentile,
+            marker=dict(color=color, line=dict(color='white', width=1)),
+            hovertemplate='<b>%{y}</b><br>' + percentile + ': %{x:.1f} ms<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        barmode='group',
+        height=max(300, 60 * len(names)),
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#1F2937", family="Arial"),
+        xaxis=dict(
+            showgrid=True,
+            gridcolor='#E5E7EB',
+            title=dict(text='Latency (ms)', font=dict(size=14, color='#6B7280'))
+        ),
+        yaxis=dict(showgrid=False, autorange='reversed'),
+        hoverlabel=dict(
+            bgcolor="white",
+            font=dict(size=12, family="Arial")
+        )
     )
-    vocab_result = metrics_analyzer.calculate_vocabulary_richness()
-    
-    return {
-        'keywords': keywords_result,
-        'flow': flow_result,
-        'salutation': salutation_result,
-        'grammar': grammar_result,
-        'filler': filler_result,
-        'sentiment': sentiment_result,
-        'speech_rate': speech_rate_result,
-        'vocabulary': vocab_result
-    }
+    
+    return fig
+
+def create_histogram_chart(values, counts, max_score):
+    """Create a vertical bar chart of how many submissions got each score"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=values,
+        y=counts,
+        marker=dict(color='#667eea', line=dict(color='white', width=1)),
+        hovertemplate='Score %{x}<br>%{y} submissions<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        height=350,
+        bargap=0.1,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#1F2937", family="Arial"),
+        xaxis=dict(
+            showgrid=False,
+            range=[-0.5, max_score + 0.5],
+            title=dict(text='Score', font=dict(size=14, color='#6B7280'))
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#E5E7EB',
+            title=dict(text='Submissions', font=dict(size=14, color='#6B7280'))
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            font=dict(size=12, family="Arial")
+        )
+    )
+    
+    return fig
+
+def create_progress_chart(attempts):
+    """Create a line chart of total score over a student's attempts"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=[datetime.fromtimestamp(attempt['created_at']) for attempt in attempts],
+        y=[attempt['total'] for attempt in attempts],
+        mode='lines+markers',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=10, color='#764ba2', line=dict(color='white', width=2)),
+        hovertemplate='%{x|%b %d, %H:%M}<br>Score: %{y}/100<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="#1F2937", family="Arial"),
+        xaxis=dict(showgrid=False),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#E5E7EB',
+            range=[0, 100],
+            title=dict(text='Total Score', font=dict(size=14, color='#6B7280'))
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            font=dict(size=12, family="Arial")
+        )
+    )
+    
+    return fig
+
+def format_bytes(value):
+    """Human readable byte count"""
+    if value is None:
+        return "n/a"
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if value < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+
+@st.fragment(run_every=5)
+def render_performance_page():
+    """Admin dashboard; only reads the telemetry snapshot file so it never slows down grading"""
+    snapshot = load_snapshot()
+    if snapshot is None:
+        st.info("📭 No metrics recorded yet. Evaluate an introduction or run the CLI first.")
+        return
+    
+    age = datetime.now().timestamp() - snapshot['updated_at']
+    st.caption(f"Snapshot written by process {snapshot['pid']} · updated {age:.0f}s ago · refreshes every 5s")
+    
+    stages = snapshot['stages']
+    errors = sum(c['value'] for c in snapshot['counters'] if c['name'] == 'stage_errors_total')
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Evaluations", sum(stages.get(name, {}).get('count', 0)
+                                     for name in ('evaluate', 'incremental.update')))
+    with col2:
+        st.metric("Stage Errors", errors)
+    with col3:
+        st.metric("Memory (RSS)", format_bytes(snapshot['memory']['rss_bytes']))
+    with col4:
+        st.metric("Memory Peak", format_bytes(snapshot['memory']['peak_bytes']))
+    
+    # Latency per stage
+    st.markdown('<p class="section-header">⏱️ Latency per Stage</p>', unsafe_allow_html=True)
+    recent = {name: stage for name, stage in stages.items() if stage['p50'] is not None}
+    if recent:
+        analyzers = {name: stage for name, stage in recent.items() if name.startswith('analyzer.')}
+        others = {name: stage for name, stage in recent.items() if not name.startswith('analyzer.')}
+        
+        tab1, tab2, tab3 = st.tabs(["🔬 Analyzers", "🧩 Other Stages", "📋 Table"])
+        with tab1:
+            if analyzers:
+                st.plotly_chart(create_latency_chart(analyzers), width="stretch")
+            else:
+                st.info("No analyzer calls recorded yet")
+        with tab2:
+            if others:
+                st.plotly_chart(create_latency_chart(others), width="stretch")
+            else:
+                st.info("No other stages recorded yet")
+        with tab3:
+            st.dataframe([
+                {
+                    "Stage": name,
+                    "Calls": stage['count'],
+                    "p50 (ms)": round((stage['p50'] or 0) * 1000, 2),
+                    "p95 (ms)": round((stage['p95'] or 0) * 1000, 2),
+                    "p99 (ms)": round((stage['p99'] or 0) * 1000, 2),
+                    "Max (ms)": round(stage['max'] * 1000, 2)
+                }
+                for name, stage in stages.items()
+            ], width="stretch", hide_index=True)
+    else:
+        st.info("No timed calls in the recent event window")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Cache hit rates (percent out of 100 reuses the score bar chart colouring)
+        st.markdown('<p class="section-header">💾 Cache Hit Rates</p>', unsafe_allow_html=True)
+        ratios = snapshot['cache_hit_ratio']
+        if ratios:
+            names = list(ratios)
+            hit_rates = [round(ratios[name] * 100, 1) for name in names]
+            st.plotly_chart(create_bar_chart(names, hit_rates, [100] * len(names)), width="stretch")
+        else:
+            st.info("No cache lookups recorded yet")
+        
+        st.markdown('<p class="section-header">📥 Queue Depths</p>', unsafe_allow_html=True)
+        queues = [g for g in snapshot['gauges'] if g['name'] == 'queue_depth']
+        if queues:
+            for gauge in queues:
+                st.metric(f"{gauge['labels'].get('queue', 'queue').title()} In Flight", gauge['value'])
+        else:
+            st.info("No batch or stream queues active")
+    
+    with col2:
+        st.markdown('<p class="section-header">🔌 Model Loads</p>', unsafe_allow_html=True)
+        loads = [e for e in snapshot['events'] if e['kind'] == 'model_load']
+        if loads:
+            st.dataframe([
+                {
+                    "Time": datetime.fromtimestamp(e['ts']).strftime('%H:%M:%S'),
+                    "Model": e['stage'].split('.', 1)[1],
+                    "Seconds": round(e['seconds'], 2),
+                    "Failed": e['error']
+                }
+                for e in reversed(loads)
+            ], width="stretch", hide_index=True)
+        else:
+            st.info("No model loads in the recent event window")
+
+def render_cohort_page():
+    """Class-level analytics; reads only the feature store's precomputed aggregates"""
+    store = get_feature_store()
+    cohorts = store.cohorts()
+    if not cohorts:
+        st.info("📭 No submissions stored yet. Evaluate introductions here or with the CLI first.")
+        return
+    
+    selected = st.multiselect(
+        "🏫 Cohorts",
+        list(cohorts),
+        format_func=lambda name: f"{name or '(no cohort)'} ({cohorts[name]})",
+        help="Leave empty to include every cohort"
+    )
+    
+    start = datetime.now()
+    summary = cohort_summary(store, cohorts=selected or None)
+    elapsed = (datetime.now() - start).total_seconds()
+    total = summary['scores']['total']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Submissions", summary['submissions'])
+    with col2:
+        st.metric("Mean Score", f"{total['mean']:.1f}" if total['mean'] is not None else "n/a")
+    with col3:
+        st.metric("Median Score", total['median'] if total['median'] is not None else "n/a")
+    with col4:
+        st.metric("Grammar Checked", summary['grammar_rows'], help="Submissions graded with LanguageTool")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Coverage percent out of 100 reuses the score bar chart colouring
+        st.markdown('<p class="section-header">🔑 Topic Coverage</p>', unsafe_allow_html=True)
+        topics = summary['topics']
+        if summary['topic_rows']:
+            rates = [round(rate * 100, 1) for rate in topics['coverage']]
+            st.plotly_chart(create_bar_chart(topics['names'], rates, [100] * len(rates)), width="stretch")
+        else:
+            st.info("No keyword results stored for this selection")
+    
+    with col2:
+        st.markdown('<p class="section-header">📊 Score Distribution</p>', unsafe_allow_html=True)
+        category = st.selectbox(
+            "Category",
+            list(summary['scores']),
+            index=len(summary['scores']) - 1,
+            format_func=lambda name: name.replace('_', ' ').title()
+        )
+        histogram = summary['scores'][category]
+        if histogram['count']:
+            st.plotly_chart(create_histogram_chart(histogram['values'], histogram['counts'], histogram['max']),
+                            width="stretch")
+        else:
+            st.info("No scores stored for this category")
+    
+    st.markdown('<p class="section-header">✍️ Most Common Grammar Issues</p>', unsafe_allow_html=True)
+    if summary['rules']:
+        st.dataframe([
+            {
+                "Rule": rule['rule_id'],
+                "Occurrences": rule['count'],
+                "Per Submission": round(rule['per_submission'], 2)
+            }
+            for rule in summary['rules']
+        ], width="stretch", hide_index=True)
+    else:
+        st.info("No grammar issues recorded for this selection")
+    
+    st.caption(f"Loaded from precomputed aggregates in {elapsed * 1000:.0f} ms · {store.path}")
+    
+    # Rankings and outliers are read through the score and feature indexes, a few rows each
+    st.markdown('<p class="section-header">🏅 Top & Bottom Students</p>', unsafe_allow_html=True)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        ranking_category = st.selectbox(
+            "Rank by",
+            RANKING_CATEGORIES,
+            format_func=lambda name: name.replace('_', ' ').title(),
+            key="ranking_category"
+        )
+    with col2:
+        ranking_size = st.number_input("Students per list", min_value=1, max_value=50, value=5, step=1)
+    
+    start = datetime.now()
+    ranked = top_and_bottom(store, n=int(ranking_size), cohorts=selected or None,
+                            categories=[ranking_category])[ranking_category]
+    outliers = find_outliers(store, cohorts=selected or None)
+    elapsed = (datetime.now() - start).total_seconds()
+    
+    def ranking_rows(entries):
+        return [
+            {
+                "Student": entry['student_name'] or entry['submission_id'] or f"#{entry['id']}",
+                "Cohort": entry['cohort'] or "(no cohort)",
+                "Score": entry['score'],
+                "Total": entry['total'],
+                "Submitted": datetime.fromtimestamp(entry['created_at']).strftime("%Y-%m-%d %H:%M")
+            }
+            for entry in entries
+        ]
+    
+    col1, col2 = st.columns(2)
+    for column, label, entries in ((col1, "⬆️ Top", ranked['top']), (col2, "⬇️ Bottom", ranked['bottom'])):
+        with column:
+            st.markdown(f"**{label}**")
+            if entries:
+                st.dataframe(ranking_rows(entries), width="stretch", hide_index=True)
+            else:
+                st.info("No scores stored for this selection")
+    
+    st.markdown('<p class="section-header">🚩 Outliers</p>', unsafe_allow_html=True)
+    columns = st.columns(len(outliers))
+    for column, outlier in zip(columns, outliers.values()):
+        with column:
+            st.metric(outlier['label'], outlier['count'])
+    for outlier in outliers.values():
+        if outlier['rows']:
+            with st.expander(f"{outlier['label']} ({outlier['count']})"):
+                st.dataframe([
+                    {
+                        "Student": row['student_name'] or row['submission_id'] or f"#{row['id']}",
+                        "Cohort": row['cohort'] or "(no cohort)",
+                        "Value": round(row['value'], 1),
+                        "Total": row['total']
+                    }
+                    for row in outlier['rows']
+                ], width="stretch", hide_index=True)
+    
+    st.caption(f"Rankings and outliers read from indexes in {elapsed * 1000:.0f} ms")
+
+def render_live_preview(text):
+    """
+    Scoring preview of the editor text. The text area only sends its value on blur or Ctrl+Enter,
+    so the preview follows each committed edit; it is recomputed only when the text has changed.
+    """
+    live_preview = st.session_state.live_preview
+    preview = live_preview.update(text)
+    
+    keywords = preview['keywords']
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Words", preview['word_count'])
+        st.metric("Filler Rate", f"{preview['filler']['rate']:.1f}%", help="Filler words per 100 words")
+    with col2:
+        st.metric("Topics", f"{keywords['found']}/{keywords['total']}", help="Keyword topics covered")
+        st.metric("TTR", f"{preview['vocabulary']['ttr']:.2f}", help="Type-token ratio (unique / total words)")
+    
+    salutation = preview['salutation']
+    st.markdown(f"{'✅' if salutation['present'] else '❌'} Salutation"
+                + (f" ({salutation['type']})" if salutation['present'] else ""))
+    st.markdown(f"{'✅' if preview['closing'] else '❌'} Closing")
+    if keywords['missing']:
+        st.caption("Missing: " + ", ".join(keywords['missing']))
+    
+    st.caption(f"Updated after each edit (Ctrl+Enter or click outside the text box) in "
+               f"{live_preview.elapsed * 1000:.1f} ms")
 
 def main():
     # Initialize session state for storing results
@@ -452,6 +793,46 @@ def main():
         st.session_state.text_input = None
     if 'student_name' not in st.session_state:
         st.session_state.student_name = ""
+    if 'cohort' not in st.session_state:
+        st.session_state.cohort = ""
+    if 'incremental' not in st.session_state:
+        st.session_state.incremental = IncrementalEvaluator()
+    if 'live_preview' not in st.session_state:
+        # Shares sentence partials with the evaluator, so evaluating reuses the preview's work
+        st.session_state.live_preview = LivePreview(st.session_state.incremental)
+    
+    with st.sidebar:
+        page = st.radio("Page", ["🎓 Evaluator", "🏫 Cohorts", "📈 Performance"], horizontal=True)
+        profile_mode = None
+        if config.ADMIN_CONTROLS:
+            profile_mode = st.selectbox(
+                "🔬 Profiling (admin)",
+                [None, "cprofile", "sample"],
+                format_func=lambda mode: {None: "Off", "cprofile": "cProfile (pstats)",
+                                          "sample": "Sampling (collapsed stacks)"}[mode],
+                help="Profile each evaluation and save the profile under data/profiles, named by request id"
+            )
+        st.markdown("---")
+    
+    if page == "📈 Performance":
+        st.markdown("""
+            <div class="main-header">
+                <h1>📈 Performance Dashboard</h1>
+                <p>Per-stage latency, cache hit rates and model loads from the metrics export</p>
+            </div>
+        """, unsafe_allow_html=True)
+        render_performance_page()
+        return
+    
+    if page == "🏫 Cohorts":
+        st.markdown("""
+            <div class="main-header">
+                <h1>🏫 Cohort Analytics</h1>
+                <p>Topic coverage, score distributions and common grammar issues across a class</p>
+            </div>
+        """, unsafe_allow_html=True)
+        render_cohort_page()
+        return
     
     # Header
     st.markdown("""
@@ -481,6 +862,20 @@ def main():
         4. Download the report
         """)
         
+        st.markdown("---")
+        st.markdown("### ⚙️ Settings")
+        incremental_mode = st.checkbox(
+            "⚡ Incremental re-evaluation",
+            value=True,
+            help="When you edit an evaluated introduction and evaluate again, only re-check the sentences that changed"
+        )
+        live_preview_enabled = st.checkbox(
+            "👀 Live preview",
+            value=True,
+            help="Show keyword, filler and vocabulary checks after each edit (Ctrl+Enter or click outside "
+                 "the text box), before evaluating"
+        )
+        
         st.markdown("---")
         st.markdown("### ℹ️ About")
         st.markdown("""
@@ -508,6 +903,14 @@ def main():
         # Update session state
         st.session_state.student_name = student_name
         
+        cohort = st.text_input(
+            "🏫 Class / Cohort (Optional)",
+            value=st.session_state.cohort,
+            placeholder="e.g. Class 8B",
+            help="Groups this submission with its class on the Cohorts page"
+        )
+        st.session_state.cohort = cohort
+        
         # Input method selection
         input_method = st.radio("Choose input method:", ["✍️ Type/Paste Text", "📁 Upload File", "🎤 Upload Audio"], horizontal=True)
         
@@ -562,16 +965,18 @@ def main():
                             audio_duration = len(audio) / 1000.0 / 60.0  # Convert to minutes
                             
                             # Load Whisper model (base model for speed)
-                            model = whisper.load_model("base")
+                            model = load_whisper_model("base")
                             
                             # Transcribe
-                            result = whisper.transcribe(model, tmp_path, language="en")
+                            with stage_timer("transcribe.whisper"):
+                                result = whisper.transcribe(model, tmp_path, language="en")
                             text_input = result["text"]
                             
                             # Perform acoustic analysis
                             from src.analyzers.acoustic import AcousticAnalyzer
                             acoustic_analyzer = AcousticAnalyzer(tmp_path)
-                            acoustic_results = acoustic_analyzer.get_comprehensive_analysis(text_input)
+                            with stage_timer("analyzer.acoustic"):
+                                acoustic_results = acoustic_analyzer.get_comprehensive_analysis(text_input)
                             
                             st.success(f"✅ Transcription complete! Duration: {audio_duration:.2f} minutes")
                             st.text_area("📝 Transcribed Text:", text_input, height=200)
@@ -617,6 +1022,10 @@ def main():
                 st.metric("Audio Duration", f"{audio_duration:.2f} min", help="Recorded audio length")
         else:
             st.info("📝 Enter text to see statistics")
+        
+        if live_preview_enabled and text_input:
+            st.markdown('<p class="section-header">👀 Live Preview</p>', unsafe_allow_html=True)
+            render_live_preview(text_input)
     
     # Evaluate button
     st.markdown("<br>", unsafe_allow_html=True)
@@ -627,19 +1036,36 @@ def main():
         else:
             with st.spinner("🔍 Analyzing your introduction..."):
                 # Pass audio duration if available for accurate WPM calculation
-                results = evaluate_text(text_input, audio_duration=audio_duration)
+                if profile_mode:
+                    # Profiling always takes the full pipeline so the profile shows every analyzer
+                    results = evaluate_text(text_input, audio_duration=audio_duration, profile=profile_mode,
+                                            request_id=f"app-{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+                elif incremental_mode and st.session_state.text_input not in (None, text_input):
+                    # Only edits of an evaluated text go sentence by sentence; a first evaluation (or the
+                    # same text again) takes the shared result cache and joins identical in-flight runs
+                    results = st.session_state.incremental.update(text_input, audio_duration=audio_duration)
+                else:
+                    results = evaluate_text(text_input, audio_duration=audio_duration)
+                total_score = results.total_score
                 
-                # Calculate total score
-                total_score = (
-                    results['salutation']['score'] +
-                    results['keywords']['score'] +
-                    results['flow']['score'] +
-                    results['speech_rate']['score'] +
-                    results['grammar']['score'] +
-                    results['vocabulary']['score'] +
-                    results['filler']['score'] +
-                    results['sentiment']['score']
-                )
+                submission = (text_hash(text_input), audio_duration, st.session_state.student_name,
+                              st.session_state.cohort)
+                if st.session_state.get('feature_id') and st.session_state.get('recorded') == submission:
+                    # Clicking Evaluate again on the same submission keeps its stored row, so it is
+                    # counted once in cohort aggregates, percentiles and rankings
+                    previous = st.session_state.results
+                    results.percentiles = getattr(previous, 'percentiles', {})
+                    results.near_duplicates = getattr(previous, 'near_duplicates', [])
+                else:
+                    # Keep the raw features so the submission can be re-scored under a new rubric
+                    st.session_state.feature_id = record_evaluation(
+                        text_input, results, audio_duration=audio_duration,
+                        student_name=st.session_state.student_name or None,
+                        cohort=st.session_state.cohort or None, source="app"
+                    )
+                    st.session_state.recorded = submission
+                    st.session_state.semantic_stored = False
+                    st.session_state.similar_intros = []
                 
                 # Store in session state
                 st.session_state.results = results
@@ -673,6 +1099,42 @@ def main():
         # Gauge chart
         st.plotly_chart(create_gauge_chart(total_score, max_total, "Overall Performance"), width="stretch")
         
+        # Standing among earlier submissions of the same cohort (or all of them)
+        percentiles = {name: value for name, value in getattr(results, 'percentiles', {}).items()
+                       if value is not None}
+        if 'total' in percentiles:
+            group = st.session_state.cohort or "all past submissions"
+            st.info(f"📍 **{ordinal(percentiles.pop('total'))} percentile** of {group} · " + " · ".join(
+                f"{name.replace('_', ' ').title()}: {ordinal(value)}" for name, value in percentiles.items()))
+        
+        # Lightly edited copies of earlier submissions or templates, found through the LSH index.
+        # Other students' names and cohorts are only shown to admins
+        for match in getattr(results, 'near_duplicates', []):
+            if 'template' in match:
+                source = f"the template **{match['template']}**"
+            elif config.ADMIN_CONTROLS:
+                who = match.get('student_name') or match.get('submission_id') or f"submission #{match['feature_id']}"
+                source = f"**{who}**" + (f" ({match['cohort']})" if match.get('cohort') else "")
+            else:
+                source = "an earlier submission"
+            st.warning(f"🔁 This introduction is {match['similarity']:.0%} similar to {source}. Please review it.")
+        
+        # Progress across this student's stored attempts (an indexed lookup, nothing is re-evaluated)
+        if st.session_state.student_name.strip() and st.session_state.get('feature_id'):
+            progress = student_progress(get_feature_store(), student_name=st.session_state.student_name)
+            if progress['previous'] is not None:
+                st.markdown('<p class="section-header">📈 Your Progress</p>', unsafe_allow_html=True)
+                deltas = progress['deltas']
+                columns = st.columns(5)
+                for index, name in enumerate(['total', 'keywords', 'grammar', 'filler', 'sentiment']):
+                    with columns[index]:
+                        latest = progress['latest'][name]
+                        st.metric(name.replace('_', ' ').title(), latest if latest is not None else "n/a",
+                                  delta=deltas[name], help="Change since the previous attempt")
+                st.plotly_chart(create_progress_chart([attempt for attempt in progress['attempts']
+                                                       if attempt['total'] is not None]), width="stretch")
+                st.caption(f"{len(progress['attempts'])} attempts by {st.session_state.student_name.strip()}")
+        
         # Category breakdown
         st.markdown('<p class="section-header">📊 Category Breakdown</p>', unsafe_allow_html=True)
         
@@ -881,12 +1343,29 @@ def main():
         st.markdown('<p class="section-header">🎯 Semantic Relevance Analysis</p>', unsafe_allow_html=True)
         
         try:
-            from src.analyzers.semantic import SemanticAnalyzer
+            from src.analyzers.semantic import SemanticAnalyzer, highlight_html
             
-            with st.spinner("Analyzing semantic relevance..."):
-                semantic_analyzer = SemanticAnalyzer(text_input)
-                semantic_results = semantic_analyzer.analyze_relevance()
-                overall_semantic_score = semantic_analyzer.get_overall_score()
+            with st.spinner("Analyzing semantic relevance..."), stage_timer("analyzer.semantic"):
+                if incremental_mode:
+                    semantic = st.session_state.incremental.semantic_relevance(text_input)
+                    semantic_results = semantic['sentences']
+                    overall_semantic_score = semantic['overall_score']
+                    document_embedding = semantic['embedding']
+                else:
+                    semantic_analyzer = SemanticAnalyzer(text_input)
+                    semantic_results = semantic_analyzer.analyze_relevance()
+                    overall_semantic_score = semantic_analyzer.get_overall_score()
+                    document_embedding = semantic_analyzer.document_embedding()
+            
+            if st.session_state.get('feature_id') and not st.session_state.get('semantic_stored'):
+                get_feature_store().set_semantic(st.session_state.feature_id, overall_semantic_score,
+                                                 [r['score'] for r in semantic_results])
+                # Closest earlier intros by other students, then file this one in the embedding index
+                st.session_state.similar_intros = find_similar(
+                    st.session_state.feature_id, document_embedding,
+                    student_name=st.session_state.student_name or None
+                )
+                st.session_state.semantic_stored = True
             
             # Display overall semantic coherence
             col1, col2 = st.columns(2)
@@ -922,7 +1401,7 @@ def main():
                 st.markdown("**Color Legend:** <span style='color: #10B981;'>● High relevance</span> | <span style='color: #F59E0B;'>● Medium relevance</span> | <span style='color: #EF4444;'>● Low relevance</span>", unsafe_allow_html=True)
                 st.markdown("<br>", unsafe_allow_html=True)
                 
-                highlighted_html = semantic_analyzer.get_highlighted_text()
+                highlighted_html = highlight_html(semantic_results)
                 st.markdown(highlighted_html, unsafe_allow_html=True)
                 
                 st.markdown("<br><small><i>💡 Hover over sentences to see exact relevance scores</i></small>", unsafe_allow_html=True)
@@ -938,6 +1417,17 @@ def main():
                         </div>
                     """, unsafe_allow_html=True)
         
+            # Other students' intros, names and scores are for admins only
+            similar_intros = st.session_state.get('similar_intros') or []
+            if similar_intros and config.ADMIN_CONTROLS:
+                with st.expander(f"🔎 Semantically Similar Past Intros ({len(similar_intros)})"):
+                    st.caption("Closest earlier introductions by meaning, for plagiarism review or as examples to compare with.")
+                    for match in similar_intros:
+                        who = match.get('student_name') or match.get('submission_id') or f"submission #{match['feature_id']}"
+                        where = f" ({match['cohort']})" if match.get('cohort') else ""
+                        score = f" · score {match['total']}/100" if match.get('total') is not None else ""
+                        st.markdown(f"- **{who}**{where} · similarity {match['similarity']:.2f}{score}")
+        
         except ImportError:
             st.info("📦 Semantic analysis requires `sentence-transformers`. Install it to enable this feature.")
         except Exception as e:
@@ -997,6 +1487,18 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
         
+        if results.telemetry:
+            with st.expander("⏱️ Performance Details"):
+                st.json(results.telemetry)
+                profile_file = results.telemetry.get('profile')
+                if profile_file and Path(profile_file).exists():
+                    st.download_button(
+                        label="🔬 Download Profile",
+                        data=Path(profile_file).read_bytes(),
+                        file_name=Path(profile_file).name,
+                        mime="application/octet-stream"
+                    )
+        
         # Download report
         st.markdown('<p class="section-header">📥 Download Report</p>', unsafe_allow_html=True)
         
@@ -1049,12 +1551,13 @@ Actionable Feedback:
         with col2:
             # PDF report
             try:
-                pdf_bytes = generate_pdf_report(
-                    student_name=st.session_state.get('student_name', 'Student'),
-                    text_input=text_input,
-                    results=results,
-                    total_score=total_score
-                )
+                with stage_timer("report.pdf"):
+                    pdf_bytes = generate_pdf_report(
+                        student_name=st.session_state.get('student_name', 'Student'),
+                        text_input=text_input,
+                        results=results,
+                        total_score=total_score
+                    )
                 
                 st.download_button(
                     label="📕 Download PDF Report",
@@ -1067,6 +1570,9 @@ Actionable Feedback:
                 st.info("PDF generation requires `reportlab`. Install it to enable PDF downloads.")
             except Exception as e:
                 st.error(f"PDF generation error: {str(e)}")
+    
+    # Export metrics from this rerun for the admin dashboard / Prometheus
+    get_telemetry().flush()
 
 if __name__ == "__main__":
     main()
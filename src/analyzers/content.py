@@ -1,10 +1,14 @@
-from src.config import KEYWORDS, SALUTATIONS, CLOSINGS
+from src.config import KEYWORDS, SALUTATIONS, CLOSINGS, KEYWORD_POINTS, SALUTATION_POINTS, FLOW_POINTS
 from src.utils.text_utils import clean_text
 
 class ContentAnalyzer:
     def __init__(self, text):
         self.text = clean_text(text).lower()
 
+    def find(self, phrase):
+        """Index of the first occurrence of phrase in the lowercased text, or -1"""
+        return self.text.find(phrase)
+
     def check_keywords(self):
         """
         Checks for the presence of mandatory keywords/topics.
@@ -17,23 +21,23 @@ class ContentAnalyzer:
         for topic, phrases in KEYWORDS["Must Have"].items():
             found = False
             for phrase in phrases:
-                if phrase in self.text:
+                if self.find(phrase) != -1:
                     found = True
                     break
             found_topics[topic] = found
             if found:
-                score += 4
+                score += KEYWORD_POINTS["Must Have"]
         
         # Check Good to Have (Max 10, 2 each)
         for topic, phrases in KEYWORDS["Good to Have"].items():
             found = False
             for phrase in phrases:
-                if phrase in self.text:
+                if self.find(phrase) != -1:
                     found = True
                     break
             found_topics[topic] = found
             if found:
-                score += 2
+                score += KEYWORD_POINTS["Good to Have"]
             
         return {"topics": found_topics, "score": score}
 
@@ -53,14 +57,14 @@ class ContentAnalyzer:
         # Salutation
         for level, phrases in SALUTATIONS.items():
             for phrase in phrases:
-                idx = self.text.find(phrase)
+                idx = self.find(phrase)
                 if idx != -1:
                     if indices["Salutation"] == -1 or idx < indices["Salutation"]:
                         indices["Salutation"] = idx
 
         # Name
         for phrase in KEYWORDS["Must Have"]["Name"]:
-            idx = self.text.find(phrase)
+            idx = self.find(phrase)
             if idx != -1:
                 if indices["Name"] == -1 or idx < indices["Name"]:
                     indices["Name"] = idx
@@ -71,14 +75,14 @@ class ContentAnalyzer:
             mandatory_phrases.extend(KEYWORDS["Must Have"][topic])
         
         for phrase in mandatory_phrases:
-            idx = self.text.find(phrase)
+            idx = self.find(phrase)
             if idx != -1:
                 if indices["Details"] == -1 or idx < indices["Details"]:
                     indices["Details"] = idx
 
         # Closing
         for closing in CLOSINGS:
-            idx = self.text.find(closing)
+            idx = self.find(closing)
             if idx != -1:
                 if indices["Closing"] == -1 or idx > indices["Closing"]:
                     indices["Closing"] = idx
@@ -103,7 +107,7 @@ class ContentAnalyzer:
                 feedback.append(f"{section} not found.")
 
         if valid_order and all(indices[s] != -1 for s in order_check):
-            flow_score = 5 # Full score if perfect
+            flow_score = FLOW_POINTS # Full score if perfect
         else:
             flow_score = 0
 
@@ -113,21 +117,12 @@ class ContentAnalyzer:
         """
         Scores the salutation based on its presence and type.
         """
-        # Check Excellent
-        for phrase in SALUTATIONS["Excellent"]:
-            if phrase in self.text:
-                return {"present": True, "score": 5, "type": "Excellent", "phrase": phrase}
-        
-        # Check Good
-        for phrase in SALUTATIONS["Good"]:
-            if phrase in self.text:
-                return {"present": True, "score": 4, "type": "Good", "phrase": phrase}
-                
-        # Check Normal
-        for phrase in SALUTATIONS["Normal"]:
-            if phrase in self.text:
-                return {"present": True, "score": 2, "type": "Normal", "phrase": phrase}
+        # Check Excellent, then Good, then Normal
+        for level in ("Excellent", "Good", "Normal"):
+            for phrase in SALUTATIONS[level]:
+                if self.find(phrase) != -1:
+                    return {"present": True, "score": SALUTATION_POINTS[level], "type": level, "phrase": phrase}
         
-        return {"present": False, "score": 0, "type": "None", "phrase": None}
+        return {"present": False, "score": SALUTATION_POINTS["None"], "type": "None", "phrase": None}
 
 
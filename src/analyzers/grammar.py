@@ -1,15 +1,104 @@
+import threading
+from collections import namedtuple
 import language_tool_python
 from src.config import FILLER_WORDS
+from src.utils.rubric import band_score
 from src.utils.text_utils import clean_text, tokenize_text
+from src.utils import tracing
+from src.utils.telemetry import stage_timer
+
+_shared_tool = None
+_shared_tool_failed = False
+_shared_tool_lock = threading.Lock()
+
+def get_language_tool():
+    """
+    Returns the process-wide LanguageTool instance, starting it on first use.
+    Every LanguageTool instance launches its own JVM server, so analyzers share one.
+    Returns None if LanguageTool could not be started.
+    """
+    global _shared_tool, _shared_tool_failed
+    with _shared_tool_lock:
+        if _shared_tool is None and not _shared_tool_failed:
+            try:
+                with stage_timer("model_load.languagetool"):
+                    _shared_tool = language_tool_python.LanguageTool('en-US')
+            except Exception as e:
+                print(f"Warning: Could not initialize LanguageTool: {e}")
+                _shared_tool_failed = True
+        return _shared_tool
+
+def score_grammar(error_count, word_count):
+    """
+    Returns (g_index, score) for an error count over word_count words.
+    Formula: Grammar Score = 1 - min(errors per 100 words / 10, 1)
+    """
+    errors_per_100 = (error_count / word_count) * 100
+    g_index = 1 - min(errors_per_100 / 10, 1)
+    return g_index, band_score("grammar", g_index)
+
+def filler_result(count, total_words, found_fillers):
+    """Builds the filler result from a filler count over total_words words"""
+    # Calculate rate (fillers per 100 words)
+    rate = (count / total_words * 100) if total_words > 0 else 0
+    return {"count": count, "rate": rate, "fillers": found_fillers, "score": band_score("filler", rate)}
+
+class GrammarIssue(namedtuple('GrammarIssue', [
+        'rule_id', 'message', 'replacements', 'offset', 'error_length', 'context', 'category'])):
+    """
+    Plain copy of a LanguageTool match.
+    Keeps the attribute names used by the UI but can be pickled, cached and written as JSON.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_match(cls, match):
+        return cls(match.rule_id, match.message, list(match.replacements), match.offset,
+                   match.error_length, match.context, match.category)
+
+def check_grammar(tool, text):
+    """
+    Runs LanguageTool over text and returns GrammarIssue tuples.
+    Filters out proper name spelling errors (MORFOLOGIK_RULE_EN_US).
+    """
+    with tracing.span("languagetool.check", **{"text.characters": len(text)}):
+        all_matches = tool.check(text)
+    
+    # Filter out proper name spelling errors (these are often false positives)
+    return [GrammarIssue.from_match(m) for m in all_matches if m.rule_id != 'MORFOLOGIK_RULE_EN_US']
+
+def find_fillers(text, words):
+    """
+    Returns every filler word found in text (words is its tokenization).
+    """
+    found_fillers = []
+    
+    # Check for single word fillers
+    for word in words:
+        if word in FILLER_WORDS:
+            found_fillers.append(word)
+            
+    # Also check for multi-word fillers like "you know"
+    text_lower = text.lower()
+    for filler in FILLER_WORDS:
+        if " " in filler:
+            matches = text_lower.count(filler)
+            if matches > 0:
+                found_fillers.extend([filler] * matches)
+    
+    return found_fillers
 
 class GrammarAnalyzer:
-    def __init__(self, text):
+    def __init__(self, text, tool=None):
         self.text = clean_text(text)
-        try:
-            self.tool = language_tool_python.LanguageTool('en-US')
-        except Exception as e:
-            print(f"Warning: Could not initialize LanguageTool: {e}")
-            self.tool = None
+        self._tool = tool
+
+    @property
+    def tool(self):
+        # Resolved lazily so filler counting never waits on the JVM
+        if self._tool is None:
+            self._tool = get_language_tool()
+        return self._tool
 
     def count_grammar_errors(self):
         """
@@ -17,12 +106,9 @@ class GrammarAnalyzer:
         Filters out proper name spelling errors (MORFOLOGIK_RULE_EN_US).
         """
         if not self.tool:
-            return {"count": 0, "matches": [], "score": 0}
+            return {"count": 0, "matches": [], "score": 0, "available": False}
         
-        all_matches = self.tool.check(self.text)
-        
-        # Filter out proper name spelling errors (these are often false positives)
-        matches = [m for m in all_matches if m.rule_id != 'MORFOLOGIK_RULE_EN_US']
+        matches = check_grammar(self.tool, self.text)
         error_count = len(matches)
         
         words = tokenize_text(self.text)
@@ -31,22 +117,7 @@ class GrammarAnalyzer:
         if word_count == 0:
             return {"count": error_count, "matches": matches, "score": 0}
 
-        # Formula: Grammar Score = 1 - min(errors per 100 words / 10, 1)
-        errors_per_100 = (error_count / word_count) * 100
-        g_index = 1 - min(errors_per_100 / 10, 1)
-        
-        score = 0
-        if g_index > 0.9:
-            score = 10
-        elif 0.7 <= g_index <= 0.89:
-            score = 8
-        elif 0.5 <= g_index <= 0.69:
-            score = 6
-        elif 0.3 <= g_index <= 0.49:
-            score = 4
-        else: # < 0.3
-            score = 2
-            
+        g_index, score = score_grammar(error_count, word_count)
         return {"count": error_count, "matches": matches, "score": score, "g_index": g_index}
 
     def count_filler_words(self):
@@ -54,40 +125,7 @@ class GrammarAnalyzer:
         Counts filler words and calculates score.
         """
         words = tokenize_text(self.text)
-        count = 0
-        found_fillers = []
-        
-        # Check for single word fillers
-        for word in words:
-            if word in FILLER_WORDS:
-                count += 1
-                found_fillers.append(word)
-                
-        # Also check for multi-word fillers like "you know"
-        text_lower = self.text.lower()
-        for filler in FILLER_WORDS:
-            if " " in filler:
-                matches = text_lower.count(filler)
-                if matches > 0:
-                    count += matches
-                    found_fillers.extend([filler] * matches)
-                    
-        # Calculate rate (fillers per 100 words)
-        total_words = len(words)
-        rate = (count / total_words * 100) if total_words > 0 else 0
-        
-        score = 0
-        if 0 <= rate <= 3:
-            score = 15
-        elif 4 <= rate <= 6:
-            score = 12
-        elif 7 <= rate <= 9:
-            score = 9
-        elif 10 <= rate <= 12:
-            score = 6
-        else: # 13 and above
-            score = 3
-        
-        return {"count": count, "rate": rate, "fillers": found_fillers, "score": score}
+        found_fillers = find_fillers(self.text, words)
+        return filler_result(len(found_fillers), len(words), found_fillers)
 
 
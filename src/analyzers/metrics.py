@@ -1,5 +1,22 @@
+from src.utils.rubric import band_score
 from src.utils.text_utils import tokenize_text
 
+def speech_rate_result(word_count, duration_minutes):
+    """Builds the speech rate result for word_count words spoken over duration_minutes"""
+    if duration_minutes <= 0:
+        wpm = 0
+    else:
+        wpm = word_count / duration_minutes
+    return {"wpm": wpm, "score": band_score("speech_rate", wpm)}
+
+def vocabulary_result(unique_count, word_count):
+    """Builds the vocabulary richness result from unique and total word counts"""
+    if not word_count:
+        return {"ttr": 0, "score": 2}
+        
+    ttr = unique_count / word_count
+    return {"ttr": ttr, "score": band_score("vocabulary", ttr)}
+
 class MetricsAnalyzer:
     def __init__(self, text):
         self.text = text
@@ -9,48 +26,12 @@ class MetricsAnalyzer:
         """
         Calculates Words Per Minute (WPM) and returns score.
         """
-        word_count = len(self.words)
-        if duration_minutes <= 0:
-            wpm = 0
-        else:
-            wpm = word_count / duration_minutes
-            
-        score = 0
-        if wpm > 161:
-            score = 2
-        elif 141 <= wpm <= 160:
-            score = 6
-        elif 111 <= wpm <= 140:
-            score = 10
-        elif 81 <= wpm <= 110:
-            score = 6
-        else: # < 80
-            score = 2
-            
-        return {"wpm": wpm, "score": score}
+        return speech_rate_result(len(self.words), duration_minutes)
 
     def calculate_vocabulary_richness(self):
         """
         Calculates Type-Token Ratio (TTR) and returns score.
         """
-        if not self.words:
-            return {"ttr": 0, "score": 2}
-            
-        unique_words = set(self.words)
-        ttr = len(unique_words) / len(self.words)
-        
-        score = 0
-        if 0.9 <= ttr <= 1.0:
-            score = 10
-        elif 0.7 <= ttr <= 0.89:
-            score = 8
-        elif 0.5 <= ttr <= 0.69:
-            score = 6
-        elif 0.3 <= ttr <= 0.49:
-            score = 4
-        else: # 0 - 0.29
-            score = 2
-        
-        return {"ttr": ttr, "score": score}
+        return vocabulary_result(len(set(self.words)), len(self.words))
 
 
@@ -3,27 +3,124 @@ Semantic Similarity Analyzer Module
 Analyzes semantic relevance of sentences to introduction topics
 """
 
+import re
+import numpy as np
 from sentence_transformers import SentenceTransformer, util
 import streamlit as st
+from src.utils.telemetry import stage_timer
 
 @st.cache_resource
 def load_semantic_model():
     """Load the sentence transformer model (cached)"""
-    return SentenceTransformer('all-MiniLM-L6-v2')
+    with stage_timer("model_load.sentence_transformer"):
+        return SentenceTransformer('all-MiniLM-L6-v2')
+
+def split_into_sentences(text):
+    """Split text into sentences (without their closing punctuation)"""
+    # Simple sentence splitting
+    sentences = re.split(r'[.!?]+', text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+    return sentences
+
+# Define ideal introduction topics
+REFERENCE_TOPICS = [
+    "greeting and introduction",
+    "personal name and identity",
+    "age and school information",
+    "family background and members",
+    "hobbies interests and activities",
+    "goals dreams and aspirations",
+    "unique qualities and strengths"
+]
+
+_topic_embeddings = {}
+
+def get_topic_embeddings(model):
+    """Reference topic embeddings, encoded once per model"""
+    if id(model) not in _topic_embeddings:
+        _topic_embeddings[id(model)] = model.encode(REFERENCE_TOPICS, convert_to_tensor=True)
+    return _topic_embeddings[id(model)]
+
+def relevance_results(sentences, sentence_embeddings, topic_embeddings):
+    """
+    Score each sentence against the reference topics
+    
+    Returns:
+        list of dict: Each dict contains sentence, score, and relevance level
+    """
+    results = []
+    for i, sentence in enumerate(sentences):
+        # Calculate similarity to all topics, take max
+        similarities = util.cos_sim(sentence_embeddings[i], topic_embeddings)[0]
+        max_similarity = float(similarities.max())
+        
+        # Determine relevance level
+        if max_similarity >= 0.5:
+            relevance = 'high'
+            color = '#10B981'  # green
+        elif max_similarity >= 0.3:
+            relevance = 'medium'
+            color = '#F59E0B'  # yellow
+        else:
+            relevance = 'low'
+            color = '#EF4444'  # red
+        
+        results.append({
+            'sentence': sentence,
+            'score': max_similarity,
+            'relevance': relevance,
+            'color': color
+        })
+    
+    return results
+
+def document_embedding(sentence_embeddings):
+    """
+    Mean-pooled embedding of a text's sentences, scaled to unit length
+    
+    Returns:
+        float32 numpy array, or None when there are no sentences
+    """
+    if len(sentence_embeddings) == 0:
+        return None
+    vectors = np.stack([np.asarray(e.detach().cpu() if hasattr(e, 'detach') else e, dtype=np.float32)
+                        for e in sentence_embeddings])
+    mean = vectors.mean(axis=0)
+    norm = np.linalg.norm(mean)
+    return mean / norm if norm > 0 else mean
+
+def highlight_html(results):
+    """
+    HTML with color-coded sentences for analyze_relevance() results
+    
+    Returns:
+        str: HTML string with colored sentences
+    """
+    html_parts = []
+    for result in results:
+        sentence = result['sentence']
+        color = result['color']
+        score = result['score']
+        
+        # Create tooltip with score
+        html_parts.append(
+            f'<span style="background-color: {color}20; border-left: 3px solid {color}; '
+            f'padding: 2px 5px; margin: 2px 0; display: inline-block; border-radius: 3px;" '
+            f'title="Relevance: {score:.2f}">{sentence}.</span> '
+        )
+    
+    return ''.join(html_parts)
 
 class SemanticAnalyzer:
     def __init__(self, text):
         self.text = text
         self.sentences = self._split_into_sentences(text)
         self.model = load_semantic_model()
+        self.sentence_embeddings = None
         
     def _split_into_sentences(self, text):
         """Split text into sentences"""
-        import re
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        return sentences
+        return split_into_sentences(text)
     
     def analyze_relevance(self):
         """
@@ -32,49 +129,26 @@ class SemanticAnalyzer:
         Returns:
             list of dict: Each dict contains sentence, score, and relevance level
         """
-        # Define ideal introduction topics
-        reference_topics = [
-            "greeting and introduction",
-            "personal name and identity",
-            "age and school information",
-            "family background and members",
-            "hobbies interests and activities",
-            "goals dreams and aspirations",
-            "unique qualities and strengths"
-        ]
-        
         if not self.sentences:
             return []
         
         # Encode reference topics and sentences
-        topic_embeddings = self.model.encode(reference_topics, convert_to_tensor=True)
-        sentence_embeddings = self.model.encode(self.sentences, convert_to_tensor=True)
-        
-        results = []
-        for i, sentence in enumerate(self.sentences):
-            # Calculate similarity to all topics, take max
-            similarities = util.cos_sim(sentence_embeddings[i], topic_embeddings)[0]
-            max_similarity = float(similarities.max())
-            
-            # Determine relevance level
-            if max_similarity >= 0.5:
-                relevance = 'high'
-                color = '#10B981'  # green
-            elif max_similarity >= 0.3:
-                relevance = 'medium'
-                color = '#F59E0B'  # yellow
-            else:
-                relevance = 'low'
-                color = '#EF4444'  # red
-            
-            results.append({
-                'sentence': sentence,
-                'score': max_similarity,
-                'relevance': relevance,
-                'color': color
-            })
+        topic_embeddings = get_topic_embeddings(self.model)
+        with stage_timer("encode.sentences"):
+            self.sentence_embeddings = self.model.encode(self.sentences, convert_to_tensor=True)
+        return relevance_results(self.sentences, self.sentence_embeddings, topic_embeddings)
+    
+    def document_embedding(self):
+        """
+        Mean-pooled, unit-length embedding of the whole text (see document_embedding)
         
-        return results
+        Returns:
+            float32 numpy array, or None for a text without sentences
+        """
+        if self.sentence_embeddings is None and self.sentences:
+            with stage_timer("encode.sentences"):
+                self.sentence_embeddings = self.model.encode(self.sentences, convert_to_tensor=True)
+        return document_embedding(self.sentence_embeddings if self.sentence_embeddings is not None else [])
     
     def get_overall_score(self):
         """
@@ -97,19 +171,4 @@ class SemanticAnalyzer:
         Returns:
             str: HTML string with colored sentences
         """
-        results = self.analyze_relevance()
-        
-        html_parts = []
-        for result in results:
-            sentence = result['sentence']
-            color = result['color']
-            score = result['score']
-            
-            # Create tooltip with score
-            html_parts.append(
-                f'<span style="background-color: {color}20; border-left: 3px solid {color}; '
-                f'padding: 2px 5px; margin: 2px 0; display: inline-block; border-radius: 3px;" '
-                f'title="Relevance: {score:.2f}">{sentence}.</span> '
-            )
-        
-        return ''.join(html_parts)
+        return highlight_html(self.analyze_relevance())
@@ -1,39 +1,44 @@
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from src.utils.telemetry import stage_timer
+from src.utils.rubric import band_score
+
+_shared_analyzer = None
+
+def get_vader():
+    """
+    Returns the process-wide VADER analyzer.
+    Building one re-reads the lexicon files; scoring with it is read-only and thread-safe.
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with stage_timer("model_load.vader"):
+            _shared_analyzer = SentimentIntensityAnalyzer()
+    return _shared_analyzer
+
+def sentiment_result(scores):
+    """Builds the sentiment result from VADER polarity scores"""
+    # Use compound score as it represents overall normalized sentiment
+    # Compound score ranges from -1 to 1, we treat positive values (0 to 1) as positivity
+    compound_score = scores['compound']
+    
+    # For negative compound scores, treat as low positivity
+    positivity_score = max(0, compound_score)
+    return {
+        "scores": scores,
+        "positivity_score": positivity_score,
+        "score": band_score("sentiment", positivity_score)
+    }
 
 class SentimentAnalyzer:
     def __init__(self, text):
         self.text = text
-        self.analyzer = SentimentIntensityAnalyzer()
+        self.analyzer = get_vader()
 
     def analyze_sentiment(self):
         """
         Analyzes sentiment using VADER.
         Returns a dictionary with scores and a label.
         """
-        scores = self.analyzer.polarity_scores(self.text)
-        # Use compound score as it represents overall normalized sentiment
-        # Compound score ranges from -1 to 1, we treat positive values (0 to 1) as positivity
-        compound_score = scores['compound']
-        
-        # For negative compound scores, treat as low positivity
-        positivity_score = max(0, compound_score)
-        
-        score = 0
-        if positivity_score >= 0.9:
-            score = 15
-        elif 0.7 <= positivity_score <= 0.89:
-            score = 12
-        elif 0.5 <= positivity_score <= 0.69:
-            score = 9
-        elif 0.3 <= positivity_score <= 0.49:
-            score = 6
-        else: # < 0.3
-            score = 3
-            
-        return {
-            "scores": scores,
-            "positivity_score": positivity_score,
-            "score": score
-        }
+        return sentiment_result(self.analyzer.polarity_scores(self.text))
 
 
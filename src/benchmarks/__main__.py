@@ -0,0 +1,232 @@
+"""
+Benchmark command line
+
+    python -m src.benchmarks run [--save-baseline]
+    python -m src.benchmarks compare [CURRENT] [--baseline PATH] [--threshold 0.2]
+    python -m src.benchmarks soak [--evaluations 5000] [--budget-mb 25]
+    python -m src.benchmarks loadtest [--users 8] [--rates 1 2 5 10] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from src.benchmarks.suite import (
+    BASELINE_PATH, BENCHMARK_DIR, DEFAULT_BATCH_SIZES, DEFAULT_MIN_DELTA, DEFAULT_SIZES,
+    DEFAULT_THRESHOLD, compare_runs, load_run, run_suite, save_run
+)
+from src.benchmarks.loadtest import (
+    DEFAULT_AUDIO_RATIO, DEFAULT_RATES, DEFAULT_REPEAT_RATIO, DEFAULT_SLO, DEFAULT_STEP_SECONDS, DEFAULT_USERS,
+    run_load_test
+)
+from src.benchmarks.soak import (
+    DEFAULT_EVALUATIONS, DEFAULT_RSS_BUDGET_MB, DEFAULT_SAMPLE_EVERY, DEFAULT_WARMUP, run_soak
+)
+
+def print_comparison(rows, threshold):
+    print(f"{'Benchmark':<32} {'Baseline':>12} {'Current':>12} {'Change':>9}")
+    print("-" * 68)
+    for row in rows:
+        flag = "  SLOWER" if row["regression"] else ""
+        print(f"{row['name']:<32} {row['baseline'] * 1000:>10.2f}ms {row['current'] * 1000:>10.2f}ms "
+              f"{(row['ratio'] - 1) * 100:>+8.1f}%{flag}")
+    regressions = [row for row in rows if row["regression"]]
+    print("-" * 68)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) more than {threshold:.0%} slower than the baseline")
+    else:
+        print(f"No benchmark more than {threshold:.0%} slower than the baseline")
+    return regressions
+
+def run_command(args):
+    print("AI Intro Evaluator - Benchmarks")
+    run = run_suite(
+        sizes=args.sizes,
+        batch_sizes=args.batch_sizes,
+        repeat=args.repeat,
+        analyzers=args.analyzers,
+        tier=args.tier
+    )
+    if args.save_baseline:
+        output = BASELINE_PATH
+    else:
+        output = args.output or os.path.join(
+            BENCHMARK_DIR, f"run-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+    save_run(run, output)
+    print(f"Results saved to: {output}")
+
+    if args.compare and not args.save_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        regressions = print_comparison(
+            compare_runs(load_run(args.baseline), run, args.threshold, args.min_delta), args.threshold
+        )
+        return 1 if regressions else 0
+    return 0
+
+def compare_command(args):
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return 2
+    current = args.current
+    if current is None:
+        runs = sorted(f for f in os.listdir(BENCHMARK_DIR) if f.startswith("run-") and f.endswith(".json"))
+        if not runs:
+            print(f"No benchmark runs found in {BENCHMARK_DIR}")
+            return 2
+        current = os.path.join(BENCHMARK_DIR, runs[-1])
+    print(f"Comparing {current} against {args.baseline}")
+    rows = compare_runs(load_run(args.baseline), load_run(current), args.threshold, args.min_delta)
+    return 1 if print_comparison(rows, args.threshold) else 0
+
+def soak_command(args):
+    print(f"AI Intro Evaluator - Soak test ({args.evaluations} evaluations, mode: {args.mode})")
+    report = run_soak(
+        evaluations=args.evaluations,
+        sample_every=args.sample_every,
+        warmup=args.warmup,
+        mode=args.mode,
+        cache=args.cache,
+        tier=args.tier,
+        top=args.top,
+        budget_mb=args.budget_mb
+    )
+    output = args.output or os.path.join(BENCHMARK_DIR, f"soak-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_run(report, output)
+
+    print("-" * 68)
+    print("Top allocation growth sites:")
+    for site in report["growth_sites"]:
+        print(f"  {site['size_diff'] / 1024:>10.1f} KB  {site['count_diff']:>+8} blocks  {site['site']}")
+    print("-" * 68)
+    print(f"Traced Python memory growth: {report['traced_growth_per_1k'] / 2**20:.2f} MB per 1k evaluations")
+    print(f"RSS growth (incl. child processes): {report['rss_growth_per_1k'] / 2**20:.2f} MB per 1k evaluations "
+          f"(budget {args.budget_mb:.1f} MB)")
+    print(f"Report saved to: {output}")
+    if not report["passed"]:
+        print("FAILED: RSS growth exceeds the budget")
+        return 1
+    print("PASSED")
+    return 0
+
+def _ms(value):
+    return f"{value * 1000:>8.0f}" if value is not None else f"{'-':>8}"
+
+def loadtest_command(args):
+    target = f"{args.workers} worker processes" if args.workers else "in-process"
+    print(f"AI Intro Evaluator - Load test ({args.users} virtual users, {target}, tier: {args.tier})")
+    report = run_load_test(
+        users=args.users,
+        rates=args.rates,
+        duration=args.duration,
+        audio_ratio=args.audio_ratio,
+        repeat_ratio=args.repeat_ratio,
+        tier=args.tier,
+        cache=args.cache,
+        workers=args.workers,
+        slo=args.slo,
+        stop_on_saturation=not args.all_rates
+    )
+    output = args.output or os.path.join(BENCHMARK_DIR, f"load-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_run(report, output)
+
+    print("-" * 78)
+    print(f"{'Rate/s':>7} {'Reqs':>6} {'Done/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Errors':>7} "
+          f"{'Degraded':>9}  Status")
+    for step in report["steps"]:
+        status = "SATURATED" if step["saturated"] else "ok"
+        print(f"{step['rate']:>7g} {step['requests']:>6} {step['throughput']:>7.2f} {_ms(step['p50'])} "
+              f"{_ms(step['p95'])} {_ms(step['p99'])} {step['error_rate']:>7.1%} {step['degraded']:>9}  {status}")
+    print("-" * 78)
+    if report["max_sustained_rate"] is not None:
+        print(f"Highest sustained rate: {report['max_sustained_rate']:g} submissions/s "
+              f"(p95 under {args.slo:g}s)")
+    if report["saturation_rate"] is not None:
+        saturated = next(step for step in report["steps"] if step["saturated"])
+        print(f"Saturated at {report['saturation_rate']:g}/s: {'; '.join(saturated['reasons'])}")
+        for error in saturated["error_samples"]:
+            print(f"  error: {error}")
+    else:
+        print("No step saturated; try higher --rates")
+    print(f"Report saved to: {output}")
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks", description="AI Intro Evaluator benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_compare_options(sub):
+        sub.add_argument("--baseline", default=BASELINE_PATH, help="Baseline run to compare against")
+        sub.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Relative slowdown flagged as a regression (0.2 = 20%%)")
+        sub.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                         help="Ignore slowdowns smaller than this many seconds")
+
+    run = subparsers.add_parser("run", help="Run the benchmarks and save the timings")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                     help="Introduction lengths in words")
+    run.add_argument("--batch-sizes", type=int, nargs="+", default=list(DEFAULT_BATCH_SIZES),
+                     help="Introductions per batch benchmark")
+    run.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (median is kept)")
+    run.add_argument("--analyzers", nargs="+", default=None,
+                     help="Analyzers to time (default: the tier's default analyzers)")
+    run.add_argument("--tier", choices=["fast", "full"], default="full")
+    run.add_argument("--output", default=None, help="Where to save this run")
+    run.add_argument("--save-baseline", action="store_true", help=f"Save this run as {BASELINE_PATH}")
+    run.add_argument("--compare", action="store_true", help="Compare against the baseline after running")
+    add_compare_options(run)
+
+    compare = subparsers.add_parser("compare", help="Flag slowdowns between two saved runs")
+    compare.add_argument("current", nargs="?", default=None,
+                         help="Run to check (default: the newest run in data/benchmarks)")
+    add_compare_options(compare)
+
+    soak = subparsers.add_parser("soak", help="Run many evaluations and check memory growth")
+    soak.add_argument("--evaluations", type=int, default=DEFAULT_EVALUATIONS,
+                      help="Evaluations to run after warm-up")
+    soak.add_argument("--sample-every", type=int, default=DEFAULT_SAMPLE_EVERY,
+                      help="Take a memory sample every N evaluations")
+    soak.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                      help="Evaluations run before the baseline snapshot")
+    soak.add_argument("--mode", choices=["evaluate", "incremental"], default="evaluate",
+                      help="Distinct evaluate_text calls, or repeated edits through the incremental evaluator")
+    soak.add_argument("--cache", action="store_true", help="Use an in-memory result cache")
+    soak.add_argument("--tier", choices=["fast", "full"], default="full")
+    soak.add_argument("--top", type=int, default=10, help="Allocation growth sites to report")
+    soak.add_argument("--budget-mb", type=float, default=DEFAULT_RSS_BUDGET_MB,
+                      help="Allowed RSS growth per 1000 evaluations, in MB")
+    soak.add_argument("--output", default=None, help="Where to save the soak report")
+
+    load = subparsers.add_parser("loadtest", help="Simulate concurrent graders and find the saturation point")
+    load.add_argument("--users", type=int, default=DEFAULT_USERS, help="Virtual users (concurrent graders)")
+    load.add_argument("--rates", type=float, nargs="+", default=list(DEFAULT_RATES),
+                      help="Arrival rates to step through, in submissions per second")
+    load.add_argument("--duration", type=float, default=DEFAULT_STEP_SECONDS, help="Seconds per rate step")
+    load.add_argument("--audio-ratio", type=float, default=DEFAULT_AUDIO_RATIO, help="Share of audio submissions")
+    load.add_argument("--repeat-ratio", type=float, default=DEFAULT_REPEAT_RATIO,
+                      help="Share of resubmitted texts")
+    load.add_argument("--workers", type=int, default=None,
+                      help="Evaluate on this many worker processes instead of in-process")
+    load.add_argument("--cache", action="store_true", help="Use an in-memory result cache (in-process)")
+    load.add_argument("--tier", choices=["fast", "full"], default="full")
+    load.add_argument("--slo", type=float, default=DEFAULT_SLO,
+                      help="p95 latency in seconds above which a step counts as saturated")
+    load.add_argument("--all-rates", action="store_true", help="Keep stepping after the first saturated rate")
+    load.add_argument("--output", default=None, help="Where to save the load test report")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "run":
+        return run_command(args)
+    if args.command == "soak":
+        return soak_command(args)
+    if args.command == "loadtest":
+        return loadtest_command(args)
+    return compare_command(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Synthetic Corpus Module
+Deterministic student introductions with controlled length, filler density and keyword coverage
+"""
+
+import random
+
+from src.config import KEYWORDS, SALUTATIONS, CLOSINGS, FILLER_WORDS
+from src.utils.text_utils import tokenize_text
+
+# Every phrase the content analyzer matches (as substrings of the lowercased text)
+_CONTENT_PHRASES = (
+    [phrase for group in KEYWORDS.values() for phrases in group.values() for phrase in phrases]
+    + [phrase for phrases in SALUTATIONS.values() for phrase in phrases]
+    + list(CLOSINGS)
+)
+
+_PADDING_CANDIDATES = [
+    "garden", "river", "window", "yellow", "quiet", "morning", "table", "paper", "bicycle",
+    "market", "orange", "pencil", "summer", "winter", "cloud", "bridge", "forest", "kitchen",
+    "letter", "number", "garden", "simple", "bright", "silver", "travel", "village", "music",
+    "ocean", "mountain", "planet", "rocket", "puzzle", "basket", "candle", "carpet", "coffee",
+    "doctor", "engine", "farmer", "guitar", "harbor", "island", "jacket", "ladder", "lemon",
+    "meadow", "needle", "oxygen", "pepper", "rabbit", "saddle", "tunnel", "velvet", "wagon",
+    "across", "around", "during", "under", "over", "along", "every", "often", "quickly",
+    "calm", "green", "round", "small", "large", "early", "late", "warm", "cold", "blue",
+    "walks", "reads", "builds", "paints", "opens", "carries", "follows", "counts", "draws"
+]
+
+# Padding words that can never complete a keyword, salutation, closing or filler on their own
+PADDING_WORDS = sorted({
+    word for word in _PADDING_CANDIDATES
+    if word not in FILLER_WORDS and not any(phrase in word for phrase in _CONTENT_PHRASES)
+})
+
+# Fillers that are counted per token (multi-word fillers are matched as substrings)
+SINGLE_WORD_FILLERS = [filler for filler in FILLER_WORDS if " " not in filler]
+
+def keyword_topics():
+    """(group, topic) pairs in rubric order, Must Have first"""
+    return [(group, topic) for group, topics in KEYWORDS.items() for topic in topics]
+
+def _sentence(words):
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + "."
+
+def _padding(rng, count):
+    return [rng.choice(PADDING_WORDS) for _ in range(count)]
+
+def generate_intro(word_count, filler_rate=0.03, keyword_coverage=1.0, salutation=True,
+                   closing=True, seed=0):
+    """
+    Build one synthetic introduction.
+
+    Args:
+        word_count: Target number of words (as counted by tokenize_text); the topic,
+            salutation and closing sentences are always included, so very small
+            targets can be exceeded
+        filler_rate: Fraction of words that are filler words (0.05 = 5 per 100 words)
+        keyword_coverage: Fraction of keyword topics mentioned (0-1), Must Have topics first
+        salutation: Open with a salutation
+        closing: End with a closing phrase
+        seed: Random seed; the same arguments always give the same text
+
+    Returns:
+        str: The introduction
+    """
+    rng = random.Random(seed)
+    sentences = []
+    if salutation:
+        sentences.append(tokenize_text(rng.choice(SALUTATIONS["Good"])) + ["all"])
+
+    topics = keyword_topics()
+    covered = topics[:int(round(keyword_coverage * len(topics)))]
+    for group, topic in covered:
+        phrase = rng.choice(KEYWORDS[group][topic])
+        sentences.append(_padding(rng, 2) + phrase.split() + _padding(rng, 3))
+
+    closing_words = tokenize_text(CLOSINGS[0]) if closing else []
+    filler_count = int(round(filler_rate * word_count))
+    used = sum(len(tokenize_text(" ".join(s))) for s in sentences) + len(closing_words) + filler_count
+
+    # Neutral sentences of 6-12 words until the target length is reached
+    while used < word_count:
+        length = min(rng.randint(6, 12), word_count - used)
+        sentences.append(_padding(rng, length))
+        used += length
+
+    # Fillers open random sentences ("um uh garden river ...") so no phrase is split
+    for _ in range(filler_count):
+        sentences[rng.randrange(len(sentences))].insert(0, rng.choice(SINGLE_WORD_FILLERS))
+
+    if closing_words:
+        sentences.append(closing_words)
+    return " ".join(_sentence(words) for words in sentences)
+
+def generate_corpus(count, word_count, filler_rate=0.03, keyword_coverage=1.0, seed=0):
+    """
+    Distinct introductions with the same shape (so nothing is served from the result cache).
+
+    Returns:
+        list of str
+    """
+    return [generate_intro(word_count, filler_rate=filler_rate, keyword_coverage=keyword_coverage,
+                           seed=seed + i)
+            for i in range(count)]
@@ -0,0 +1,270 @@
+"""
+Load Test Module
+Simulates concurrent graders: virtual users submit synthetic text and audio introductions at
+stepped arrival rates, and each step reports throughput, latency percentiles and error rates
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from src.benchmarks.corpus import generate_intro
+from src.engine.result import is_computed
+from src.utils.telemetry import percentile
+
+DEFAULT_USERS = 8
+DEFAULT_RATES = (1, 2, 5, 10, 20, 50)
+DEFAULT_STEP_SECONDS = 20.0
+DEFAULT_AUDIO_RATIO = 0.3
+# Share of submissions that are resubmissions of an earlier text (teachers re-grading)
+DEFAULT_REPEAT_RATIO = 0.1
+# A step is saturated when p95 latency exceeds this many seconds...
+DEFAULT_SLO = 2.0
+# ...when throughput falls this far below the offered rate, or errors exceed this share
+THROUGHPUT_TOLERANCE = 0.1
+MAX_ERROR_RATE = 0.01
+
+def build_submissions(count, audio_ratio=DEFAULT_AUDIO_RATIO, min_words=80, max_words=250, seed=0):
+    """
+    Generate a pool of submissions with a realistic spread of length, filler density and
+    keyword coverage.
+
+    Audio submissions carry the recording length (audio_duration, in minutes) implied by a
+    speaking rate of 100-170 WPM, as the app passes it after transcription. The engine grades
+    transcripts, so the Whisper step itself is not part of the load.
+
+    Returns:
+        list of dicts with kind ('text' or 'audio'), text, audio_duration and words
+    """
+    rng = random.Random(seed)
+    submissions = []
+    for i in range(count):
+        words = rng.randint(min_words, max_words)
+        text = generate_intro(words, filler_rate=rng.uniform(0.0, 0.08),
+                              keyword_coverage=rng.uniform(0.5, 1.0), seed=seed * 100000 + i)
+        audio = rng.random() < audio_ratio
+        submissions.append({
+            "kind": "audio" if audio else "text",
+            "text": text,
+            "audio_duration": words / rng.uniform(100, 170) if audio else None,
+            "words": words
+        })
+    return submissions
+
+def _degraded(results):
+    """True when an analyzer fell back to a placeholder (e.g. LanguageTool unavailable)"""
+    return not all(is_computed(value) and value.get("available", True)
+                   for value in results.values() if isinstance(value, dict))
+
+def make_in_process_target(tier="full", cache=False):
+    """Target calling evaluate_text in this process, on the shared analyzer thread pool"""
+    from src.engine.cache import ResultCache
+    from src.engine.pipeline import evaluate_text
+
+    # Memory-only cache so a load test never writes to the shared SQLite file
+    result_cache = ResultCache(None) if cache else False
+
+    def target(submission):
+        result = evaluate_text(submission["text"], audio_duration=submission["audio_duration"],
+                               cache=result_cache, tier=tier)
+        return _degraded(result)
+    return target, None
+
+def _load_worker_init():
+    from src import config
+    from src.engine.batch import warm_up
+
+    # Workers keep batch mode's per-process result cache, but never write the shared SQLite file
+    config.CACHE_PATH = None
+    warm_up()
+
+def make_process_pool_target(workers, tier="full"):
+    """Target sending each submission to a pool of warm worker processes, as batch mode does"""
+    from src.engine.batch import evaluate_record
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_load_worker_init)
+    # Start every worker (and its LanguageTool JVM) before the first step is timed
+    wait([pool.submit(time.sleep, 0.05) for _ in range(workers)])
+
+    def target(submission):
+        record = {"id": "load", "text": submission["text"], "audio_duration": submission["audio_duration"]}
+        line = pool.submit(evaluate_record, record, tier).result()
+        if "error" in line:
+            raise RuntimeError(line["error"])
+        return _degraded(line["results"])
+    return target, pool
+
+def _summarize(rate, samples, duration, wall, slo):
+    ok = [s for s in samples if s["error"] is None]
+    latencies = [s["latency"] for s in ok]
+    errors = len(samples) - len(ok)
+    throughput = len(ok) / wall if wall > 0 else 0.0
+    # Compare against the arrivals actually drawn, not the nominal rate, so Poisson noise
+    # on a short step isn't mistaken for saturation
+    offered = len(samples) / duration if duration > 0 else 0.0
+    error_rate = errors / len(samples) if samples else 0.0
+    p95 = percentile(latencies, 95)
+
+    reasons = []
+    if p95 is not None and p95 > slo:
+        reasons.append(f"p95 {p95:.2f}s > {slo:.2f}s")
+    if throughput < offered * (1 - THROUGHPUT_TOLERANCE):
+        reasons.append(f"throughput {throughput:.2f}/s < offered {offered:.2f}/s")
+    if error_rate > MAX_ERROR_RATE:
+        reasons.append(f"error rate {error_rate:.1%}")
+
+    by_kind = {}
+    for kind in ("text", "audio"):
+        kind_latencies = [s["latency"] for s in ok if s["kind"] == kind]
+        by_kind[kind] = {"requests": sum(1 for s in samples if s["kind"] == kind),
+                         "p95": percentile(kind_latencies, 95)}
+
+    return {
+        "rate": rate,
+        "offered": offered,
+        "requests": len(samples),
+        "completed": len(ok),
+        "errors": errors,
+        "error_rate": error_rate,
+        "degraded": sum(1 for s in ok if s["degraded"]),
+        "wall": wall,
+        "throughput": throughput,
+        "p50": percentile(latencies, 50),
+        "p95": p95,
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else None,
+        "queue_p95": percentile([s["queued"] for s in ok], 95),
+        "by_kind": by_kind,
+        "error_samples": sorted({s["error"] for s in samples if s["error"]})[:5],
+        "saturated": bool(reasons),
+        "reasons": reasons
+    }
+
+def run_step(target, rate, duration, users, submissions, repeat_ratio=DEFAULT_REPEAT_RATIO, slo=DEFAULT_SLO,
+             seed=0, offset=0):
+    """
+    Offer Poisson arrivals at `rate` per second for `duration` seconds to `users` virtual users.
+
+    Arrivals are open-loop: a submission that finds every user busy waits, and its latency is
+    measured from its scheduled arrival, so a backed-up system shows up in the percentiles
+    instead of silently lowering the offered load.
+
+    Fresh submissions are taken from the pool in order starting at offset, so consecutive
+    steps do not resend the same texts.
+
+    Returns:
+        dict of step statistics (see _summarize)
+    """
+    rng = random.Random(seed)
+    samples = []
+    lock = threading.Lock()
+    sent = []
+
+    def visit(submission, arrival):
+        began = time.perf_counter()
+        error = None
+        degraded = False
+        try:
+            degraded = target(submission)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        with lock:
+            samples.append({"kind": submission["kind"], "latency": finished - arrival,
+                            "queued": began - arrival, "error": error, "degraded": degraded})
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=users, thread_name_prefix="virtual-user") as executor:
+        start = time.perf_counter()
+        arrival = start
+        while True:
+            arrival += rng.expovariate(rate)
+            if arrival - start > duration:
+                break
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if sent and rng.random() < repeat_ratio:
+                submission = rng.choice(sent)
+            else:
+                submission = submissions[(offset + len(sent)) % len(submissions)]
+            sent.append(submission)
+            futures.append(executor.submit(visit, submission, arrival))
+        wait(futures)
+    return _summarize(rate, samples, duration, time.perf_counter() - start, slo)
+
+def run_load_test(users=DEFAULT_USERS, rates=DEFAULT_RATES, duration=DEFAULT_STEP_SECONDS,
+                  audio_ratio=DEFAULT_AUDIO_RATIO, repeat_ratio=DEFAULT_REPEAT_RATIO, tier="full", cache=False,
+                  workers=None, slo=DEFAULT_SLO, stop_on_saturation=True, seed=0, log=print):
+    """
+    Step through arrival rates and find where the engine saturates.
+
+    There is no HTTP API in this project, so the virtual users call the engine directly:
+    evaluate_text in this process, or a pool of warm worker processes when workers is set.
+
+    Args:
+        users: Virtual users (concurrent graders)
+        rates: Arrival rates to step through, in submissions per second
+        duration: Seconds of arrivals per step
+        audio_ratio: Share of audio submissions
+        repeat_ratio: Share of resubmitted texts
+        tier: Evaluation tier
+        cache: Use an in-memory result cache in this process (worker processes always keep
+            their own in-memory cache, as in batch mode)
+        workers: Worker processes; None evaluates in this process
+        slo: p95 latency in seconds above which a step counts as saturated
+        stop_on_saturation: Stop after the first saturated step
+        seed: Seed for the corpus and the arrival process
+        log: Callable used for progress messages
+
+    Returns:
+        dict with settings, per-step statistics, the saturation rate and the highest
+        sustained rate (None if no step saturated / none was sustained)
+    """
+    from src.engine.batch import warm_up
+
+    warm_up()
+    submissions = build_submissions(max(200, int(max(rates) * duration)), audio_ratio, seed=seed)
+    if workers:
+        target, pool = make_process_pool_target(workers, tier)
+    else:
+        target, pool = make_in_process_target(tier, cache)
+
+    # One untimed pass per submission kind so lazy loading does not land in the first step
+    for kind in ("text", "audio"):
+        sample = next((s for s in submissions if s["kind"] == kind), None)
+        if sample is not None:
+            target(sample)
+
+    steps = []
+    sent = 0
+    try:
+        for i, rate in enumerate(rates):
+            log(f"  {rate:g}/s for {duration:g}s with {users} users...")
+            step = run_step(target, rate, duration, users, submissions, repeat_ratio, slo, seed=seed + i,
+                            offset=sent)
+            sent += step["requests"]
+            steps.append(step)
+            log(f"    throughput {step['throughput']:.2f}/s, p95 {_seconds(step['p95'])}, "
+                f"errors {step['error_rate']:.1%}" + (f"  SATURATED ({'; '.join(step['reasons'])})"
+                                                      if step["saturated"] else ""))
+            if step["saturated"] and stop_on_saturation:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    saturated = [step["rate"] for step in steps if step["saturated"]]
+    sustained = [step["rate"] for step in steps if not step["saturated"]]
+    return {
+        "settings": {"users": users, "rates": list(rates), "duration": duration, "audio_ratio": audio_ratio,
+                     "repeat_ratio": repeat_ratio, "tier": tier, "cache": cache, "workers": workers,
+                     "slo": slo, "seed": seed},
+        "steps": steps,
+        "saturation_rate": saturated[0] if saturated else None,
+        "max_sustained_rate": max(sustained) if sustained else None
+    }
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.3f}s"
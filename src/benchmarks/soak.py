@@ -0,0 +1,188 @@
+"""
+Soak Test Module
+Drives thousands of in-process evaluations while sampling tracemalloc and process RSS
+(including child processes such as the LanguageTool JVM) to catch slow memory growth
+"""
+
+import gc
+import os
+import time
+import tracemalloc
+
+from src.benchmarks.corpus import generate_intro
+from src.utils.telemetry import memory_usage
+
+DEFAULT_EVALUATIONS = 5000
+DEFAULT_SAMPLE_EVERY = 250
+DEFAULT_WARMUP = 200
+# Allowed RSS growth (self + children) per 1000 evaluations once warmed up
+DEFAULT_RSS_BUDGET_MB = 25.0
+
+# Allocations made by the measuring itself
+_IGNORED_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>",
+                  tracemalloc.__file__, __file__)
+
+def process_tree_rss(pid=None):
+    """
+    Resident memory of a process and of all its descendants, in bytes.
+
+    Descendants are found through /proc, so on other platforms only the process itself
+    is measured and children are reported as None.
+
+    Returns:
+        tuple: (own rss, descendants' rss)
+    """
+    pid = pid or os.getpid()
+    if not os.path.isdir("/proc"):
+        return memory_usage()["rss_bytes"], None
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may contain spaces
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+
+    def rss(process_id):
+        try:
+            with open(f"/proc/{process_id}/statm", "r") as f:
+                return int(f.read().split()[1]) * page_size
+        except (OSError, ValueError):
+            return 0
+
+    descendants = 0
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        descendants += rss(child)
+        stack.extend(children.get(child, []))
+    return rss(pid), descendants
+
+def growth_per_thousand(samples, key):
+    """Least-squares slope of samples[key] over the evaluation count, per 1000 evaluations"""
+    points = [(s["evaluations"], s[key]) for s in samples if s[key] is not None]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return slope * 1000
+
+def _make_step(mode, cache, tier, word_count):
+    if mode == "incremental":
+        from src.engine.incremental import IncrementalEvaluator
+
+        evaluator = IncrementalEvaluator(grammar=tier == "full")
+        base = generate_intro(word_count, seed=0)
+
+        def step(i):
+            # Simulates a student editing one sentence between evaluations
+            evaluator.update(base + f" Walks {i} quiet bridge.")
+        return step
+
+    from src.engine.cache import ResultCache
+    from src.engine.pipeline import evaluate_text
+
+    # Memory-only cache so the soak never writes to the shared SQLite file
+    result_cache = ResultCache(None) if cache else False
+
+    def step(i):
+        # Every 4th text repeats, so a cache sees hits as well as misses
+        seed = i - i % 4 if cache else i
+        evaluate_text(generate_intro(word_count, seed=seed), cache=result_cache, tier=tier)
+    return step
+
+def run_soak(evaluations=DEFAULT_EVALUATIONS, sample_every=DEFAULT_SAMPLE_EVERY, warmup=DEFAULT_WARMUP,
+             mode="evaluate", cache=False, tier="full", word_count=150, top=10,
+             budget_mb=DEFAULT_RSS_BUDGET_MB, log=print):
+    """
+    Run the soak test.
+
+    Args:
+        evaluations: Evaluations to run after warm-up
+        sample_every: Take a memory sample every this many evaluations
+        warmup: Evaluations run before the baseline snapshot (loads models, fills pools)
+        mode: "evaluate" (evaluate_text on distinct texts) or "incremental" (repeated edits)
+        cache: Use an in-memory result cache in evaluate mode
+        tier: Evaluation tier
+        word_count: Length of each introduction
+        top: Number of allocation growth sites to report
+        budget_mb: Allowed RSS growth per 1000 evaluations, in MB
+        log: Callable used for progress messages
+
+    Returns:
+        dict with samples, growth rates, top allocation growth sites and 'passed'
+    """
+    from src.engine.batch import warm_up
+
+    warm_up()
+    step = _make_step(mode, cache, tier, word_count)
+
+    log(f"Warming up with {warmup} evaluations...")
+    for i in range(warmup):
+        step(i)
+
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.take_snapshot()
+    samples = []
+    start = time.perf_counter()
+
+    def sample(done):
+        gc.collect()
+        own, children = process_tree_rss()
+        traced, _ = tracemalloc.get_traced_memory()
+        samples.append({
+            "evaluations": done,
+            "elapsed": time.perf_counter() - start,
+            "rss_bytes": own,
+            "children_rss_bytes": children,
+            "total_rss_bytes": own + (children or 0),
+            "traced_bytes": traced
+        })
+        log(f"  {done} evaluations: rss {own / 2**20:.1f} MB"
+            + (f", children {children / 2**20:.1f} MB" if children is not None else "")
+            + f", traced {traced / 2**20:.1f} MB")
+
+    sample(0)
+    for i in range(evaluations):
+        step(warmup + i)
+        if (i + 1) % sample_every == 0:
+            sample(i + 1)
+    if evaluations % sample_every:
+        sample(evaluations)
+
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, name) for name in _IGNORED_FILES]
+    stats = final.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+    growth_sites = [
+        {"site": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+        for stat in stats if stat.size_diff > 0
+    ][:top]
+
+    rss_growth = growth_per_thousand(samples, "total_rss_bytes")
+    return {
+        "mode": mode,
+        "tier": tier,
+        "cache": cache,
+        "evaluations": evaluations,
+        "elapsed": time.perf_counter() - start,
+        "samples": samples,
+        "rss_growth_per_1k": rss_growth,
+        "traced_growth_per_1k": growth_per_thousand(samples, "traced_bytes"),
+        "growth_sites": growth_sites,
+        "budget_per_1k": budget_mb * 2**20,
+        "passed": rss_growth <= budget_mb * 2**20
+    }
@@ -0,0 +1,156 @@
+"""
+Benchmark Suite Module
+Times each analyzer and the full evaluate_text path on synthetic introductions and compares runs
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+
+from src.benchmarks.corpus import generate_intro, generate_corpus
+from src.engine.cache import rubric_fingerprint
+from src.engine.pipeline import evaluate_text
+from src.engine.registry import get_analyzer_specs
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_BATCH_SIZES = (1, 10, 100, 1000)
+DEFAULT_THRESHOLD = 0.2
+# Slowdowns smaller than this (seconds) are treated as timer noise
+DEFAULT_MIN_DELTA = 0.0005
+BENCHMARK_DIR = os.path.join("data", "benchmarks")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+def measure(func, repeat):
+    """
+    Call func repeat times.
+
+    Returns:
+        dict with median, min and max wall time in seconds and the number of runs
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "max": max(times), "runs": repeat}
+
+def run_suite(sizes=DEFAULT_SIZES, batch_sizes=DEFAULT_BATCH_SIZES, repeat=3, analyzers=None,
+              tier="full", batch_words=100, log=print):
+    """
+    Run every benchmark.
+
+    Each analyzer is called directly (no cache, no scheduler) and evaluate_text runs with
+    caching and coalescing off, once per text size. Batches evaluate distinct
+    introductions of batch_words words one after another.
+
+    Args:
+        sizes: Introduction lengths in words
+        batch_sizes: Number of introductions per batch
+        repeat: Runs per benchmark (the median is reported); batches of 100 or more run once
+        analyzers: Analyzer names to time (defaults to the default analyzers of the tier)
+        tier: Tier passed to evaluate_text
+        batch_words: Length of each introduction in the batch benchmarks
+        log: Callable used for progress messages
+
+    Returns:
+        dict with 'meta' and 'results' (benchmark name -> timing stats)
+    """
+    from src.engine.batch import warm_up
+
+    # Start the JVM and load lexicons up front so the first benchmark doesn't pay for them
+    warm_up()
+
+    specs = get_analyzer_specs(analyzers, tier=tier)
+    results = {}
+
+    for size in sizes:
+        text = generate_intro(size, seed=size)
+        values = {"text": text, "audio_duration": None}
+        for spec in specs:
+            name = f"analyzer.{spec.name}/{size}w"
+            try:
+                spec.run(values)
+                results[name] = measure(lambda: spec.run(values), repeat)
+            except Exception as e:
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+            log(f"  {name}: {_describe(results[name])}")
+
+        name = f"evaluate/{size}w"
+        results[name] = measure(
+            lambda: evaluate_text(text, analyzers=analyzers, cache=False, coalesce=False, tier=tier), repeat
+        )
+        log(f"  {name}: {_describe(results[name])}")
+
+    for batch_size in batch_sizes:
+        texts = generate_corpus(batch_size, batch_words, seed=batch_size * 1000)
+
+        def run_batch():
+            for text in texts:
+                evaluate_text(text, analyzers=analyzers, cache=False, coalesce=False, tier=tier)
+
+        name = f"batch/{batch_size}x{batch_words}w"
+        stats = measure(run_batch, repeat if batch_size < 100 else 1)
+        stats["per_item"] = stats["median"] / batch_size
+        stats["per_second"] = batch_size / stats["median"] if stats["median"] > 0 else 0.0
+        results[name] = stats
+        log(f"  {name}: {_describe(stats)} ({stats['per_second']:.1f} intros/s)")
+
+    meta = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "rubric": rubric_fingerprint(),
+        "analyzers": {spec.name: spec.version for spec in specs},
+        "tier": tier,
+        "repeat": repeat
+    }
+    return {"meta": meta, "results": results}
+
+def _describe(stats):
+    if "error" in stats:
+        return f"failed ({stats['error']})"
+    return f"{stats['median'] * 1000:.2f} ms median"
+
+def save_run(run, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+
+def load_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_runs(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Compare the median timings of two runs.
+
+    Args:
+        baseline: Run dict (as returned by run_suite / load_run) to compare against
+        current: Run dict being checked
+        threshold: Relative slowdown that counts as a regression (0.2 = 20% slower)
+        min_delta: Absolute slowdown in seconds below which nothing is flagged
+
+    Returns:
+        list of dicts (name, baseline, current, ratio, regression) for benchmarks in both runs
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None or "error" in base or "error" in now:
+            continue
+        ratio = now["median"] / base["median"] if base["median"] > 0 else float("inf")
+        regression = ratio > 1 + threshold and now["median"] - base["median"] > min_delta
+        rows.append({
+            "name": name,
+            "baseline": base["median"],
+            "current": now["median"],
+            "ratio": ratio,
+            "regression": regression
+        })
+    return rows
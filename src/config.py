@@ -1,4 +1,8 @@
 # Configuration and Constants
+import os
+
+# Bump whenever scoring rules change; cached results from other versions are discarded
+RUBRIC_VERSION = "2"
 
 # Keywords to look for
 KEYWORDS = {
@@ -34,4 +38,101 @@ SALUTATIONS = {
 # Closing keywords
 CLOSINGS = ["thank you", "thanks", "regards", "best", "sincerely", "that's all", "thanking you"]
 
+# Rubric categories (result key -> maximum score), in report order
+SCORE_CATEGORIES = {
+    "salutation": 5,
+    "keywords": 30,
+    "flow": 5,
+    "speech_rate": 10,
+    "grammar": 10,
+    "vocabulary": 10,
+    "filler": 15,
+    "sentiment": 15
+}
+
+# Points per topic found, by keyword group
+KEYWORD_POINTS = {"Must Have": 4, "Good to Have": 2}
+
+# Points per salutation level ("None" when there is no salutation)
+SALUTATION_POINTS = {"Excellent": 5, "Good": 4, "Normal": 2, "None": 0}
+
+# Points for an introduction with every section, in the expected order
+FLOW_POINTS = 5
+
+# Score bands per rubric metric: scores[i] applies between breakpoints[i - 1] and breakpoints[i].
+# With inclusive "lower" a value equal to a breakpoint falls in the band above it (0.9 <= x);
+# with "upper" it falls in the band below it (x <= 3).
+RUBRIC_BANDS = {
+    "grammar": {  # g_index
+        "breakpoints": [0.3, 0.5, 0.7, 0.9],
+        "scores": [2, 4, 6, 8, 10],
+        "inclusive": "lower"
+    },
+    "speech_rate": {  # words per minute
+        "breakpoints": [81, 111, 141, 161],
+        "scores": [2, 6, 10, 6, 2],
+        "inclusive": "lower"
+    },
+    "vocabulary": {  # type-token ratio
+        "breakpoints": [0.3, 0.5, 0.7, 0.9],
+        "scores": [2, 4, 6, 8, 10],
+        "inclusive": "lower"
+    },
+    "filler": {  # fillers per 100 words
+        "breakpoints": [3, 6, 9, 12],
+        "scores": [15, 12, 9, 6, 3],
+        "inclusive": "upper"
+    },
+    "sentiment": {  # positivity (compound score clipped at 0)
+        "breakpoints": [0.3, 0.5, 0.7, 0.9],
+        "scores": [3, 6, 9, 12, 15],
+        "inclusive": "lower"
+    }
+}
+
+# Raw-feature store (per-evaluation features and scores, for re-scoring under a new rubric)
+FEATURE_STORE_ENABLED = os.environ.get("AIE_FEATURE_STORE", "1").lower() not in ("0", "false", "no", "off")
+FEATURE_STORE_PATH = os.environ.get("AIE_FEATURE_STORE_PATH", os.path.join("data", "store", "features.sqlite"))
+
+# Near-duplicate detection (MinHash over word shingles, LSH banding). The threshold is the
+# estimated Jaccard similarity of two submissions' shingle sets; changing the shingle size or
+# permutation count invalidates stored signatures.
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+NEAR_DUPLICATE_THRESHOLD = 0.5
+
+# Semantic similarity index (mean-pooled all-MiniLM-L6-v2 embeddings in a memory-mapped matrix
+# next to the feature store). Vectors are searched exhaustively until EMBEDDING_TRAIN_MIN of them
+# exist, then through an IVF index of about sqrt(n) k-means lists, retrained whenever the corpus
+# doubles (on a background thread); a query scores the vectors of the EMBEDDING_NPROBE closest lists.
+EMBEDDING_DIM = 384
+EMBEDDING_TRAIN_MIN = 2048
+EMBEDDING_NPROBE = 16
+EMBEDDING_KMEANS_ITERATIONS = 10
+SIMILAR_SUBMISSIONS = 5
+
+# Batch mode: records sent to a worker process per task
+BATCH_CHUNK_SIZE = 8
+
+# Result cache (LRU memory tier + SQLite disk tier)
+CACHE_MAX_ENTRIES = 1024
+CACHE_PATH = os.environ.get("AIE_CACHE_PATH", os.path.join("data", "cache", "results.sqlite"))
+
+# Telemetry (metrics.prom + telemetry.json for the admin dashboard)
+TELEMETRY_DIR = os.environ.get("AIE_TELEMETRY_DIR", os.path.join("data", "telemetry"))
+TELEMETRY_RING_SIZE = 2048
+TELEMETRY_FLUSH_INTERVAL = 2.0
+
+# Per-request profiling: set AIE_PROFILE to "cprofile" or "sample" to profile every evaluation
+PROFILE_MODE = os.environ.get("AIE_PROFILE") or None
+PROFILE_DIR = os.environ.get("AIE_PROFILE_DIR", os.path.join("data", "profiles"))
+# Admin-only parts of the app (the profiling selector, and the names, cohorts and scores of other
+# students in the near-duplicate and similar-intro panels) are only shown with AIE_ADMIN=1
+ADMIN_CONTROLS = os.environ.get("AIE_ADMIN", "0").lower() in ("1", "true", "yes", "on")
 
+# Span tracing: set AIE_TRACE=0 to turn it off
+TRACE_ENABLED = os.environ.get("AIE_TRACE", "1").lower() not in ("0", "false", "no", "off")
+TRACE_PATH = os.environ.get("AIE_TRACE_PATH", os.path.join("data", "traces", "traces.jsonl"))
+TRACE_MAX_BYTES = 10 * 1024 * 1024
+TRACE_BACKUP_COUNT = 5
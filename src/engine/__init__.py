@@ -0,0 +1,17 @@
+"""
+Evaluation engine for AI Intro Evaluator
+"""
+
+from .registry import AnalyzerSpec, register_analyzer, get_analyzer_specs
+from .result import EvaluationResult
+from .scheduler import run_analyzers
+from .pipeline import evaluate_text
+
+__all__ = [
+    'AnalyzerSpec',
+    'register_analyzer',
+    'get_analyzer_specs',
+    'EvaluationResult',
+    'run_analyzers',
+    'evaluate_text'
+]
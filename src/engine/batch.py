@@ -0,0 +1,392 @@
+"""
+Batch Evaluation Module
+Grades whole cohorts from a directory glob, CSV or JSONL file on a pool of warm worker processes
+"""
+
+import csv
+import glob
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from src import config
+from src.engine.pipeline import evaluate_text
+from src.engine.serialize import result_to_dict
+from src.store.dedup import flag_near_duplicates
+from src.store.features import extract_features, is_new_submission, record_evaluation
+from src.store.percentiles import CohortSketches, get_percentile_index, metric_values, rank_evaluation
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry
+
+def _read_csv(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row_number, row in enumerate(csv.DictReader(f), 1):
+            yield row_number, row
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        row_number = 0
+        for line in f:
+            line = line.strip()
+            if line:
+                row_number += 1
+                yield row_number, json.loads(line)
+
+def normalize_record(row, fallback_id):
+    """
+    Map an input row onto the fields the evaluator understands.
+
+    Recognised keys: id / student_id, text, audio_duration (minutes), student_name, cohort.
+    A row with an unusable audio_duration gets an 'error' field instead of stopping the run;
+    it is written as an error line for that record without being evaluated.
+    """
+    record_id = row.get("id") or row.get("student_id") or fallback_id
+    record = {
+        "id": str(record_id),
+        "text": row.get("text") or "",
+        "audio_duration": None
+    }
+    try:
+        record["audio_duration"] = parse_duration(row.get("audio_duration"))
+    except ValueError as e:
+        record["error"] = f"Invalid input: {e}"
+    for key in ("student_name", "cohort"):
+        if row.get(key):
+            record[key] = row[key]
+    return record
+
+def parse_duration(value):
+    """
+    Audio duration in minutes from an input field, or None when it is empty.
+
+    Raises:
+        ValueError: If the value is not a finite, non-negative number
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        duration = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"audio_duration must be a number of minutes, got {value!r}")
+    if not math.isfinite(duration) or duration < 0:
+        raise ValueError(f"audio_duration must be a non-negative number of minutes, got {value!r}")
+    return duration
+
+def iter_records(source):
+    """
+    Yield input records from a CSV file, a JSONL file, a directory or a glob of text files.
+
+    Text files use their file name (without extension) as the record id.
+    """
+    lower = source.lower()
+    if lower.endswith(".csv"):
+        for row_number, row in _read_csv(source):
+            yield normalize_record(row, f"row-{row_number}")
+        return
+    if lower.endswith((".jsonl", ".ndjson")):
+        for row_number, row in _read_jsonl(source):
+            yield normalize_record(row, f"row-{row_number}")
+        return
+
+    pattern = os.path.join(source, "*.txt") if os.path.isdir(source) else source
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        record_id = os.path.splitext(os.path.basename(path))[0]
+        yield {"id": record_id, "text": text, "audio_duration": None}
+
+def load_checkpoint(path):
+    """Return the set of record ids already written by a previous run"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def compact_output(path):
+    """
+    Drop the lines a resumed run will write again from an earlier run's output: error lines
+    (those records are retried), repeated ids and a line cut off mid-write. The file is only
+    rewritten when something is dropped.
+
+    Returns:
+        Set of record ids that already have a successful line
+    """
+    if not os.path.exists(path):
+        return set()
+    done, dropped = set(), 0
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            try:
+                line = json.loads(raw)
+            except ValueError:
+                dropped += 1
+                continue
+            if "error" in line or line.get("id") in done:
+                dropped += 1
+            else:
+                done.add(line.get("id"))
+    if dropped:
+        kept = set()
+        with open(path, "r", encoding="utf-8") as f, open(path + ".tmp", "w", encoding="utf-8") as out:
+            for raw in f:
+                try:
+                    line = json.loads(raw)
+                except ValueError:
+                    continue
+                if "error" not in line and line.get("id") not in kept:
+                    kept.add(line.get("id"))
+                    out.write(raw if raw.endswith("\n") else raw + "\n")
+        os.replace(path + ".tmp", path)
+    return done
+
+def warm_up():
+    """
+    Start the expensive shared resources (LanguageTool JVM, VADER lexicon) once per worker,
+    so the first record each worker grades is not slower than the rest.
+    """
+    from src.analyzers.grammar import get_language_tool
+    from src.analyzers.sentiment import get_vader
+
+    # Workers report timings and spans inside each output line; only the parent process writes
+    # metrics and trace files
+    get_telemetry().export = False
+    tracing.get_exporter().enabled = False
+    get_language_tool()
+    get_vader()
+
+def evaluate_record(record, tier="full", profile=None, trace_context=None):
+    """
+    Evaluate one input record and return the JSON-ready output line.
+
+    When trace_context (a tracing.SpanContext from the parent process) is given, the
+    record's spans continue that trace and are returned under 'spans' instead of being
+    written here; the parent pops them off with export_output_spans().
+    """
+    if trace_context is None:
+        return _evaluate_record(record, tier, profile)
+    with tracing.attach(trace_context), tracing.collect_spans() as spans:
+        output = _evaluate_record(record, tier, profile)
+    output["spans"] = spans
+    return output
+
+def _evaluate_record(record, tier, profile):
+    start = time.perf_counter()
+    output = {"id": record["id"]}
+    for key in ("student_name", "cohort"):
+        if key in record:
+            output[key] = record[key]
+    with tracing.span("evaluate_record", **{"record.id": record["id"]}) as span:
+        if "error" in record:
+            # Rejected while reading the input, so there is nothing to evaluate
+            output["error"] = record["error"]
+            span.record_error(ValueError(record["error"]))
+        else:
+            try:
+                result = evaluate_text(record["text"], audio_duration=record.get("audio_duration"), tier=tier,
+                                       profile=profile, request_id=record["id"])
+                output["total_score"] = result.total_score
+                output["results"] = result_to_dict(result)
+                output["features"] = extract_features(record["text"], result, record.get("audio_duration"))
+                output["telemetry"] = result.telemetry
+            except Exception as e:
+                output["error"] = f"{type(e).__name__}: {e}"
+                span.record_error(e)
+    output["elapsed"] = time.perf_counter() - start
+    return output
+
+def store_output_features(line, source, rank=True):
+    """
+    Record a worker's output line in this process's feature store and set its 'percentiles'
+    and 'near_duplicates'.
+
+    With rank=False the line is ranked but not added to the cohort sketches, for callers
+    that merge the worker's own sketches instead.
+
+    Returns:
+        True when the line added a new submission; a resubmitted id replaces its stored row
+        and is not added to the sketches again
+    """
+    if "features" not in line:
+        return False
+    # The signature is only needed here, so it is not written to the output
+    signature = line["features"].pop("minhash", None)
+    new = is_new_submission(line["id"])
+    feature_id = record_evaluation(None, line["results"], features=line["features"], rank=False,
+                                   submission_id=line["id"], student_name=line.get("student_name"),
+                                   cohort=line.get("cohort"), source=source)
+    line["percentiles"] = rank_evaluation(line["results"], line.get("cohort"), add=rank and new)
+    line["near_duplicates"] = flag_near_duplicates(feature_id, signature, student_name=line.get("student_name"))
+    # Indexed by record_evaluation; too large to repeat in the output
+    line["features"].pop("tokens", None)
+    return new
+
+def export_output_spans(line):
+    """Write the spans a worker process sent back with an output line, and drop them from the line"""
+    tracing.export_spans(line.pop("spans", None) or [])
+
+def record_output_telemetry(line):
+    """Fold the stage timings a worker process reported for one output line into this process's metrics"""
+    telemetry = get_telemetry()
+    summary = line.get("telemetry")
+    if not summary:
+        if "error" in line:
+            telemetry.increment("stage_errors_total", stage="evaluate")
+        return
+    telemetry.observe("evaluate", summary["elapsed"])
+    telemetry.record_cache("result", summary["cache_hit"])
+    for stage, seconds in summary["stages"].items():
+        telemetry.observe(f"analyzer.{stage}", seconds)
+    if summary.get("coalesced"):
+        telemetry.increment("coalesced_total")
+
+def evaluate_chunk(records, tier="full", profile=None, trace_context=None):
+    """
+    Evaluate a chunk of records in a worker.
+
+    Returns:
+        dict with the output 'lines' and the chunk's cohort score 'sketches'
+        (CohortSketches.to_list form), which the parent merges into the stored ones
+    """
+    lines = [evaluate_record(record, tier=tier, profile=profile, trace_context=trace_context)
+             for record in records]
+    sketches = CohortSketches()
+    for line in lines:
+        if "results" in line:
+            sketches.add(metric_values(line["results"]), line.get("cohort"))
+    return {"lines": lines, "sketches": sketches.to_list()}
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_batch(source, output_path, workers=None, chunk_size=None, resume=True, log=print,
+              tier="full", profile=None, export_path=None):
+    """
+    Evaluate every record in source and append one JSON line per record to output_path.
+
+    Finished ids are appended to '<output_path>.checkpoint' as each chunk lands, so an
+    interrupted run picks up where it stopped when resume is True. Failed records are
+    written with an 'error' field but not checkpointed, so a resumed run retries them;
+    it first drops those error lines from the output, leaving one line per record.
+
+    Args:
+        source: CSV, JSONL, directory or glob of .txt files
+        output_path: JSONL file results are appended to
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Records sent to a worker per task (defaults to config.BATCH_CHUNK_SIZE)
+        resume: Skip ids recorded in the checkpoint file
+        log: Callable used for progress messages
+        tier: Evaluation tier passed to evaluate_text ("fast" skips LanguageTool)
+        profile: Profile mode passed to evaluate_text; one profile file per record id
+        export_path: Parquet or Arrow IPC file that the features and scores of this run's
+            records are streamed to, one row group per few thousand records
+
+    Returns:
+        Dictionary with processed, skipped and failed counts, elapsed seconds and throughput
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or config.BATCH_CHUNK_SIZE
+    checkpoint_path = output_path + ".checkpoint"
+    if not resume:
+        for path in (output_path, checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+    # An id written successfully but not yet checkpointed when the run stopped counts as done too
+    done_ids = load_checkpoint(checkpoint_path) | compact_output(output_path)
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    stats = {"processed": 0, "skipped": 0, "failed": 0}
+
+    def pending_records():
+        for record in iter_records(source):
+            if record["id"] in done_ids:
+                stats["skipped"] += 1
+                continue
+            yield record
+
+    start = time.perf_counter()
+    max_in_flight = workers * 2
+    telemetry = get_telemetry()
+    exporter = None
+    if export_path:
+        from src.store.export import ColumnarWriter, output_line_row
+        exporter = ColumnarWriter(export_path)
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as executor:
+
+        def collect(futures):
+            for future in futures:
+                chunk_span = chunk_spans.pop(future)
+                lines = future.result()["lines"]
+                added = []
+                for line in lines:
+                    export_output_spans(line)
+                    record_output_telemetry(line)
+                    # Ranked against the sketches as of the previous chunk; the worker's sketches follow
+                    if store_output_features(line, "batch", rank=False):
+                        added.append(line)
+                    if exporter is not None:
+                        row = output_line_row(line, "batch")
+                        if row is not None:
+                            exporter.write(row)
+                    out.write(json.dumps(line, ensure_ascii=False) + "\n")
+                    if "error" in line:
+                        stats["failed"] += 1
+                    stats["processed"] += 1
+                out.flush()
+                if config.FEATURE_STORE_ENABLED:
+                    sketches = CohortSketches.from_list(future.result()["sketches"])
+                    if len(added) < sum("results" in line for line in lines):
+                        # Resubmitted ids are in the sketches already, so only the new submissions go in
+                        sketches = CohortSketches()
+                        for line in added:
+                            sketches.add(metric_values(line["results"]), line.get("cohort"))
+                    get_percentile_index().merge(sketches)
+                # Only checkpoint once the results are safely on disk
+                for line in lines:
+                    if "error" not in line:
+                        checkpoint.write(line["id"] + "\n")
+                checkpoint.flush()
+                chunk_span.end()
+
+        # One trace per chunk: its root span covers queueing as well as the worker's records
+        chunk_spans = {}
+        in_flight = set()
+        for chunk in _chunks(pending_records(), chunk_size):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+                log(f"  {stats['processed']} evaluated...")
+            chunk_span = tracing.start_span("batch.chunk", records=len(chunk))
+            future = executor.submit(evaluate_chunk, chunk, tier, profile, chunk_span.context)
+            chunk_spans[future] = chunk_span
+            in_flight.add(future)
+            telemetry.set_gauge("queue_depth", len(in_flight), queue="batch")
+            telemetry.flush()
+        collect(wait(in_flight).done)
+        telemetry.set_gauge("queue_depth", 0, queue="batch")
+        if exporter is not None:
+            exporter.close()
+
+    if exporter is not None:
+        stats["exported"] = exporter.rows_written
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed"] = elapsed
+    stats["per_second"] = stats["processed"] / elapsed if elapsed > 0 else 0.0
+    stats["per_hour"] = stats["per_second"] * 3600
+    telemetry.flush(force=True)
+    return stats
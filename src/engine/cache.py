@@ -0,0 +1,161 @@
+"""
+Result Cache Module
+Two-tier cache (in-memory LRU + SQLite on disk) for complete evaluation results
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src import config
+from src.engine.serialize import dumps_result, loads_result
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry
+from src.utils.text_utils import clean_text
+
+def rubric_fingerprint():
+    """
+    Hash of everything in src/config.py that affects scoring.
+    Editing keyword lists or bumping RUBRIC_VERSION changes it, which invalidates cached results.
+    """
+    rubric = {
+        "version": config.RUBRIC_VERSION,
+        "keywords": config.KEYWORDS,
+        "fillers": config.FILLER_WORDS,
+        "salutations": config.SALUTATIONS,
+        "closings": config.CLOSINGS,
+        "categories": config.SCORE_CATEGORIES,
+        "bands": config.RUBRIC_BANDS,
+        "keyword_points": config.KEYWORD_POINTS,
+        "salutation_points": config.SALUTATION_POINTS,
+        "flow_points": config.FLOW_POINTS
+    }
+    payload = json.dumps(rubric, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def duration_bucket(audio_duration):
+    """Audio duration (minutes) rounded to whole seconds, or 'none' for text-only input"""
+    if not audio_duration:
+        return "none"
+    return str(int(round(audio_duration * 60)))
+
+def make_cache_key(text, audio_duration, specs, rubric=None):
+    """
+    Build the cache key for one evaluation.
+
+    Args:
+        text: Raw input text (whitespace is normalized before hashing)
+        audio_duration: Audio length in minutes, or None
+        specs: AnalyzerSpec list that will run; their names and versions are part of the key
+        rubric: Rubric fingerprint (defaults to the current one)
+    """
+    text_hash = hashlib.sha256(clean_text(text).encode("utf-8")).hexdigest()
+    analyzers = ",".join(f"{spec.name}@{spec.version}" for spec in sorted(specs, key=lambda s: s.name))
+    parts = [text_hash, duration_bucket(audio_duration), rubric or rubric_fingerprint(), analyzers]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """LRU memory tier in front of an optional SQLite disk tier"""
+
+    def __init__(self, path=None, max_entries=None):
+        """
+        Args:
+            path: SQLite file for the disk tier, or None for memory only
+            max_entries: Size of the in-memory LRU tier
+        """
+        self.max_entries = max_entries or config.CACHE_MAX_ENTRIES
+        self.rubric = rubric_fingerprint()
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        if path:
+            self._open(path)
+
+    def _open(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, rubric TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        # Entries written under another rubric can never hit again
+        self._db.execute("DELETE FROM results WHERE rubric != ?", (self.rubric,))
+        self._db.commit()
+
+    def _remember(self, key, payload):
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return a fresh copy of the cached EvaluationResult, or None"""
+        with tracing.span("cache.get", cache="result") as span:
+            with self._lock:
+                payload = self._memory.get(key)
+                tier = "memory"
+                if payload is not None:
+                    self._memory.move_to_end(key)
+                elif self._db is not None:
+                    tier = "sqlite"
+                    row = self._db.execute(
+                        "SELECT payload FROM results WHERE key = ? AND rubric = ?", (key, self.rubric)
+                    ).fetchone()
+                    if row:
+                        payload = row[0]
+                        self._remember(key, payload)
+                span.set_attribute("cache.hit", payload is not None)
+                span.set_attribute("cache.tier", tier)
+                if payload is None:
+                    self.misses += 1
+                    get_telemetry().record_cache("result", False)
+                    return None
+                self.hits += 1
+            get_telemetry().record_cache("result", True)
+
+            result = loads_result(payload)
+            result.cache_hit = True
+            return result
+
+    def put(self, key, result):
+        payload = dumps_result(result)
+        with self._lock:
+            self._remember(key, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, rubric, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (key, self.rubric, payload, time.time())
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """Process-wide cache backed by config.CACHE_PATH"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(config.CACHE_PATH)
+        return _default_cache
@@ -0,0 +1,222 @@
+"""
+Incremental Evaluation Module
+Re-evaluates edited text by re-analyzing only the sentences that changed
+"""
+
+import time
+from collections import OrderedDict
+
+from src.analyzers.content import ContentAnalyzer
+from src.analyzers.grammar import (
+    get_language_tool, check_grammar, find_fillers, filler_result, score_grammar
+)
+from src.analyzers.metrics import speech_rate_result, vocabulary_result
+from src.analyzers.sentiment import SentimentAnalyzer
+from src.config import KEYWORDS, SALUTATIONS, CLOSINGS
+from src.engine.result import EvaluationResult
+from src.engine.scheduler import get_executor
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry, memory_usage
+from src.utils.text_utils import clean_text, tokenize_text, sentence_spans
+
+# Every phrase the content analyzer looks up
+CONTENT_PHRASES = sorted(
+    {phrase for group in KEYWORDS.values() for phrases in group.values() for phrase in phrases}
+    | {phrase for phrases in SALUTATIONS.values() for phrase in phrases}
+    | set(CLOSINGS)
+)
+
+class SentencePartial:
+    """Everything the document-level scores need from one sentence"""
+
+    __slots__ = ('text', 'words', 'phrases', 'fillers', 'grammar')
+
+    def __init__(self, text):
+        self.text = text
+        self.words = tokenize_text(text)
+        lower = text.lower()
+        self.phrases = {}
+        for phrase in CONTENT_PHRASES:
+            idx = lower.find(phrase)
+            if idx != -1:
+                self.phrases[phrase] = idx
+        self.fillers = find_fillers(text, self.words)
+        # LanguageTool issues with sentence-relative offsets; None until checked
+        self.grammar = None
+
+class PartialContentAnalyzer(ContentAnalyzer):
+    """ContentAnalyzer that answers phrase lookups from per-sentence partials"""
+
+    def __init__(self, spans):
+        # spans: list of (offset in cleaned text, SentencePartial)
+        self.spans = spans
+
+    def find(self, phrase):
+        for offset, partial in self.spans:
+            idx = partial.phrases.get(phrase)
+            if idx is not None:
+                return offset + idx
+        return -1
+
+class IncrementalEvaluator:
+    """
+    Keeps per-sentence partial results between evaluations of the same (edited) text.
+
+    Only sentences that were not seen before are sent to LanguageTool and the sentence
+    encoder (semantic_relevance); keyword, flow, filler, vocabulary and speech rate results
+    are then recombined from the cached partials. Sentiment is scored on the whole text, as
+    VADER's negation and "but" rules reach across sentences and it is cheap to rerun.
+    Phrases or grammar errors spanning a sentence boundary are not detected, which the full
+    pipeline would catch.
+    """
+
+    def __init__(self, grammar=True, max_sentences=2048):
+        """
+        Args:
+            grammar: Check changed sentences with LanguageTool
+            max_sentences: Number of sentence partials kept (least recently used are dropped)
+        """
+        self.grammar = grammar
+        self.max_sentences = max_sentences
+        self._partials = OrderedDict()
+        self._embeddings = OrderedDict()
+        self.last_stats = {}
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_sentences:
+            cache.popitem(last=False)
+
+    def _partial(self, sentence, changed):
+        partial = self._partials.get(sentence)
+        if partial is None:
+            partial = SentencePartial(sentence)
+            changed.append(partial)
+        self._remember(self._partials, sentence, partial)
+        return partial
+
+    def split(self, text):
+        """
+        Split text into sentence partials, creating partials only for unseen sentences.
+
+        Returns:
+            tuple: (cleaned text, list of (offset, SentencePartial), list of new partials)
+        """
+        cleaned = clean_text(text)
+        changed = []
+        spans = [(offset, self._partial(sentence, changed)) for offset, sentence in sentence_spans(cleaned)]
+        return cleaned, spans, changed
+
+    def _check_grammar(self, partials):
+        tool = get_language_tool()
+        if tool is None:
+            return False
+        unchecked = list(dict.fromkeys(p for p in partials if p.grammar is None))
+        futures = [(p, tracing.submit_in_context(get_executor(), check_grammar, tool, p.text))
+                   for p in unchecked]
+        for partial, future in futures:
+            partial.grammar = future.result()
+        return True
+
+    def _grammar_result(self, spans, word_count):
+        matches = []
+        for offset, partial in spans:
+            matches.extend(issue._replace(offset=issue.offset + offset) for issue in partial.grammar)
+        if word_count == 0:
+            return {"count": len(matches), "matches": matches, "score": 0}
+        g_index, score = score_grammar(len(matches), word_count)
+        return {"count": len(matches), "matches": matches, "score": score, "g_index": g_index}
+
+    def semantic_relevance(self, text):
+        """
+        Sentence relevance like SemanticAnalyzer.analyze_relevance, encoding only new sentences.
+
+        Returns:
+            dict with 'sentences' (analyze_relevance results), 'overall_score' and the
+            mean-pooled document 'embedding'
+        """
+        from src.analyzers.semantic import (
+            load_semantic_model, split_into_sentences, get_topic_embeddings, relevance_results, document_embedding
+        )
+
+        sentences = split_into_sentences(text)
+        if not sentences:
+            return {"sentences": [], "overall_score": 0.0, "embedding": None}
+        model = load_semantic_model()
+        unique = list(dict.fromkeys(sentences))
+        new = [s for s in unique if s not in self._embeddings]
+        self.last_stats["encoded"] = len(new)
+        telemetry = get_telemetry()
+        telemetry.increment("cache_requests_total", len(unique) - len(new), cache="embedding", outcome="hit")
+        telemetry.increment("cache_requests_total", len(new), cache="embedding", outcome="miss")
+        if new:
+            with telemetry.timer("encode.sentences"):
+                embeddings = model.encode(new, convert_to_tensor=True)
+            for sentence, embedding in zip(new, embeddings):
+                self._remember(self._embeddings, sentence, embedding)
+        embeddings = [self._embeddings[s] for s in sentences]
+        results = relevance_results(sentences, embeddings, get_topic_embeddings(model))
+        overall = sum(r['score'] for r in results) / len(results)
+        return {"sentences": results, "overall_score": overall, "embedding": document_embedding(embeddings)}
+
+    def update(self, text, audio_duration=None):
+        """
+        Evaluate text, reusing partials of sentences already seen.
+
+        Returns:
+            EvaluationResult with the same entries as evaluate_text
+        """
+        with tracing.span("incremental.update") as span:
+            result = self._update(text, audio_duration)
+            span.set_attribute("sentences", result.telemetry["sentences"])
+            span.set_attribute("recomputed", result.telemetry["recomputed"])
+            if span.context is not None:
+                result.telemetry["trace_id"] = span.context.trace_id
+        return result
+
+    def _update(self, text, audio_duration):
+        start = time.perf_counter()
+        cleaned, spans, changed = self.split(text)
+        partials = [partial for _, partial in spans]
+
+        words = [word for partial in partials for word in partial.words]
+        fillers = [filler for partial in partials for filler in partial.fillers]
+
+        content = PartialContentAnalyzer(spans)
+        outputs = {
+            "keywords": content.check_keywords(),
+            "flow": content.check_flow(),
+            "salutation": content.check_salutation(),
+            "filler": filler_result(len(fillers), len(words), fillers),
+            "sentiment": SentimentAnalyzer(cleaned).analyze_sentiment(),
+            "speech_rate": speech_rate_result(len(words), audio_duration if audio_duration else 1.0),
+            "vocabulary": vocabulary_result(len(set(words)), len(words))
+        }
+
+        grammar_checked = 0
+        if self.grammar:
+            grammar_checked = len({id(p) for p in partials if p.grammar is None})
+            if self._check_grammar(partials):
+                outputs["grammar"] = self._grammar_result(spans, len(words))
+            else:
+                outputs["grammar"] = {"count": 0, "matches": [], "score": 0, "available": False}
+                grammar_checked = 0
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "sentences": len(spans),
+            "recomputed": len(changed),
+            "reused": len(spans) - len(changed),
+            "grammar_checked": grammar_checked,
+            "elapsed": elapsed
+        }
+        telemetry = get_telemetry()
+        telemetry.observe("incremental.update", elapsed)
+        telemetry.increment("cache_requests_total", len(spans) - len(changed), cache="sentence", outcome="hit")
+        telemetry.increment("cache_requests_total", len(changed), cache="sentence", outcome="miss")
+        telemetry.flush()
+
+        result = EvaluationResult(outputs, timings={"incremental": elapsed})
+        result.telemetry = dict(self.last_stats, memory=memory_usage())
+        return result
@@ -0,0 +1,153 @@
+"""
+Evaluation Pipeline Module
+Single entry point used by the Streamlit app and the command line
+"""
+
+import threading
+import time
+
+from src import config
+from src.engine.cache import get_default_cache, make_cache_key
+from src.engine.registry import get_analyzer_specs
+from src.engine.result import EvaluationResult, not_computed
+from src.engine.scheduler import run_analyzers
+from src.engine.singleflight import SingleFlight
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry, memory_usage
+
+_in_flight = SingleFlight()
+
+def _cache_when_finished(result_cache, key, outputs, pending):
+    """Cache the full result once every background analyzer of a deadline run has finished"""
+    remaining = {future for future, _ in pending.values()}
+    lock = threading.Lock()
+
+    def on_done(future):
+        with lock:
+            remaining.discard(future)
+            if remaining:
+                return
+        full = dict(outputs)
+        for future, _ in pending.values():
+            if future.cancelled() or future.exception() is not None:
+                return
+            full.update(future.result()[0])
+        result = EvaluationResult(full)
+        if result.complete:
+            result_cache.put(key, result)
+
+    for future, _ in pending.values():
+        future.add_done_callback(on_done)
+
+def _evaluate(text, audio_duration, specs, result_cache, key, budgets=None, executor=None):
+    if result_cache is not None:
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+
+    outputs, timings, unfinished = run_analyzers(
+        specs, {'text': text, 'audio_duration': audio_duration}, executor=executor, budgets=budgets
+    )
+    result = EvaluationResult(outputs, timings=timings)
+
+    specs_by_name = {spec.name: spec for spec in specs}
+    for name, future in unfinished.items():
+        spec_outputs = specs_by_name[name].outputs
+        for output in spec_outputs:
+            result[output] = not_computed("deadline" if future is not None else "dependency")
+        if future is not None:
+            result.pending[name] = (future, spec_outputs)
+
+    if result_cache is not None:
+        if result.pending:
+            # Analyzers skipped for a late dependency never catch up, so such runs stay uncached
+            if len(result.pending) == len(unfinished):
+                _cache_when_finished(result_cache, key, outputs, dict(result.pending))
+        # Never cache a degraded result, the next attempt may have LanguageTool back
+        elif result.complete:
+            result_cache.put(key, result)
+    return result
+
+def run_summary(result, elapsed, coalesced=False):
+    """JSON summary of one evaluation, attached to the result as result.telemetry"""
+    return {
+        "elapsed": elapsed,
+        "stages": dict(result.timings),
+        "cache_hit": result.cache_hit,
+        "coalesced": coalesced,
+        "pending": sorted(result.pending),
+        "memory": memory_usage()
+    }
+
+def _evaluate_profiled(text, audio_duration, specs, mode, request_id):
+    from src.engine.profiling import InlineExecutor, new_request_id, profiled
+
+    # No cache lookup and no thread pool: the profile should show this request's analyzers
+    with profiled(request_id or new_request_id(), mode) as session:
+        result = _evaluate(text, audio_duration, specs, None, None, executor=InlineExecutor())
+    return result, session
+
+def evaluate_text(text, audio_duration=None, analyzers=None, cache=True, coalesce=True,
+                  tier="full", deadline=None, profile=None, request_id=None):
+    """Evaluate the input text and return results
+
+    Args:
+        text (str): The text to evaluate
+        audio_duration (float, optional): Duration of audio in minutes for accurate WPM calculation
+        analyzers (list, optional): Analyzer names to run; defaults to every default analyzer
+        cache: True for the shared result cache, a ResultCache instance, or False to always recompute
+        coalesce: Share one computation between concurrent calls with identical content
+        tier: "full" runs every analyzer; "fast" only keywords, flow, salutation, fillers,
+            metrics and sentiment (no LanguageTool or models)
+        deadline: Time budget in seconds per analyzer (one number, or a dict of analyzer
+            name -> seconds). Outputs of analyzers that overrun are returned as
+            not_computed() placeholders while the analyzer finishes in the background;
+            call result.wait() to merge them in.
+        profile: "cprofile" or "sample" to profile this evaluation (defaults to the
+            AIE_PROFILE environment variable). Profiled runs skip the cache and run every
+            analyzer in the calling thread; result.telemetry['profile'] names the output file.
+        request_id: Name for the profile output file (a random id by default)
+
+    Returns:
+        EvaluationResult keyed by result name ('keywords', 'grammar', ...)
+    """
+    with tracing.span("evaluate_text", tier=tier, **{"text.characters": len(text or "")}) as span:
+        result = _evaluate_text(text, audio_duration, analyzers, cache, coalesce, tier, deadline,
+                                profile, request_id)
+        span.set_attribute("cache.hit", result.cache_hit)
+        span.set_attribute("coalesced", result.telemetry["coalesced"])
+        if span.context is not None:
+            result.telemetry["trace_id"] = span.context.trace_id
+    return result
+
+def _evaluate_text(text, audio_duration, analyzers, cache, coalesce, tier, deadline, profile, request_id):
+    start = time.perf_counter()
+    telemetry = get_telemetry()
+    specs = get_analyzer_specs(analyzers, tier=tier)
+
+    profile = profile or config.PROFILE_MODE
+    if profile:
+        result, session = _evaluate_profiled(text, audio_duration, specs, profile, request_id)
+        elapsed = time.perf_counter() - start
+        telemetry.observe("evaluate.profiled", elapsed)
+        result.telemetry = run_summary(result, elapsed)
+        result.telemetry["profile"] = session["path"]
+        return result
+
+    result_cache = get_default_cache() if cache is True else (cache or None)
+    key = make_cache_key(text, audio_duration, specs)
+
+    # Partial results hold live futures and belong to their caller, so they are not shared
+    if not coalesce or deadline is not None:
+        result = _evaluate(text, audio_duration, specs, result_cache, key, budgets=deadline)
+        shared = False
+    else:
+        result, shared = _in_flight.do(key, _evaluate, text, audio_duration, specs, result_cache, key)
+        if shared:
+            telemetry.increment("coalesced_total")
+
+    elapsed = time.perf_counter() - start
+    telemetry.observe("evaluate", elapsed)
+    result.telemetry = run_summary(result, elapsed, coalesced=shared)
+    telemetry.flush()
+    return result
@@ -0,0 +1,84 @@
+"""
+Live Preview Module
+Scoring preview of the editor text, built from the fast, sentence-level incremental analyzers
+"""
+
+import threading
+import time
+
+from src.analyzers.grammar import filler_result
+from src.analyzers.metrics import vocabulary_result
+from src.engine.incremental import IncrementalEvaluator, PartialContentAnalyzer
+from src.utils.telemetry import get_telemetry
+
+def build_preview(spans):
+    """
+    Preview scores from sentence partials.
+    Only phrase lookups, token counts and filler matches are used; no LanguageTool or model.
+
+    Args:
+        spans: list of (offset, SentencePartial) as returned by IncrementalEvaluator.split
+
+    Returns:
+        dict with word_count, keywords, salutation, closing, filler and vocabulary
+    """
+    words = [word for _, partial in spans for word in partial.words]
+    fillers = [filler for _, partial in spans for filler in partial.fillers]
+    content = PartialContentAnalyzer(spans)
+    keywords = content.check_keywords()
+    topics = keywords["topics"]
+    return {
+        "word_count": len(words),
+        "keywords": {
+            "found": sum(1 for found in topics.values() if found),
+            "total": len(topics),
+            "missing": [topic for topic, found in topics.items() if not found],
+            "score": keywords["score"]
+        },
+        "salutation": content.check_salutation(),
+        "closing": content.check_flow()["indices"]["Closing"] != -1,
+        "filler": filler_result(len(fillers), len(words), fillers),
+        "vocabulary": vocabulary_result(len(set(words)), len(words))
+    }
+
+class LivePreview:
+    """
+    Scoring preview of the text the editor last sent.
+
+    Streamlit's text area sends its value when it loses focus or on Ctrl+Enter, not on every
+    keystroke, so each update carries committed text. The preview is only recomputed when
+    that text changed, and then through the evaluator's sentence partials, so an edit only
+    re-analyzes the sentences it touched.
+    """
+
+    def __init__(self, evaluator=None):
+        """
+        Args:
+            evaluator: IncrementalEvaluator whose sentence partials are reused
+                (a grammar-free one is created if omitted)
+        """
+        self.evaluator = evaluator or IncrementalEvaluator(grammar=False)
+        self.preview = None
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+        self._computed = None
+
+    def update(self, text):
+        """
+        Return the preview of text, recomputing it only if the text changed since the last update.
+
+        Args:
+            text: Current contents of the editor
+
+        Returns:
+            Preview dict (see build_preview)
+        """
+        with self._lock:
+            if self.preview is None or text != self._computed:
+                start = time.perf_counter()
+                _, spans, _ = self.evaluator.split(text)
+                self.preview = build_preview(spans)
+                self._computed = text
+                self.elapsed = time.perf_counter() - start
+                get_telemetry().observe("preview", self.elapsed)
+            return self.preview
@@ -0,0 +1,121 @@
+"""
+Profiling Module
+Opt-in per-request profiling with cProfile (pstats files) or a stdlib sampling profiler (collapsed stacks)
+"""
+
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from src import config
+
+PROFILE_MODES = ("cprofile", "sample")
+
+DEFAULT_SAMPLE_INTERVAL = 0.002
+
+def new_request_id():
+    return uuid.uuid4().hex[:12]
+
+def profile_path(request_id, mode, directory=None):
+    """Output file for one profiled request: <id>.pstats for cProfile, <id>.collapsed for sampling"""
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", str(request_id))
+    extension = "pstats" if mode == "cprofile" else "collapsed"
+    return os.path.join(directory or config.PROFILE_DIR, f"{safe_id}.{extension}")
+
+class InlineExecutor:
+    """
+    Executor that runs each task immediately in the calling thread.
+    Profiling uses it so every analyzer shows up under the one thread being profiled.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at a fixed interval from a background thread.
+
+    Stacks are aggregated in the collapsed format understood by flamegraph.pl, speedscope
+    and similar tools: 'outer;inner;leaf <count>' per line.
+    """
+
+    def __init__(self, thread_id=None, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def profiled(request_id, mode, directory=None):
+    """
+    Profile the enclosed block and write the result to profile_path(request_id, mode).
+
+    Yields a dict that receives 'path' and 'elapsed' once the block finishes.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+    path = profile_path(request_id, mode, directory)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    session = {"request_id": request_id, "mode": mode, "path": None, "elapsed": None}
+
+    start = time.perf_counter()
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield session
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    else:
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            yield session
+        finally:
+            profiler.stop()
+            profiler.dump(path)
+    session["elapsed"] = time.perf_counter() - start
+    session["path"] = path
@@ -0,0 +1,128 @@
+"""
+Analyzer Registry Module
+Declares every analyzer the engine can run, with the inputs it reads and the outputs it produces
+"""
+
+from collections import OrderedDict
+
+from src.analyzers.content import ContentAnalyzer
+from src.analyzers.grammar import GrammarAnalyzer
+from src.analyzers.sentiment import SentimentAnalyzer
+from src.analyzers.metrics import MetricsAnalyzer
+
+# "fast" analyzers are pure Python and finish in milliseconds; "full" adds LanguageTool and models
+TIERS = ("fast", "full")
+
+class AnalyzerSpec:
+    """Description of one schedulable analyzer step"""
+
+    def __init__(self, name, func, inputs, outputs, default=True, version="1", tier="full"):
+        """
+        Args:
+            name: Unique analyzer name
+            func: Callable taking the declared inputs as keyword arguments and
+                returning a dict with exactly the declared outputs
+            inputs: Names of the values this analyzer reads
+            outputs: Names of the result entries this analyzer produces
+            default: Whether evaluate_text runs this analyzer when none are requested
+            version: Analyzer/model version; bump it whenever the analyzer's output changes
+                so cached results are not reused
+            tier: "fast" if the analyzer is cheap enough for previews, otherwise "full"
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.default = default
+        self.version = version
+        self.tier = tier
+
+    def run(self, values):
+        """Call the analyzer with its inputs picked from values"""
+        result = self.func(**{key: values[key] for key in self.inputs})
+        missing = set(self.outputs) - set(result)
+        if missing:
+            raise ValueError(f"Analyzer '{self.name}' did not produce: {', '.join(sorted(missing))}")
+        return result
+
+    def __repr__(self):
+        return f"AnalyzerSpec({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+ANALYZERS = OrderedDict()
+
+def register_analyzer(name, inputs, outputs, default=True, version="1", tier="full"):
+    """
+    Decorator registering a function as an analyzer step.
+    Registering an existing name replaces the previous spec.
+    """
+    def decorator(func):
+        ANALYZERS[name] = AnalyzerSpec(name, func, inputs, outputs, default=default, version=version,
+                                       tier=tier)
+        return func
+    return decorator
+
+def get_analyzer_specs(names=None, tier="full"):
+    """
+    Look up analyzer specs by name.
+
+    Args:
+        names: Iterable of analyzer names, or None for all default analyzers
+        tier: "full" for every analyzer, "fast" to keep only fast-tier analyzers
+
+    Returns:
+        list of AnalyzerSpec in registration order
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier '{tier}', expected one of: {', '.join(TIERS)}")
+    if names is None:
+        specs = [spec for spec in ANALYZERS.values() if spec.default]
+        return [spec for spec in specs if tier == "full" or spec.tier == "fast"]
+
+    unknown = [name for name in names if name not in ANALYZERS]
+    if unknown:
+        raise KeyError(f"Unknown analyzers: {', '.join(unknown)}")
+    wanted = set(names)
+    return [spec for spec in ANALYZERS.values()
+            if spec.name in wanted and (tier == "full" or spec.tier == "fast")]
+
+@register_analyzer("content", inputs=["text"], outputs=["keywords", "flow", "salutation"], tier="fast")
+def run_content(text):
+    analyzer = ContentAnalyzer(text)
+    return {
+        "keywords": analyzer.check_keywords(),
+        "flow": analyzer.check_flow(),
+        "salutation": analyzer.check_salutation()
+    }
+
+@register_analyzer("grammar", inputs=["text"], outputs=["grammar"], version="languagetool-en-US/1")
+def run_grammar(text):
+    return {"grammar": GrammarAnalyzer(text).count_grammar_errors()}
+
+@register_analyzer("filler", inputs=["text"], outputs=["filler"], tier="fast")
+def run_filler(text):
+    return {"filler": GrammarAnalyzer(text).count_filler_words()}
+
+@register_analyzer("sentiment", inputs=["text"], outputs=["sentiment"], version="vader/1", tier="fast")
+def run_sentiment(text):
+    return {"sentiment": SentimentAnalyzer(text).analyze_sentiment()}
+
+@register_analyzer("metrics", inputs=["text", "audio_duration"], outputs=["speech_rate", "vocabulary"],
+                   tier="fast")
+def run_metrics(text, audio_duration):
+    analyzer = MetricsAnalyzer(text)
+    # Use actual audio duration if available, otherwise default to 1 minute
+    return {
+        "speech_rate": analyzer.calculate_speech_rate(
+            duration_minutes=audio_duration if audio_duration else 1.0
+        ),
+        "vocabulary": analyzer.calculate_vocabulary_richness()
+    }
+
+@register_analyzer("semantic", inputs=["text"], outputs=["semantic"], default=False,
+                   version="all-MiniLM-L6-v2/1")
+def run_semantic(text):
+    from src.analyzers.semantic import SemanticAnalyzer
+
+    sentences = SemanticAnalyzer(text).analyze_relevance()
+    overall = sum(r['score'] for r in sentences) / len(sentences) if sentences else 0.0
+    return {"semantic": {"sentences": sentences, "overall_score": overall}}
@@ -0,0 +1,89 @@
+"""
+Evaluation Result Module
+Typed container for the merged output of all analyzers
+"""
+
+from concurrent.futures import wait
+
+from src.config import SCORE_CATEGORIES
+
+def not_computed(reason):
+    """Placeholder entry for an output that is missing from a partial result"""
+    return {"computed": False, "reason": reason, "score": None}
+
+def is_computed(value):
+    return not (isinstance(value, dict) and value.get("computed") is False)
+
+class EvaluationResult(dict):
+    """
+    Merged analyzer outputs.
+
+    Behaves like the plain dictionary evaluate_text always returned
+    (results['grammar']['score'] etc.), with the scoring helpers and run
+    metadata attached as attributes.
+
+    Results produced under a deadline may hold not_computed() placeholders;
+    their analyzers keep running in the background and wait() merges them in.
+    """
+
+    def __init__(self, outputs=None, timings=None):
+        super().__init__(outputs or {})
+        self.timings = dict(timings or {})
+        self.cache_hit = False
+        # analyzer name -> (Future, output names) for work still running in the background
+        self.pending = {}
+        # JSON summary of this run (elapsed, stage timings, cache use, memory), see pipeline
+        self.telemetry = {}
+        # Score category -> percentile within the cohort, set once the result is stored
+        self.percentiles = {}
+        # Earlier submissions and templates this text nearly duplicates, see src.store.dedup
+        self.near_duplicates = []
+
+    @property
+    def complete(self):
+        """False for partial results or when an analyzer fell back to a placeholder (e.g. LanguageTool unavailable)"""
+        return all(is_computed(value) and value.get('available', True)
+                   for value in self.values() if isinstance(value, dict))
+
+    @property
+    def missing(self):
+        """Names of outputs that have not been computed (yet)"""
+        return [key for key, value in self.items() if not is_computed(value)]
+
+    def wait(self, timeout=None):
+        """
+        Merge in background analyzers that finish within timeout seconds.
+
+        Returns:
+            True if nothing is left pending
+        """
+        if self.pending:
+            wait([future for future, _ in self.pending.values()], timeout=timeout)
+        for name, (future, _) in list(self.pending.items()):
+            if not future.done():
+                continue
+            _, outputs = self.pending.pop(name)
+            try:
+                result, elapsed = future.result()
+            except Exception as e:
+                for key in outputs:
+                    self[key] = not_computed(f"error: {e}")
+                continue
+            self.update(result)
+            self.timings[name] = elapsed
+        return not self.pending
+
+    @property
+    def category_scores(self):
+        """Score per rubric category, for the categories that were computed"""
+        return {key: self[key]['score'] for key in SCORE_CATEGORIES
+                if key in self and is_computed(self[key])}
+
+    @property
+    def total_score(self):
+        """Overall score out of 100"""
+        return sum(self.category_scores.values())
+
+    @property
+    def max_scores(self):
+        return dict(SCORE_CATEGORIES)
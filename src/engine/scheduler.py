@@ -0,0 +1,150 @@
+"""
+Analyzer Scheduler Module
+Runs analyzer specs concurrently on a thread pool, starting each one as soon as its inputs exist
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry
+
+DEFAULT_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Return the shared analyzer thread pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                           thread_name_prefix="analyzer")
+        return _executor
+
+def _forget_executor():
+    # A forked batch or stream worker inherits the pool object but none of its threads, so
+    # work submitted to it would never run
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+def _timed_run(spec, values):
+    start = time.perf_counter()
+    try:
+        with tracing.span(f"analyzer.{spec.name}", **{"analyzer.version": spec.version}):
+            result = spec.run(values)
+    except Exception:
+        get_telemetry().observe(f"analyzer.{spec.name}", time.perf_counter() - start, error=True)
+        raise
+    elapsed = time.perf_counter() - start
+    get_telemetry().observe(f"analyzer.{spec.name}", elapsed)
+    return result, elapsed
+
+def check_dependencies(specs, available):
+    """
+    Verify every input of every spec is either available up front or produced by another spec.
+
+    Raises:
+        ValueError: If an input can never be satisfied
+    """
+    produced = set(available)
+    for spec in specs:
+        produced.update(spec.outputs)
+    for spec in specs:
+        missing = [key for key in spec.inputs if key not in produced]
+        if missing:
+            raise ValueError(f"Analyzer '{spec.name}' needs unavailable inputs: {', '.join(missing)}")
+
+def _budget_for(spec, budgets):
+    if budgets is None:
+        return None
+    if isinstance(budgets, dict):
+        return budgets.get(spec.name)
+    return budgets
+
+def run_analyzers(specs, inputs, executor=None, budgets=None):
+    """
+    Run analyzers in dependency order, overlapping independent ones.
+
+    Args:
+        specs: List of AnalyzerSpec to run
+        inputs: Dictionary of initial values (e.g. text, audio_duration)
+        executor: Executor to submit to (defaults to the shared thread pool)
+        budgets: Optional time budget in seconds, either one value for every analyzer or a
+            dict of analyzer name -> seconds. An analyzer still running when its budget
+            (counted from when it started) runs out is left to finish in the background.
+
+    Returns:
+        tuple: (outputs dict merged from all finished analyzers,
+                per-analyzer wall time in seconds,
+                unfinished analyzers as name -> Future, or name -> None when the
+                analyzer never started because an input it needs was late)
+    """
+    check_dependencies(specs, inputs)
+    executor = executor or get_executor()
+
+    values = dict(inputs)
+    outputs = {}
+    timings = {}
+    unfinished = {}
+    pending = list(specs)
+    running = {}
+    deadlines = {}
+
+    try:
+        while pending or running:
+            ready = [spec for spec in pending if all(key in values for key in spec.inputs)]
+            for spec in ready:
+                pending.remove(spec)
+                future = tracing.submit_in_context(executor, _timed_run, spec, dict(values))
+                running[future] = spec
+                budget = _budget_for(spec, budgets)
+                if budget is not None:
+                    deadlines[future] = time.perf_counter() + budget
+
+            if not running:
+                names = ', '.join(spec.name for spec in pending)
+                raise ValueError(f"Circular analyzer dependencies between: {names}")
+
+            timeout = None
+            if deadlines:
+                timeout = max(0.0, min(deadlines.values()) - time.perf_counter())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec = running.pop(future)
+                deadlines.pop(future, None)
+                result, elapsed = future.result()
+                values.update(result)
+                outputs.update(result)
+                timings[spec.name] = elapsed
+
+            now = time.perf_counter()
+            late = [future for future, deadline in deadlines.items() if deadline <= now]
+            for future in late:
+                del deadlines[future]
+                unfinished[running.pop(future).name] = future
+
+            if late:
+                # Anything downstream of a late analyzer cannot start in time either
+                blocked = {key for spec in specs if spec.name in unfinished for key in spec.outputs}
+                changed = True
+                while changed:
+                    changed = False
+                    for spec in list(pending):
+                        if blocked.intersection(spec.inputs):
+                            pending.remove(spec)
+                            unfinished[spec.name] = None
+                            blocked.update(spec.outputs)
+                            changed = True
+    finally:
+        for future in running:
+            future.cancel()
+
+    return outputs, timings, unfinished
@@ -0,0 +1,43 @@
+"""
+Result Serialization Module
+Converts EvaluationResult objects to and from JSON-friendly dictionaries
+"""
+
+import json
+
+from src.analyzers.grammar import GrammarIssue
+from src.engine.result import EvaluationResult
+
+def result_to_dict(result):
+    """
+    Convert an evaluation result into plain JSON-serializable data.
+
+    Args:
+        result: EvaluationResult (or the legacy results dict)
+
+    Returns:
+        dict with the same keys, grammar issues expanded into dicts
+    """
+    data = dict(result)
+    if 'grammar' in data:
+        grammar = dict(data['grammar'])
+        grammar['matches'] = [GrammarIssue(*m)._asdict() if isinstance(m, tuple) else m
+                              for m in grammar.get('matches', [])]
+        data['grammar'] = grammar
+    return data
+
+def result_from_dict(data, timings=None):
+    """Rebuild an EvaluationResult from result_to_dict output"""
+    outputs = dict(data)
+    if 'grammar' in outputs:
+        grammar = dict(outputs['grammar'])
+        grammar['matches'] = [GrammarIssue(**m) for m in grammar.get('matches', [])]
+        outputs['grammar'] = grammar
+    return EvaluationResult(outputs, timings=timings)
+
+def dumps_result(result):
+    """Serialize an evaluation result to a compact JSON string"""
+    return json.dumps(result_to_dict(result), separators=(',', ':'), ensure_ascii=False)
+
+def loads_result(payload):
+    return result_from_dict(json.loads(payload))
@@ -0,0 +1,57 @@
+"""
+Request Coalescing Module
+Lets concurrent callers with the same key share one in-flight computation
+"""
+
+import copy
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Duplicate-call suppression.
+
+    The first caller for a key runs the function; callers arriving with the same key
+    while it is running wait for it and receive a copy of its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) unless an identical call is already in flight.
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result came from another caller
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # Each waiter gets its own copy so callers can't mutate each other's results
+            return copy.deepcopy(future.result()), True
+
+        try:
+            value = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
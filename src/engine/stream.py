@@ -0,0 +1,118 @@
+"""
+Streaming Evaluation Module
+Unix-pipe mode: one JSON record per line in, one result per line out, with a bounded in-flight window
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from src.engine.batch import (
+    evaluate_record, export_output_spans, normalize_record, record_output_telemetry, store_output_features,
+    warm_up
+)
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry
+
+def _stream_worker_init():
+    # stdout carries the results; anything the analyzers print goes to stderr instead
+    sys.stdout = sys.stderr
+    warm_up()
+
+def _parse_line(line, line_number):
+    try:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("expected a JSON object")
+        record = normalize_record(row, f"line-{line_number}")
+    except ValueError as e:
+        return None, {"id": f"line-{line_number}", "error": f"Invalid input: {e}"}
+    if "error" in record:
+        # A field normalize_record rejected, e.g. a non-numeric audio_duration
+        return None, {"id": record["id"], "error": record["error"]}
+    return record, None
+
+def run_stream(infile, outfile, workers=None, window=None, ordered=True, tier="full", profile=None):
+    """
+    Evaluate JSON records read from infile and write one JSON result per line to outfile.
+
+    At most `window` records are in flight at once. Input is only read when a slot
+    frees up, so a slow consumer on outfile stalls reading instead of growing memory.
+
+    Args:
+        infile: File object yielding one JSON object per line
+        outfile: File object results are written to
+        workers: Number of worker processes (defaults to the CPU count)
+        window: Maximum records in flight (defaults to 4 per worker)
+        ordered: Emit results in input order; otherwise emit them as they complete
+        tier: Evaluation tier passed to evaluate_text ("fast" skips LanguageTool)
+        profile: Profile mode passed to evaluate_text; one profile file per record id
+
+    Returns:
+        Number of records written
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    written = 0
+    telemetry = get_telemetry()
+
+    # One trace per record, from submission to the result being written
+    record_spans = {}
+
+    def emit(line):
+        nonlocal written
+        export_output_spans(line)
+        record_output_telemetry(line)
+        store_output_features(line, "stream")
+        outfile.write(json.dumps(line, ensure_ascii=False) + "\n")
+        outfile.flush()
+        written += 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_stream_worker_init) as executor:
+        in_flight = deque() if ordered else set()
+
+        def finish(future):
+            emit(future.result())
+            record_spans.pop(future).end()
+
+        def drain(block_until_below):
+            nonlocal in_flight
+            while len(in_flight) > block_until_below:
+                if ordered:
+                    finish(in_flight.popleft())
+                else:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+
+        line_number = 0
+        for line in infile:
+            line = line.strip()
+            if not line:
+                continue
+            line_number += 1
+            record, error = _parse_line(line, line_number)
+            if error:
+                # Keep ordering guarantees for bad lines too
+                drain(0 if ordered else len(in_flight))
+                emit(error)
+                continue
+
+            drain(window - 1)
+            record_span = tracing.start_span("stream.record", **{"record.id": record["id"]})
+            future = executor.submit(evaluate_record, record, tier, profile, record_span.context)
+            record_spans[future] = record_span
+            if ordered:
+                in_flight.append(future)
+            else:
+                in_flight.add(future)
+            telemetry.set_gauge("queue_depth", len(in_flight), queue="stream")
+            telemetry.flush()
+
+        drain(0)
+        telemetry.set_gauge("queue_depth", 0, queue="stream")
+        telemetry.flush(force=True)
+
+    return written
@@ -1,20 +1,22 @@
+import argparse
 import os
 import sys
+import time
 
 # Add the src directory to the python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.analyzers.content import ContentAnalyzer
-from src.analyzers.grammar import GrammarAnalyzer
-from src.analyzers.sentiment import SentimentAnalyzer
-from src.analyzers.metrics import MetricsAnalyzer
+from src import config
+from src.engine import evaluate_text
+from src.store import record_evaluation
+from src.store.percentiles import ordinal
+from src.utils import tracing
+from src.utils.telemetry import get_telemetry
+from src.utils.text_utils import tokenize_text
 
-def main():
+def evaluate_file(input_path, output_path, profile=None):
     print("AI Intro Evaluator - Starting Analysis...")
     
-    input_path = os.path.join("data", "input", "sample.txt")
-    output_path = os.path.join("data", "output", "evaluation_report.txt")
-    
     if not os.path.exists(input_path):
         print(f"Error: Input file not found at {input_path}")
         return
@@ -25,35 +27,29 @@ def main():
     print(f"Analyzing text from: {input_path}")
     print("-" * 50)
 
-    # 1. Content Analysis
-    content_analyzer = ContentAnalyzer(text)
-    keywords_result = content_analyzer.check_keywords()
-    flow_result = content_analyzer.check_flow()
-    salutation_result = content_analyzer.check_salutation()
+    request_id = os.path.splitext(os.path.basename(input_path))[0]
+    results = evaluate_text(text, profile=profile, request_id=request_id)
+    record_evaluation(text, results, submission_id=request_id, source="cli")
+    keywords_result = results['keywords']
+    flow_result = results['flow']
+    salutation_result = results['salutation']
+    grammar_result = results['grammar']
+    filler_result = results['filler']
+    sentiment_result = results['sentiment']
+    # No audio duration here, so speech rate assumes 1 minute
+    wpm_result = results['speech_rate']
+    vocab_result = results['vocabulary']
 
-    # 2. Grammar Analysis
-    grammar_analyzer = GrammarAnalyzer(text)
-    grammar_result = grammar_analyzer.count_grammar_errors()
-    filler_result = grammar_analyzer.count_filler_words()
-    
     # Debug Grammar
     print("\nDEBUG: Grammar Matches:")
     for match in grammar_result['matches']:
         print(f"- {match.rule_id}: {match.message} (Context: {match.context})")
 
-    # 3. Sentiment Analysis
-    sentiment_analyzer = SentimentAnalyzer(text)
-    sentiment_result = sentiment_analyzer.analyze_sentiment()
     print(f"\nDEBUG: Sentiment Scores: {sentiment_result['scores']}")
 
-
-    # 4. Metrics Analysis
-    metrics_analyzer = MetricsAnalyzer(text)
-    # Assuming 1 minute for calculation as we don't have audio duration
-    wpm_result = metrics_analyzer.calculate_speech_rate(duration_minutes=1) 
-    vocab_result = metrics_analyzer.calculate_vocabulary_richness()
-
     # Generate Report
+    report_start = time.perf_counter()
+    report_span = tracing.start_span("report.text")
     report = []
     report.append("AI Intro Evaluator Report")
     report.append("=" * 30)
@@ -100,7 +96,7 @@ def main():
     # 2. Speech Rate
     report.append("\n2. Speech Rate (Total 10)")
     report.append("-" * 30)
-    report.append(f"  Word Count: {len(metrics_analyzer.words)}")
+    report.append(f"  Word Count: {len(tokenize_text(text))}")
     report.append(f"  Speech Rate (assuming 1 min): {wpm_result['wpm']:.2f} WPM")
     report.append(f"  Score: {wpm_result['score']}")
     total_score += wpm_result['score']
@@ -142,8 +138,23 @@ def main():
     report.append(f"TOTAL SCORE: {total_score} / 100")
     report.append("=" * 30)
 
+    ranked = {column: value for column, value in results.percentiles.items() if value is not None}
+    if ranked:
+        report.append("\nPercentile Among Past Submissions")
+        report.append("-" * 30)
+        for column, value in ranked.items():
+            report.append(f"  {column.replace('_', ' ').title()}: {ordinal(value)}")
+
+    if results.near_duplicates:
+        report.append("\nNear-Duplicate Warning")
+        report.append("-" * 30)
+        for match in results.near_duplicates:
+            report.append(f"  {match['similarity']:.0%} similar to {_describe_match(match)}")
+
     # Print and Save
     report_text = "\n".join(report)
+    get_telemetry().observe("report.text", time.perf_counter() - report_start)
+    report_span.end()
     print(report_text)
     
     with open(output_path, "w", encoding="utf-8") as f:
@@ -151,6 +162,275 @@ def main():
     
     print("-" * 50)
     print(f"Report saved to: {output_path}")
+    
+    # Timing summary
+    summary = results.telemetry
+    print(f"Evaluated in {summary['elapsed']:.2f}s (cache hit: {summary['cache_hit']})")
+    for stage, seconds in sorted(summary['stages'].items(), key=lambda item: -item[1]):
+        print(f"  {stage}: {seconds * 1000:.1f} ms")
+    if summary.get('profile'):
+        print(f"Profile saved to: {summary['profile']}")
+    if summary.get('trace_id'):
+        print(f"Trace {summary['trace_id']} written to: {config.TRACE_PATH}")
+
+def _describe_match(match):
+    if "template" in match:
+        return f"template {match['template']}"
+    who = match.get("student_name") or match.get("submission_id") or \
+        f"submission #{match.get('feature_id', match.get('id'))}"
+    return f"{who} ({match['cohort']})" if match.get("cohort") else who
+
+def run_batch_command(args):
+    from src.engine.batch import run_batch
+
+    print(f"AI Intro Evaluator - Batch evaluation of {args.batch}")
+    stats = run_batch(
+        args.batch,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        resume=not args.no_resume,
+        tier=args.tier,
+        profile=args.profile,
+        export_path=args.export
+    )
+    print("-" * 50)
+    print(f"Evaluated: {stats['processed']} (failed: {stats['failed']}, skipped from checkpoint: {stats['skipped']})")
+    print(f"Elapsed: {stats['elapsed']:.1f}s")
+    print(f"Throughput: {stats['per_second']:.2f} intros/s ({stats['per_hour']:.0f} intros/hour)")
+    print(f"Results saved to: {args.output}")
+    if args.export:
+        print(f"Exported {stats['exported']} rows to: {args.export}")
+
+def run_stream_command(args):
+    from src.engine.stream import run_stream
+
+    run_stream(sys.stdin, sys.stdout, workers=args.workers, window=args.window,
+               ordered=not args.unordered, tier=args.tier, profile=args.profile)
+
+def run_rescore_command(args):
+    from src.store import get_feature_store, rescore
+    from src.utils.rubric import Rubric
+
+    rubric = Rubric.load(args.rubric) if args.rubric else Rubric()
+    store = get_feature_store()
+    scope = f"cohort '{args.cohort}'" if args.cohort else "all submissions"
+    print(f"AI Intro Evaluator - Re-scoring {scope} in {store.path} under rubric {rubric.fingerprint}")
+    summary = rescore(store, rubric, cohort=args.cohort, save=not args.dry_run)
+    print("-" * 50)
+    print(f"{'Category':<14} {'Current':>9} {'New':>9}")
+    for column, new in summary["means"].items():
+        old = summary["baseline_means"][column]
+        print(f"{column:<14} {_mean(old):>9} {_mean(new):>9}")
+    print("-" * 50)
+    print(f"Re-scored {summary['rows']} submissions; {summary['changed']} total scores changed")
+    timing = f"Loaded in {summary['load_seconds']:.3f}s, scored in {summary['score_seconds']:.3f}s"
+    if summary["saved"]:
+        timing += f", saved in {summary['save_seconds']:.3f}s"
+    print(timing)
+
+def run_export_command(args):
+    from src.store import get_feature_store
+    from src.store.export import export_store
+    from src.utils.rubric import Rubric
+
+    rubric = Rubric.load(args.rubric) if args.rubric else Rubric()
+    store = get_feature_store()
+    scope = f"cohort '{args.cohort}'" if args.cohort else "all submissions"
+    print(f"AI Intro Evaluator - Exporting {scope} from {store.path}")
+    summary = export_store(store, args.export, cohort=args.cohort, rubric=rubric)
+    print(f"Exported {summary['rows']} rows in {summary['batches']} {summary['format']} batches "
+          f"({summary['elapsed']:.2f}s) to: {summary['path']}")
+
+def run_history_command(args):
+    from datetime import datetime
+    from src.store import get_feature_store, student_progress
+    from src.store.features import SCORE_COLUMNS
+
+    progress = student_progress(get_feature_store(), student_name=args.history, limit=args.limit)
+    attempts = progress["attempts"]
+    if not attempts:
+        print(f"No stored submissions for '{args.history}'")
+        return
+    columns = SCORE_COLUMNS + ["total"]
+    print(f"AI Intro Evaluator - {len(attempts)} attempts by {args.history}")
+    print("-" * 50)
+    print(f"{'When':<17} " + " ".join(f"{column[:8]:>8}" for column in columns))
+    for attempt in attempts:
+        when = datetime.fromtimestamp(attempt["created_at"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{when:<17} " + " ".join(f"{_score(attempt[column]):>8}" for column in columns))
+    if progress["previous"] is not None:
+        print(f"{'Change':<17} " + " ".join(f"{_delta(progress['deltas'][column]):>8}" for column in columns))
+
+def run_add_templates_command(args):
+    from src.store.dedup import add_templates
+
+    added = add_templates(args.add_templates)
+    print(f"Indexed {added} templates from {args.add_templates} for near-duplicate detection")
+
+def run_similar_command(args):
+    from src.analyzers.semantic import SemanticAnalyzer
+    from src.store.embeddings import get_embedding_index
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        vector = SemanticAnalyzer(f.read()).document_embedding()
+    if vector is None:
+        print(f"No sentences in {args.input}")
+        return
+    index = get_embedding_index()
+    matches = index.details(index.search(vector, k=args.limit))
+    print(f"AI Intro Evaluator - past intros most similar to {args.input}")
+    print("-" * 50)
+    if not matches:
+        print("No stored embeddings yet (intros are embedded when the app runs its semantic analysis)")
+    for match in matches:
+        print(f"{match['similarity']:.3f}  {_describe_match(match)}  score {_score(match['total'])}")
+
+def run_search_command(args):
+    from datetime import datetime
+    from src.store.search import get_search_index, parse_filter
+
+    filters = [parse_filter(expression) for expression in args.where or []]
+    if args.cohort:
+        filters.append(("cohort", "==", args.cohort))
+    found = get_search_index().search(args.search, filters=filters, limit=args.limit)
+    print(f"AI Intro Evaluator - {found['count']} submissions match '{args.search}'")
+    print("-" * 50)
+    for match in found["matches"]:
+        when = datetime.fromtimestamp(match["created_at"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{when}  {_describe_match(match)}  score {_score(match['total'])}")
+    if found["count"] > len(found["matches"]):
+        print(f"... {found['count'] - len(found['matches'])} more (raise --limit)")
+
+def run_rankings_command(args):
+    from src.store import get_feature_store
+    from src.store.rankings import RANKING_CATEGORIES, find_outliers, term_review
+
+    store = get_feature_store()
+    categories = RANKING_CATEGORIES if args.category == "all" else [args.category]
+    review = term_review(store, n=args.top, cohort=args.cohort, categories=categories)
+    if not review:
+        print("No scored submissions stored" + (f" for cohort '{args.cohort}'" if args.cohort else ""))
+        return
+    print("AI Intro Evaluator - End-of-Term Review")
+    for cohort, ranked in review.items():
+        print("=" * 50)
+        print(f"Cohort: {cohort or '(no cohort)'}")
+        for category in categories:
+            if category not in ranked:
+                continue
+            print(f"  {category.replace('_', ' ').title()}")
+            for label in ("top", "bottom"):
+                entries = ", ".join(f"{_describe_match(entry)} {entry['score']}" for entry in ranked[category][label])
+                print(f"    {label.title():<7} {entries}")
+    print("=" * 50)
+    print("Outliers")
+    outliers = find_outliers(store, cohorts=[args.cohort] if args.cohort else None, limit=args.top)
+    for outlier in outliers.values():
+        print(f"  {outlier['label']}: {outlier['count']}")
+        for row in outlier["rows"]:
+            print(f"    {_describe_match(row)}  score {_score(row['total'])}")
+
+def _score(value):
+    return "-" if value is None else str(value)
+
+def _delta(value):
+    return "-" if value is None else f"{value:+d}"
+
+def _mean(value):
+    return "-" if value is None else f"{value:.2f}"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AI Intro Evaluator")
+    parser.add_argument("--input", default=os.path.join("data", "input", "sample.txt"),
+                        help="Text file to evaluate")
+    parser.add_argument("--output", default=None,
+                        help="Report path (single file) or JSONL results path (batch)")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Evaluate a directory, glob of .txt files, CSV or JSONL file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=config.BATCH_CHUNK_SIZE,
+                        help="Records sent to a worker at a time in batch mode")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Start the batch from scratch instead of resuming from its checkpoint")
+    parser.add_argument("--tier", choices=["fast", "full"], default="full",
+                        help="Batch/stream evaluation tier: 'fast' skips grammar checking for quick triage")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read JSON records from stdin and write one JSON result per line to stdout")
+    parser.add_argument("--window", type=int, default=None,
+                        help="Maximum evaluations in flight in stream mode (default: 4 per worker)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="In stream mode, emit results as they complete instead of in input order")
+    parser.add_argument("--profile", choices=["cprofile", "sample"], default=None,
+                        help="Profile each evaluation and save a pstats / collapsed-stack file per request "
+                             "in data/profiles (same as setting AIE_PROFILE)")
+    parser.add_argument("--rescore", action="store_true",
+                        help="Re-score the stored features of past evaluations without running any analyzer")
+    parser.add_argument("--export", metavar="PATH", default=None,
+                        help="Write features and scores to a .parquet or .arrow file: the stored submissions, "
+                             "or with --batch the records of that run")
+    parser.add_argument("--rubric", default=None,
+                        help="JSON rubric for --rescore / --export (bands, keyword_points, salutation_points, "
+                             "flow_points); defaults to the rubric in src/config.py")
+    parser.add_argument("--cohort", default=None, help="Only re-score, export, search or rank this cohort")
+    parser.add_argument("--dry-run", action="store_true", help="Compare the rubrics without saving the new scores")
+    parser.add_argument("--history", metavar="STUDENT", default=None,
+                        help="Show a student's stored attempts and the change since the previous one")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Most recent attempts shown with --history, or matches shown with --similar / --search")
+    parser.add_argument("--rankings", action="store_true",
+                        help="End-of-term review: top and bottom submissions per cohort, plus outliers "
+                             "(fast speech, no topics found, very short)")
+    parser.add_argument("--category", default="total", choices=["total", "all"] + list(config.SCORE_CATEGORIES),
+                        help="Score category ranked by --rankings ('all' for the total and every sub-score)")
+    parser.add_argument("--top", type=int, default=5, help="Submissions per list with --rankings")
+    parser.add_argument("--search", metavar="QUERY", default=None,
+                        help='Search stored submissions for words and "quoted phrases" (-word excludes a word); '
+                             "an empty query lists every match of the --where filters")
+    parser.add_argument("--where", metavar="FILTER", action="append",
+                        help="Filter for --search, e.g. 'Goals == false', 'wpm > 200' or "
+                             "'salutation_type = Normal' (repeatable)")
+    parser.add_argument("--similar", action="store_true",
+                        help="List the stored intros semantically closest to --input (needs sentence-transformers)")
+    parser.add_argument("--add-templates", metavar="SOURCE", default=None,
+                        help="Index template introductions (directory or glob of .txt files) so submissions "
+                             "copied from them are flagged")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="Don't write spans to data/traces (same as setting AIE_TRACE=0)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.no_trace:
+        config.TRACE_ENABLED = False
+
+    if args.rescore:
+        run_rescore_command(args)
+    elif args.history:
+        run_history_command(args)
+    elif args.add_templates:
+        run_add_templates_command(args)
+    elif args.similar:
+        run_similar_command(args)
+    elif args.search is not None:
+        run_search_command(args)
+    elif args.rankings:
+        run_rankings_command(args)
+    elif args.stream:
+        run_stream_command(args)
+    elif args.batch:
+        args.output = args.output or os.path.join("data", "output", "batch_results.jsonl")
+        run_batch_command(args)
+    elif args.export:
+        run_export_command(args)
+    else:
+        with tracing.span("evaluate_file", file=os.path.basename(args.input)):
+            evaluate_file(args.input, args.output or os.path.join("data", "output", "evaluation_report.txt"),
+                          profile=args.profile)
+        telemetry = get_telemetry()
+        if telemetry.flush(force=True):
+            print(f"Metrics written to: {os.path.join(telemetry.directory, 'metrics.prom')}")
 
 if __name__ == "__main__":
     main()
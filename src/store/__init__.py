@@ -0,0 +1,22 @@
+"""
+Raw-feature store for AI Intro Evaluator
+
+The columnar export (src.store.export) needs pyarrow and is imported on its own.
+"""
+
+from .features import FeatureStore, extract_features, get_feature_store, record_evaluation, text_hash
+from .rescore import rescore, score_features
+from .analytics import cohort_summary
+from .history import student_progress
+
+__all__ = [
+    'FeatureStore',
+    'cohort_summary',
+    'extract_features',
+    'get_feature_store',
+    'record_evaluation',
+    'rescore',
+    'score_features',
+    'student_progress',
+    'text_hash'
+]
@@ -0,0 +1,69 @@
+"""
+Cohort Analytics Module
+Class-level summaries (topic coverage, score distributions, common grammar rules) built from the
+feature store's precomputed aggregates, never from the stored submissions themselves
+"""
+
+import numpy as np
+
+from src import config
+from src.store.features import SCORE_COLUMNS
+from src.utils.rubric import get_rubric
+
+# Topics in the order they are listed in config.KEYWORDS
+TOPICS = [topic for topics in config.KEYWORDS.values() for topic in topics]
+
+def histogram_stats(scores, counts):
+    """Count, mean and median of a score histogram given as two aligned arrays"""
+    total = int(counts.sum())
+    if total == 0:
+        return {"count": 0, "mean": None, "median": None}
+    median_index = np.searchsorted(np.cumsum(counts), (total + 1) / 2)
+    return {
+        "count": total,
+        "mean": float((scores * counts).sum() / total),
+        "median": int(scores[median_index])
+    }
+
+def cohort_summary(store, cohorts=None, rubric=None, top_rules=15):
+    """
+    Summarize one or more cohorts (every cohort by default) from the store's aggregates.
+
+    Args:
+        store: FeatureStore
+        cohorts: Cohort names to combine ('' for submissions without a cohort)
+        rubric: Rubric of the score distributions (defaults to the config rubric)
+        top_rules: Number of LanguageTool rule ids to return
+
+    Returns:
+        dict with submission counts, 'topics' (names and coverage rates), 'scores'
+        (category -> score values, counts and stats) and the most common 'rules'
+    """
+    rubric = rubric or get_rubric()
+    aggregates = store.cohort_aggregates(rubric.fingerprint, cohorts)
+    rows = aggregates["rows"]
+    topic_rows = rows.get("topics", 0)
+    grammar_rows = rows.get("grammar", 0)
+
+    names = TOPICS + sorted(set(aggregates["topics"]) - set(TOPICS))
+    hits = np.array([aggregates["topics"].get(name, 0) for name in names], dtype=np.int64)
+    coverage = hits / topic_rows if topic_rows else np.zeros(len(names))
+
+    scores = {}
+    for category in SCORE_COLUMNS + ["total"]:
+        histogram = aggregates["scores"].get(category, {})
+        values = np.fromiter(histogram.keys(), dtype=np.int64, count=len(histogram))
+        counts = np.fromiter(histogram.values(), dtype=np.int64, count=len(histogram))
+        scores[category] = dict(histogram_stats(values, counts), values=values, counts=counts,
+                                max=config.SCORE_CATEGORIES.get(category, 100))
+
+    rules = sorted(aggregates["rules"].items(), key=lambda item: (-item[1], item[0]))[:top_rules]
+    return {
+        "submissions": rows.get("submissions", 0),
+        "topic_rows": topic_rows,
+        "grammar_rows": grammar_rows,
+        "topics": {"names": names, "hits": hits, "coverage": coverage},
+        "scores": scores,
+        "rules": [{"rule_id": rule, "count": count,
+                   "per_submission": count / grammar_rows if grammar_rows else 0.0} for rule, count in rules]
+    }
@@ -0,0 +1,238 @@
+"""
+Near-Duplicate Module
+MinHash signatures of word shingles and a persisted LSH index, so each new submission finds
+lightly edited copies of earlier submissions (or of known templates) without comparing it
+against every stored one
+"""
+
+import functools
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from src import config
+from src.utils.text_utils import tokenize_text
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_PARAMS = 900
+
+def shingles(tokens, size=None):
+    """Set of word n-grams of a token list (the whole text when it is shorter than size)"""
+    size = size or config.SHINGLE_SIZE
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+@functools.lru_cache(maxsize=4)
+def _permutations(count, seed=1):
+    # Fixed seed (and the legacy generator, whose stream never changes) keep signatures comparable
+    random = np.random.RandomState(seed)
+    a = random.randint(1, 1 << 32, size=count, dtype=np.uint64)
+    b = random.randint(0, 1 << 32, size=count, dtype=np.uint64)
+    return a, b
+
+def minhash_signature(tokens):
+    """
+    MinHash signature of a token list's shingles.
+
+    Args:
+        tokens: Words as returned by tokenize_text
+
+    Returns:
+        uint32 array of config.MINHASH_PERMUTATIONS minimums, or None for an empty text
+    """
+    shingle_set = shingles(tokens)
+    if not shingle_set:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingle_set),
+        dtype=np.uint64, count=len(shingle_set)
+    )
+    a, b = _permutations(config.MINHASH_PERMUTATIONS)
+    # a and the hashes are below 2**32, so a * hash + b cannot overflow 64 bits
+    values = ((np.outer(hashes, a) + b) % _MERSENNE_PRIME) & _MAX_HASH
+    return values.min(axis=0).astype(np.uint32)
+
+def text_signature(text):
+    return minhash_signature(tokenize_text(text))
+
+def estimated_similarity(first, second):
+    """Estimated Jaccard similarity of two signatures' shingle sets"""
+    return float(np.mean(np.asarray(first) == np.asarray(second)))
+
+def band_keys(signature, bands=None):
+    """One 64-bit LSH bucket key per band of the signature"""
+    bands = bands or config.LSH_BANDS
+    signature = np.asarray(signature, dtype=np.uint32)
+    rows = len(signature) // bands
+    return [int.from_bytes(hashlib.blake2b(bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes(),
+                                           digest_size=8).digest(), "little", signed=True)
+            for band in range(bands)]
+
+def student_key(student_id=None, student_name=None):
+    """Same identity rule as the feature store's student index: the id, else the case-folded name"""
+    if student_id is not None:
+        return str(student_id)
+    name = (student_name or "").strip().lower()
+    return name or None
+
+class NearDuplicateIndex:
+    """
+    SQLite tables of MinHash signatures (one per stored submission or template) and of LSH
+    buckets (one row per band). Two texts share a bucket when all rows of a band agree,
+    which is likely only above roughly (1 / bands) ** (1 / rows) similarity; candidates
+    are then checked against their full signatures.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.FEATURE_STORE_PATH
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS minhash_docs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, feature_id INTEGER UNIQUE, template TEXT UNIQUE,
+                student TEXT, signature BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                key INTEGER NOT NULL, doc_id INTEGER NOT NULL, PRIMARY KEY (key, doc_id)) WITHOUT ROWID;
+        """)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM minhash_docs").fetchone()[0]
+
+    def _candidates(self, keys):
+        return [row[0] for row in self._db.execute(
+            f"SELECT DISTINCT doc_id FROM lsh_buckets WHERE key IN ({', '.join('?' * len(keys))})", keys)]
+
+    def query(self, signature, threshold=None, exclude_feature=None, exclude_student=None, limit=10):
+        """
+        Stored submissions and templates whose estimated similarity to signature is at
+        least threshold, most similar first.
+
+        Args:
+            signature: MinHash signature
+            threshold: Minimum estimated Jaccard similarity (defaults to config.NEAR_DUPLICATE_THRESHOLD)
+            exclude_feature: Feature store row id to leave out (the submission itself)
+            exclude_student: Student key to leave out (a student's own earlier attempts)
+            limit: Maximum matches returned
+
+        Returns:
+            list of dicts with similarity, template (for templates) or the submission's
+            feature_id, submission_id, student_name, cohort and source
+        """
+        threshold = config.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        signature = np.asarray(signature, dtype=np.uint32)
+        keys = band_keys(signature)
+        matches = []
+        with self._lock:
+            doc_ids = self._candidates(keys)
+            for start in range(0, len(doc_ids), _MAX_PARAMS):
+                chunk = doc_ids[start:start + _MAX_PARAMS]
+                rows = self._db.execute(
+                    "SELECT d.feature_id, d.template, d.student, d.signature, f.submission_id, f.student_name, "
+                    "f.cohort, f.source FROM minhash_docs d LEFT JOIN features f ON f.id = d.feature_id "
+                    f"WHERE d.id IN ({', '.join('?' * len(chunk))})", chunk).fetchall()
+                if not rows:
+                    continue
+                signatures = np.frombuffer(b"".join(row[3] for row in rows), dtype=np.uint32).reshape(len(rows), -1)
+                similarities = (signatures == signature).mean(axis=1)
+                for row, similarity in zip(rows, similarities):
+                    feature_id, template, student = row[:3]
+                    if similarity < threshold or (exclude_feature is not None and feature_id == exclude_feature):
+                        continue
+                    if exclude_student is not None and student == exclude_student:
+                        continue
+                    match = {"similarity": float(similarity)}
+                    if template is not None:
+                        match["template"] = template
+                    else:
+                        match.update(feature_id=feature_id, submission_id=row[4], student_name=row[5],
+                                     cohort=row[6], source=row[7])
+                    matches.append(match)
+        matches.sort(key=lambda match: -match["similarity"])
+        return matches[:limit]
+
+    def add(self, signature, feature_id=None, template=None, student=None):
+        """Index a signature for a feature store row or a named template, replacing an earlier one"""
+        signature = np.asarray(signature, dtype=np.uint32)
+        column, value = ("feature_id", feature_id) if template is None else ("template", template)
+        with self._lock:
+            old = self._db.execute(f"SELECT id, signature FROM minhash_docs WHERE {column} = ?", (value,)).fetchone()
+            if old is not None:
+                doc_id = old[0]
+                self._db.executemany("DELETE FROM lsh_buckets WHERE key = ? AND doc_id = ?",
+                                     [(key, doc_id) for key in band_keys(np.frombuffer(old[1], dtype=np.uint32))])
+                self._db.execute("UPDATE minhash_docs SET student = ?, signature = ? WHERE id = ?",
+                                 (student, signature.tobytes(), doc_id))
+            else:
+                doc_id = self._db.execute(
+                    "INSERT INTO minhash_docs (feature_id, template, student, signature) VALUES (?, ?, ?, ?)",
+                    (feature_id, template, student, signature.tobytes())
+                ).lastrowid
+            self._db.executemany("INSERT OR IGNORE INTO lsh_buckets (key, doc_id) VALUES (?, ?)",
+                                 [(key, doc_id) for key in band_keys(signature)])
+            self._db.commit()
+        return doc_id
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_duplicate_index():
+    """Process-wide near-duplicate index in the feature store's SQLite file"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from src.store.features import get_feature_store
+            # The feature store creates the directory, the file and the features table
+            _index = NearDuplicateIndex(get_feature_store().path)
+        return _index
+
+def flag_near_duplicates(feature_id, signature, results=None, student_id=None, student_name=None):
+    """
+    Find earlier submissions (by other students) and templates that a stored submission
+    nearly duplicates, then add it to the index. The matches are attached to the result
+    as result.near_duplicates when it is an EvaluationResult.
+
+    Returns:
+        list of matches (see NearDuplicateIndex.query)
+    """
+    if signature is None or feature_id is None:
+        return []
+    index = get_duplicate_index()
+    student = student_key(student_id, student_name)
+    matches = index.query(signature, exclude_feature=feature_id, exclude_student=student)
+    index.add(signature, feature_id=feature_id, student=student)
+    if hasattr(results, "near_duplicates"):
+        results.near_duplicates = matches
+    return matches
+
+def add_templates(source):
+    """
+    Index template introductions (a directory or glob of .txt files) by file name.
+
+    Returns:
+        Number of templates indexed
+    """
+    pattern = os.path.join(source, "*.txt") if os.path.isdir(source) else source
+    index = get_duplicate_index()
+    added = 0
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r", encoding="utf-8") as f:
+            signature = text_signature(f.read())
+        if signature is not None:
+            index.add(signature, template=os.path.basename(path))
+            added += 1
+    return added
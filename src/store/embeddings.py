@@ -0,0 +1,354 @@
+"""
+Embedding Index Module
+Mean-pooled sentence-encoder embedding of every stored submission in a memory-mapped matrix, with
+an inverted-file (IVF) index over it, so the semantically closest past introductions are found by
+scoring a few clusters of vectors instead of all of them
+"""
+
+import math
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from src import config
+from src.store.dedup import student_key
+from src.utils.rubric import get_rubric
+
+# Matrix rows added per growth of the memory-mapped file (at least; it doubles once larger)
+_GROW_ROWS = 4096
+
+# Vectors per k-means list in the training sample, and rows assigned per matrix product
+_TRAIN_PER_LIST = 32
+_ASSIGN_ROWS = 8192
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_PARAMS = 900
+
+def _normalize(vector):
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+def list_count(count):
+    """Number of IVF lists for a corpus of count vectors (about its square root)"""
+    return min(max(int(math.sqrt(count)), 16), 4096)
+
+def assign_lists(vectors, centroids):
+    """Index of the closest centroid (largest inner product) of each vector"""
+    lists = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _ASSIGN_ROWS):
+        chunk = np.asarray(vectors[start:start + _ASSIGN_ROWS], dtype=np.float32)
+        lists[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return lists
+
+def spherical_kmeans(vectors, clusters, iterations=None, seed=0):
+    """
+    k-means on the unit sphere (centroids are re-normalized means, closeness is the inner product).
+
+    Args:
+        vectors: Unit-length float32 vectors, one per row
+        clusters: Number of centroids
+        iterations: Lloyd iterations (defaults to config.EMBEDDING_KMEANS_ITERATIONS)
+        seed: Seed of the initial centroids and of the reseeding of empty clusters
+
+    Returns:
+        float32 array of clusters unit-length centroids
+    """
+    iterations = iterations or config.EMBEDDING_KMEANS_ITERATIONS
+    random = np.random.default_rng(seed)
+    centroids = vectors[random.choice(len(vectors), size=clusters, replace=False)].copy()
+    for _ in range(iterations):
+        lists = assign_lists(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, lists, vectors)
+        sizes = np.bincount(lists, minlength=clusters)
+        empty = np.flatnonzero(sizes == 0)
+        sums[empty] = vectors[random.choice(len(vectors), size=len(empty), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.where(norms > 0, norms, 1)
+    return centroids.astype(np.float32)
+
+class EmbeddingIndex:
+    """
+    Vectors live in a float32 memmap (embeddings.f32 next to the feature store, one row per
+    embedded submission) that grows in chunks. SQLite records which feature store row each
+    matrix row belongs to and the IVF list it is filed under, plus the current centroids.
+
+    Below config.EMBEDDING_TRAIN_MIN vectors every row is scored. From then on, centroids are
+    trained on a sample (and every row refiled) whenever the corpus has doubled since the last
+    training, on a background thread started by the add() that crossed the mark; a query ranks
+    the centroids and scores only the rows of the nprobe closest lists. Each process keeps the
+    row -> list mapping in memory and reads only the rows added since.
+    """
+
+    def __init__(self, path=None, dim=None):
+        self.path = path or config.FEATURE_STORE_PATH
+        self.dim = dim or config.EMBEDDING_DIM
+        self.matrix_path = os.path.join(os.path.dirname(self.path), "embeddings.f32")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " row INTEGER PRIMARY KEY, feature_id INTEGER UNIQUE NOT NULL, student TEXT,"
+            " list INTEGER NOT NULL DEFAULT -1)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_ivf ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL, trained_on INTEGER NOT NULL,"
+            " centroids BLOB NOT NULL)"
+        )
+        self._matrix = None
+        self._version = None
+        self._training = None
+        self._reset()
+
+    def _reset(self):
+        self._loaded = 0
+        self._feature_ids = np.zeros(0, dtype=np.int64)
+        self._students = np.zeros(0, dtype=object)
+        self._lists = np.zeros(0, dtype=np.int32)
+        self._centroids = None
+        self._trained_on = 0
+        self._order = None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+            self._matrix = None
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _map(self, rows):
+        # Map (growing the file first when needed) at least rows rows of the matrix
+        if self._matrix is not None and len(self._matrix) >= rows:
+            return
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        if size < rows * row_bytes:
+            capacity = max(rows, 2 * (size // row_bytes), _GROW_ROWS)
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+            size = capacity * row_bytes
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(size // row_bytes, self.dim))
+
+    def _sync(self):
+        # Pick up new centroids (every row was refiled, so start over) and rows added elsewhere
+        ivf = self._db.execute("SELECT version, trained_on, centroids FROM embedding_ivf WHERE id = 1").fetchone()
+        version = ivf[0] if ivf else 0
+        if version != self._version:
+            self._reset()
+            self._version = version
+            if ivf is not None:
+                self._trained_on = ivf[1]
+                self._centroids = np.frombuffer(ivf[2], dtype=np.float32).reshape(-1, self.dim)
+        rows = self._db.execute("SELECT feature_id, student, list FROM embeddings WHERE row >= ? ORDER BY row",
+                                (self._loaded,)).fetchall()
+        if rows:
+            feature_ids, students, lists = zip(*rows)
+            self._feature_ids = np.concatenate([self._feature_ids, np.array(feature_ids, dtype=np.int64)])
+            self._students = np.concatenate([self._students, np.array(students, dtype=object)])
+            self._lists = np.concatenate([self._lists, np.array(lists, dtype=np.int32)])
+            self._loaded += len(rows)
+            self._order = None
+        if self._loaded:
+            self._map(self._loaded)
+
+    def _candidates(self, vector, nprobe):
+        if self._centroids is None:
+            return np.arange(self._loaded)
+        if self._order is None:
+            self._order = np.argsort(self._lists, kind="stable")
+            self._sorted_lists = self._lists[self._order]
+        probe = np.argsort(-(self._centroids @ vector))[:nprobe]
+        # Rows filed before any training (list -1) are always scored
+        probe = np.append(probe, -1)
+        starts = np.searchsorted(self._sorted_lists, probe, side="left")
+        ends = np.searchsorted(self._sorted_lists, probe, side="right")
+        return np.sort(np.concatenate([self._order[start:end] for start, end in zip(starts, ends)]))
+
+    def search(self, vector, k=None, exclude_feature=None, exclude_student=None, nprobe=None):
+        """
+        Stored submissions whose embeddings are closest to vector, most similar first.
+
+        Args:
+            vector: Document embedding (see SemanticAnalyzer.document_embedding)
+            k: Maximum matches returned (defaults to config.SIMILAR_SUBMISSIONS)
+            exclude_feature: Feature store row id to leave out (the submission itself)
+            exclude_student: Student key to leave out (a student's own earlier attempts)
+            nprobe: IVF lists scored (defaults to config.EMBEDDING_NPROBE)
+
+        Returns:
+            list of (feature_id, cosine similarity) tuples
+        """
+        k = k or config.SIMILAR_SUBMISSIONS
+        nprobe = nprobe or config.EMBEDDING_NPROBE
+        vector = _normalize(vector)
+        with self._lock:
+            self._sync()
+            if not self._loaded:
+                return []
+            rows = self._candidates(vector, nprobe)
+            similarities = np.asarray(self._matrix[rows]) @ vector
+            keep = np.ones(len(rows), dtype=bool)
+            if exclude_feature is not None:
+                keep &= self._feature_ids[rows] != exclude_feature
+            if exclude_student is not None:
+                keep &= self._students[rows] != exclude_student
+            rows, similarities = rows[keep], similarities[keep]
+            if len(rows) > k:
+                top = np.argpartition(-similarities, k)[:k]
+                rows, similarities = rows[top], similarities[top]
+            order = np.argsort(-similarities, kind="stable")
+            return [(int(self._feature_ids[row]), float(similarity))
+                    for row, similarity in zip(rows[order], similarities[order])]
+
+    def details(self, matches, rubric=None):
+        """
+        search() matches with each submission's submission_id, student_name, cohort, source,
+        created_at and total score (under rubric, defaulting to the config rubric)
+        """
+        if not matches:
+            return []
+        fingerprint = (rubric or get_rubric()).fingerprint
+        ids = [feature_id for feature_id, _ in matches][:_MAX_PARAMS]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT f.id, f.submission_id, f.student_name, f.cohort, f.source, f.created_at, s.total "
+                "FROM features f LEFT JOIN scores s ON s.feature_id = f.id AND s.rubric = ? "
+                f"WHERE f.id IN ({', '.join('?' * len(ids))})", [fingerprint] + ids).fetchall()
+        by_id = {row[0]: row for row in rows}
+        return [{"similarity": similarity, "feature_id": feature_id, "submission_id": by_id[feature_id][1],
+                 "student_name": by_id[feature_id][2], "cohort": by_id[feature_id][3],
+                 "source": by_id[feature_id][4], "created_at": by_id[feature_id][5], "total": by_id[feature_id][6]}
+                for feature_id, similarity in matches if feature_id in by_id]
+
+    def add(self, feature_id, vector, student=None):
+        """
+        Store the embedding of a feature store row (replacing an earlier one) and return its matrix row.
+        When the corpus is due for new centroids, training starts on a background thread.
+        """
+        vector = _normalize(vector)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                cluster = int(np.argmax(self._centroids @ vector)) if self._centroids is not None else -1
+                old = self._db.execute("SELECT row FROM embeddings WHERE feature_id = ?", (feature_id,)).fetchone()
+                if old is not None:
+                    row = old[0]
+                    self._db.execute("UPDATE embeddings SET student = ?, list = ? WHERE row = ?",
+                                     (student, cluster, row))
+                else:
+                    # Rows are never deleted, so after a sync the next one is the number loaded
+                    row = self._loaded
+                    self._db.execute("INSERT INTO embeddings (row, feature_id, student, list) VALUES (?, ?, ?, ?)",
+                                     (row, feature_id, student, cluster))
+                self._map(row + 1)
+                self._matrix[row] = vector
+                self._matrix.flush()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            if old is not None:
+                # Other processes see a replaced row's new list after the next training
+                self._students[row] = student
+                self._lists[row] = cluster
+                self._order = None
+            else:
+                self._sync()
+            count = self._loaded
+            due = count >= config.EMBEDDING_TRAIN_MIN and count >= 2 * self._trained_on
+            if due and (self._training is None or not self._training.is_alive()):
+                self._training = threading.Thread(target=self.train, name="embedding-ivf-train", daemon=True)
+                self._training.start()
+        return row
+
+    def wait_for_training(self, timeout=None):
+        """Block until a background training started by add() has finished"""
+        training = self._training
+        if training is not None:
+            training.join(timeout)
+
+    def train(self):
+        """
+        Train centroids for the current corpus and refile every row under its closest one.
+        k-means and the refiling run without holding the index, so searches and adds carry on;
+        rows added meanwhile are filed when the centroids are saved.
+
+        Returns:
+            Number of lists (0 when there is nothing to train or another process trained first)
+        """
+        with self._lock:
+            self._sync()
+            count, version, matrix = self._loaded, self._version, self._matrix
+        if not count:
+            return 0
+        clusters = min(list_count(count), count)
+        random = np.random.default_rng(count)
+        sample = np.sort(random.choice(count, size=min(count, clusters * _TRAIN_PER_LIST), replace=False))
+        centroids = spherical_kmeans(np.asarray(matrix[sample]), clusters, seed=count)
+        lists = assign_lists(matrix[:count], centroids)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                if self._version != version:
+                    self._db.execute("ROLLBACK")
+                    return 0
+                lists = np.concatenate([lists, assign_lists(self._matrix[count:self._loaded], centroids)])
+                self._db.executemany("UPDATE embeddings SET list = ? WHERE row = ?",
+                                     zip(lists.tolist(), range(len(lists))))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embedding_ivf (id, version, trained_on, centroids) VALUES (1, ?, ?, ?)",
+                    ((version or 0) + 1, count, centroids.tobytes())
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._sync()
+        return clusters
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_embedding_index():
+    """Process-wide embedding index next to the feature store's SQLite file"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from src.store.features import get_feature_store
+            # The feature store creates the directory, the file and the features table
+            _index = EmbeddingIndex(get_feature_store().path)
+        return _index
+
+def find_similar(feature_id, vector, k=None, student_id=None, student_name=None, add=True):
+    """
+    Earlier submissions (by other students) semantically closest to a stored submission,
+    then (with add) add its embedding to the index.
+
+    Args:
+        feature_id: Feature store row id of the submission (None only searches)
+        vector: Its document embedding
+        k: Maximum matches (defaults to config.SIMILAR_SUBMISSIONS)
+        student_id: Student id, whose own attempts are left out
+        student_name: Student name, used when there is no id
+        add: Store the embedding afterwards
+
+    Returns:
+        list of matches (see EmbeddingIndex.details), or [] when the store is off
+    """
+    if vector is None or not config.FEATURE_STORE_ENABLED:
+        return []
+    index = get_embedding_index()
+    matches = index.details(index.search(vector, k, exclude_feature=feature_id,
+                                         exclude_student=student_key(student_id, student_name)))
+    if add and feature_id is not None:
+        index.add(feature_id, vector, student=student_key(student_id, student_name))
+    return matches
@@ -0,0 +1,238 @@
+"""
+Columnar Export Module
+Streams per-submission features and scores to Parquet (storage) or Arrow IPC (zero-copy
+handoff to pandas / Polars) in fixed-size row groups, so a cohort never has to fit in memory
+"""
+
+import json
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.store.features import FLOW_SECTIONS, SCORE_COLUMNS, scores_from_results
+from src.utils.rubric import get_rubric
+
+DEFAULT_BATCH_ROWS = 4096
+
+ARROW_SUFFIXES = (".arrow", ".arrows", ".feather", ".ipc")
+
+METADATA_COLUMNS = ("submission_id", "student_id", "student_name", "cohort", "source", "created_at")
+
+# Columns whose values repeat across a cohort, written as dictionary<int32, string>
+DICTIONARY_COLUMNS = ("cohort", "source", "salutation_type")
+
+# List columns whose items are dictionary-encoded strings
+DICTIONARY_LIST_COLUMNS = ("topics", "grammar_rules")
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+EXPORT_SCHEMA = pa.schema(
+    [
+        ("submission_id", pa.string()),
+        ("student_id", pa.string()),
+        ("student_name", pa.string()),
+        ("cohort", _DICTIONARY),
+        ("source", _DICTIONARY),
+        ("created_at", pa.timestamp("ms", tz="UTC")),
+        ("word_count", pa.int32()),
+        ("unique_words", pa.int32()),
+        ("grammar_available", pa.bool_()),
+        ("error_count", pa.int32()),
+        ("grammar_rules", pa.list_(_DICTIONARY)),
+        ("filler_count", pa.int32()),
+        ("filler_rate", pa.float64()),
+        ("ttr", pa.float64()),
+        ("compound", pa.float64()),
+        ("wpm", pa.float64()),
+        ("audio_duration", pa.float64()),
+        ("topics", pa.list_(_DICTIONARY)),
+        ("salutation_type", _DICTIONARY),
+    ]
+    + [(f"flow_{section.lower()}", pa.int32()) for section in FLOW_SECTIONS]
+    + [
+        ("semantic_overall", pa.float64()),
+        ("semantic_similarities", pa.list_(pa.float32())),
+    ]
+    + [(f"score_{column}", pa.int16()) for column in SCORE_COLUMNS + ["total"]],
+    metadata={"producer": "ai-intro-evaluator"}
+)
+
+def export_format(path):
+    """'arrow' for .arrow/.arrows/.feather/.ipc paths, 'parquet' for anything else"""
+    return "arrow" if path.lower().endswith(ARROW_SUFFIXES) else "parquet"
+
+class ColumnarWriter:
+    """
+    Buffers export rows and writes them batch_rows at a time: one row group per batch in
+    Parquet, one record batch in Arrow IPC.
+
+    Dictionaries only ever grow, so each Arrow record batch carries just the new entries
+    (a dictionary delta) and earlier batches stay valid.
+    """
+
+    def __init__(self, path, fmt=None, batch_rows=DEFAULT_BATCH_ROWS, metadata=None):
+        """
+        Args:
+            path: Output file (replaced if it exists)
+            fmt: "parquet" or "arrow" (defaults to export_format(path))
+            batch_rows: Rows per row group / record batch
+            metadata: Extra key -> value pairs stored in the file's schema metadata
+        """
+        self.path = path
+        self.format = fmt or export_format(path)
+        if self.format not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown export format '{self.format}', expected 'parquet' or 'arrow'")
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self.batches_written = 0
+        self._rows = []
+        self._dictionaries = {name: {} for name in DICTIONARY_COLUMNS + DICTIONARY_LIST_COLUMNS}
+
+        schema = EXPORT_SCHEMA
+        if metadata:
+            schema = schema.with_metadata(dict(schema.metadata, **{k: str(v) for k, v in metadata.items()}))
+        self.schema = schema
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(path, schema,
+                                           options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, row):
+        """Add one export_row() dict, writing a batch once batch_rows are buffered"""
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_rows:
+            self.flush()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def _dictionary_array(self, name, values):
+        # Indices into this column's running dictionary, which new values are appended to
+        lookup = self._dictionaries[name]
+        indices = [None if value is None else lookup.setdefault(value, len(lookup)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                              pa.array(list(lookup), type=pa.string()))
+
+    def _dictionary_list_array(self, name, lists):
+        offsets = [0]
+        items = []
+        for values in lists:
+            items.extend(values or ())
+            offsets.append(len(items))
+        mask = pa.array([values is None for values in lists], type=pa.bool_())
+        return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), self._dictionary_array(name, items),
+                                        mask=mask)
+
+    def _build_batch(self, rows):
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if field.name in DICTIONARY_COLUMNS:
+                arrays.append(self._dictionary_array(field.name, values))
+            elif field.name in DICTIONARY_LIST_COLUMNS:
+                arrays.append(self._dictionary_list_array(field.name, values))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.record_batch(arrays, schema=self.schema)
+
+    def flush(self):
+        """Write the buffered rows as one batch"""
+        if not self._rows:
+            return
+        batch = self._build_batch(self._rows)
+        if self.format == "parquet":
+            self._writer.write_batch(batch, row_group_size=len(self._rows))
+        else:
+            self._writer.write_batch(batch)
+        self.rows_written += len(self._rows)
+        self.batches_written += 1
+        self._rows = []
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+def export_row(features, scores=None, submission_id=None, student_id=None, student_name=None, cohort=None,
+               source=None, created_at=None):
+    """
+    Build one export row from extract_features() output and scores_from_results() output.
+
+    Returns:
+        dict of export column -> value
+    """
+    row = {name: features.get(name) for name in EXPORT_SCHEMA.names if name in features}
+    if row.get("grammar_available") is not None:
+        row["grammar_available"] = bool(row["grammar_available"])
+    row.update(submission_id=submission_id, student_id=student_id, student_name=student_name, cohort=cohort,
+               source=source, created_at=int((created_at or time.time()) * 1000))
+    for column in SCORE_COLUMNS + ["total"]:
+        row[f"score_{column}"] = (scores or {}).get(column)
+    return row
+
+def output_line_row(line, source):
+    """Export row of a batch/stream output line, or None for a failed record"""
+    if "features" not in line:
+        return None
+    return export_row(line["features"], scores_from_results(line["results"]), submission_id=line["id"],
+                      student_name=line.get("student_name"), cohort=line.get("cohort"), source=source)
+
+def _json_list(value):
+    return json.loads(value) if value is not None else None
+
+def export_store(store, path, cohort=None, rubric=None, fmt=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Export every stored submission (or one cohort) with its scores under rubric.
+
+    Rows are read from SQLite batch_rows at a time and written straight out, so memory
+    stays flat however many submissions the store holds.
+
+    Args:
+        store: FeatureStore
+        path: Output .parquet or .arrow file
+        cohort: Only export this cohort
+        rubric: Rubric whose stored scores are exported (defaults to the config rubric);
+            submissions never scored under it get null scores
+        fmt: "parquet" or "arrow" (defaults to the path's extension)
+        batch_rows: Rows per row group / record batch
+
+    Returns:
+        dict with rows, batches, format, path and elapsed seconds
+    """
+    rubric = rubric or get_rubric()
+    topic_names = {bit: name for name, bit in store.topic_bits().items()}
+    start = time.perf_counter()
+
+    with ColumnarWriter(path, fmt, batch_rows, metadata={"rubric": rubric.fingerprint}) as writer:
+        for rows in store.iter_rows(rubric.fingerprint, cohort=cohort, batch_rows=batch_rows):
+            for row in rows:
+                mask = row["topic_mask"]
+                features = dict(row, grammar_rules=_json_list(row["grammar_rules"]),
+                                semantic_similarities=_json_list(row["semantic_similarities"]),
+                                topics=None if mask is None else
+                                [topic_names[bit] for bit in sorted(topic_names) if mask >> bit & 1])
+                scores = {column: row[column] for column in SCORE_COLUMNS + ["total"]}
+                writer.write(export_row(features, scores, **{key: row[key] for key in METADATA_COLUMNS}))
+
+    return {
+        "rows": writer.rows_written,
+        "batches": writer.batches_written,
+        "format": writer.format,
+        "path": path,
+        "elapsed": time.perf_counter() - start
+    }
@@ -0,0 +1,658 @@
+"""
+Feature Store Module
+Keeps every evaluation's raw features (counts, rates, topic hits, flow positions) apart from
+its scores in SQLite, so a changed rubric can be applied without re-running any analyzer
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src import config
+from src.engine.result import is_computed
+from src.store.dedup import flag_near_duplicates, minhash_signature
+from src.store.search import index_submission
+from src.utils.rubric import get_rubric
+from src.utils.text_utils import clean_text, tokenize_text
+
+SCORE_COLUMNS = list(config.SCORE_CATEGORIES)
+
+FLOW_SECTIONS = ("Salutation", "Name", "Details", "Closing")
+
+# Who a stored submission belongs to: the student id, else the case-folded name
+STUDENT_KEY = "COALESCE(student_id, lower(trim(student_name)))"
+
+# Raw feature columns, in table order (topics are stored as a bit mask, see FeatureStore.topic_bits)
+FEATURE_COLUMNS = {
+    "word_count": "INTEGER",
+    "unique_words": "INTEGER",
+    "grammar_available": "INTEGER",
+    "error_count": "INTEGER",
+    "grammar_rules": "TEXT",
+    "filler_count": "INTEGER",
+    "filler_rate": "REAL",
+    "ttr": "REAL",
+    "compound": "REAL",
+    "wpm": "REAL",
+    "audio_duration": "REAL",
+    "topic_mask": "INTEGER",
+    "salutation_type": "TEXT",
+    "flow_salutation": "INTEGER",
+    "flow_name": "INTEGER",
+    "flow_details": "INTEGER",
+    "flow_closing": "INTEGER",
+    "semantic_overall": "REAL",
+    "semantic_similarities": "TEXT"
+}
+
+# Feature columns with an index, so range queries on them (e.g. wpm above 200) read only the matches
+RANGE_COLUMNS = ("wpm", "word_count", "topic_mask")
+
+# Submission details returned by rankings and range queries
+RANKING_COLUMNS = ["id", "submission_id", "student_id", "student_name", "cohort", "source", "created_at"]
+
+def _cohort_condition(cohorts):
+    # SQL condition on f.cohort; '' stands for submissions without a cohort (NULL), as in the aggregates
+    names = [name for name in cohorts if name]
+    conditions = [f"f.cohort IN ({', '.join('?' * len(names))})"] if names else []
+    if len(names) < len(cohorts):
+        conditions.append("f.cohort IS NULL")
+    return (f"({' OR '.join(conditions)})" if conditions else "0"), names
+
+def text_hash(text):
+    """SHA-256 of the cleaned text, as stored in features.text_hash"""
+    return hashlib.sha256(clean_text(text).encode("utf-8")).hexdigest()
+
+def _computed(results, key):
+    value = results.get(key)
+    if isinstance(value, dict) and is_computed(value):
+        return value
+    return None
+
+def _rule_id(match):
+    return match.get("rule_id") if isinstance(match, dict) else match.rule_id
+
+def extract_features(text, results, audio_duration=None):
+    """
+    Pull the raw, rubric-independent features out of an evaluation.
+
+    Features of analyzers that did not run are None; grammar_available is 0 when the grammar
+    analyzer ran without LanguageTool. Topic hits are returned as a list of topic names,
+    'minhash' holds the text's MinHash signature for near-duplicate detection and 'tokens'
+    its words for the search index.
+
+    Args:
+        text: The evaluated text
+        results: EvaluationResult, or its result_to_dict form
+        audio_duration: Audio duration in minutes, if the text came from a recording
+
+    Returns:
+        dict of feature name -> value
+    """
+    words = tokenize_text(text)
+    features = dict.fromkeys(FEATURE_COLUMNS)
+    features.update(word_count=len(words), unique_words=len(set(words)), audio_duration=audio_duration,
+                    text_hash=text_hash(text))
+    signature = minhash_signature(words)
+    features["minhash"] = signature.tolist() if signature is not None else None
+    features["tokens"] = words
+
+    grammar = _computed(results, "grammar")
+    if grammar is not None:
+        features["grammar_available"] = int(grammar.get("available", True))
+    if features["grammar_available"]:
+        features["error_count"] = grammar["count"]
+        features["grammar_rules"] = [_rule_id(m) for m in grammar.get("matches", [])]
+
+    filler = _computed(results, "filler")
+    if filler is not None:
+        features["filler_count"] = filler["count"]
+        features["filler_rate"] = filler["rate"]
+
+    vocabulary = _computed(results, "vocabulary")
+    if vocabulary is not None:
+        features["ttr"] = vocabulary["ttr"]
+
+    sentiment = _computed(results, "sentiment")
+    if sentiment is not None:
+        features["compound"] = sentiment["scores"]["compound"]
+
+    speech_rate = _computed(results, "speech_rate")
+    if speech_rate is not None:
+        features["wpm"] = speech_rate["wpm"]
+
+    keywords = _computed(results, "keywords")
+    features["topics"] = ([topic for topic, found in keywords["topics"].items() if found]
+                          if keywords is not None else None)
+
+    salutation = _computed(results, "salutation")
+    if salutation is not None:
+        features["salutation_type"] = salutation["type"]
+
+    flow = _computed(results, "flow")
+    if flow is not None:
+        for section in FLOW_SECTIONS:
+            features[f"flow_{section.lower()}"] = flow["indices"][section]
+
+    semantic = _computed(results, "semantic")
+    if semantic is not None:
+        features["semantic_overall"] = semantic["overall_score"]
+        features["semantic_similarities"] = [s["score"] for s in semantic["sentences"]]
+    return features
+
+def scores_from_results(results):
+    """Category scores of an evaluation as column -> score (None where not computed)"""
+    scores = {column: (results[column]["score"] if _computed(results, column) else None)
+              for column in SCORE_COLUMNS}
+    scores["total"] = sum(score for score in scores.values() if score is not None)
+    return scores
+
+class FeatureStore:
+    """SQLite tables of raw features (one row per submission) and of scores per rubric"""
+
+    def __init__(self, path=None):
+        self.path = path or config.FEATURE_STORE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        feature_columns = ", ".join(f"{name} {kind}" for name, kind in FEATURE_COLUMNS.items())
+        score_columns = ", ".join(f"{name} INTEGER" for name in SCORE_COLUMNS + ["total"])
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS features (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                submission_id TEXT UNIQUE, student_id TEXT, student_name TEXT, cohort TEXT, source TEXT,
+                created_at REAL NOT NULL, text_hash TEXT, {feature_columns});
+            CREATE INDEX IF NOT EXISTS features_cohort ON features (cohort);
+            CREATE INDEX IF NOT EXISTS features_student ON features ({STUDENT_KEY}, created_at)
+                WHERE {STUDENT_KEY} IS NOT NULL;
+            CREATE TABLE IF NOT EXISTS topics (name TEXT PRIMARY KEY, bit INTEGER UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS rubrics (
+                fingerprint TEXT PRIMARY KEY, definition TEXT NOT NULL, created_at REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS scores (
+                feature_id INTEGER NOT NULL REFERENCES features (id) ON DELETE CASCADE,
+                rubric TEXT NOT NULL, {score_columns},
+                PRIMARY KEY (feature_id, rubric));
+            CREATE TABLE IF NOT EXISTS cohort_counts (
+                cohort TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL,
+                PRIMARY KEY (cohort, kind, key));
+            CREATE TABLE IF NOT EXISTS cohort_scores (
+                cohort TEXT NOT NULL, rubric TEXT NOT NULL, category TEXT NOT NULL, score INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (cohort, rubric, category, score));
+        """)
+        # Rankings walk these in score order instead of sorting every stored submission
+        for name in SCORE_COLUMNS + ["total"]:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS scores_{name} ON scores (rubric, {name})")
+        for name in RANGE_COLUMNS:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS features_{name} ON features ({name})")
+        self._db.commit()
+        self._topic_bits = dict(self._db.execute("SELECT name, bit FROM topics"))
+        if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM cohort_counts) AND "
+                            "EXISTS (SELECT 1 FROM features)").fetchone()[0]:
+            self.rebuild_aggregates()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def topic_bits(self):
+        """Topic name -> bit position in topic_mask"""
+        with self._lock:
+            return dict(self._topic_bits)
+
+    def _topic_mask(self, topics):
+        mask = 0
+        for topic in topics:
+            bit = self._topic_bits.get(topic)
+            if bit is None:
+                # Allocated in one statement so concurrent writers never hand out the same bit twice
+                self._db.execute("INSERT OR IGNORE INTO topics (name, bit) "
+                                 "SELECT ?, COALESCE(MAX(bit) + 1, 0) FROM topics", (topic,))
+                bit = self._db.execute("SELECT bit FROM topics WHERE name = ?", (topic,)).fetchone()[0]
+                if bit >= 63:
+                    raise ValueError("The feature store supports at most 63 distinct topics")
+                self._topic_bits[topic] = bit
+            mask |= 1 << bit
+        return mask
+
+    def _save_rubric(self, rubric):
+        self._db.execute(
+            "INSERT OR IGNORE INTO rubrics (fingerprint, definition, created_at) VALUES (?, ?, ?)",
+            (rubric.fingerprint, json.dumps(rubric.definition, sort_keys=True), time.time())
+        )
+
+    def record(self, features, scores=None, rubric=None, submission_id=None, student_id=None, student_name=None,
+               cohort=None, source=None):
+        """
+        Store one evaluation. A submission_id seen before replaces that submission's row
+        (and drops its old scores).
+
+        Args:
+            features: extract_features() output
+            scores: scores_from_results() output, stored under rubric
+            rubric: Rubric the scores were computed with (defaults to the config rubric)
+
+        Returns:
+            Row id of the submission
+        """
+        rubric = rubric or get_rubric()
+        row = {name: features.get(name) for name in FEATURE_COLUMNS}
+        for name in ("grammar_rules", "semantic_similarities"):
+            if row[name] is not None:
+                row[name] = json.dumps(row[name])
+        row.update(submission_id=submission_id, student_id=student_id, student_name=student_name, cohort=cohort,
+                   source=source, created_at=time.time(), text_hash=features.get("text_hash"))
+
+        with self._lock:
+            if features.get("topics") is not None:
+                row["topic_mask"] = self._topic_mask(features["topics"])
+            if submission_id is not None:
+                self._forget_aggregates(submission_id)
+            columns = list(row)
+            updates = ", ".join(f"{name} = excluded.{name}" for name in columns if name != "submission_id")
+            cursor = self._db.execute(
+                f"INSERT INTO features ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (submission_id) DO UPDATE SET {updates}",
+                [row[name] for name in columns]
+            )
+            if submission_id is None:
+                feature_id = cursor.lastrowid
+            else:
+                feature_id = self._db.execute(
+                    "SELECT id FROM features WHERE submission_id = ?", (submission_id,)
+                ).fetchone()[0]
+                self._db.execute("DELETE FROM scores WHERE feature_id = ?", (feature_id,))
+            if scores is not None:
+                self._save_rubric(rubric)
+                self._insert_scores([feature_id], {name: [scores.get(name)] for name in SCORE_COLUMNS + ["total"]},
+                                    rubric.fingerprint)
+            self._count(cohort, row["topic_mask"], row["grammar_available"], row["grammar_rules"],
+                        {rubric.fingerprint: scores} if scores is not None else {}, 1)
+            self._db.commit()
+        return feature_id
+
+    def _count(self, cohort, topic_mask, grammar_available, grammar_rules, scores, sign):
+        # Add (sign=1) or remove (sign=-1) one submission from its cohort's aggregates
+        cohort = cohort or ""
+        keys = [("rows", "submissions")]
+        if topic_mask is not None:
+            keys.append(("rows", "topics"))
+            keys += [("topic", topic) for topic, bit in self._topic_bits.items() if topic_mask >> bit & 1]
+        if grammar_available:
+            keys.append(("rows", "grammar"))
+            keys += [("rule", rule) for rule in json.loads(grammar_rules or "[]")]
+        self._db.executemany(
+            "INSERT INTO cohort_counts (cohort, kind, key, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (cohort, kind, key) DO UPDATE SET count = count + excluded.count",
+            [(cohort, kind, key, sign) for kind, key in keys]
+        )
+        self._db.executemany(
+            "INSERT INTO cohort_scores (cohort, rubric, category, score, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (cohort, rubric, category, score) DO UPDATE SET count = count + excluded.count",
+            [(cohort, fingerprint, category, int(table[category]), sign)
+             for fingerprint, table in scores.items() for category in SCORE_COLUMNS + ["total"]
+             if table.get(category) is not None]
+        )
+
+    def _forget_aggregates(self, submission_id):
+        # A resubmitted id replaces its old row, so the old row leaves the aggregates first
+        old = self._db.execute(
+            "SELECT id, cohort, topic_mask, grammar_available, grammar_rules FROM features WHERE submission_id = ?",
+            (submission_id,)
+        ).fetchone()
+        if old is None:
+            return
+        columns = SCORE_COLUMNS + ["total"]
+        scores = {row[0]: dict(zip(columns, row[1:])) for row in self._db.execute(
+            f"SELECT rubric, {', '.join(columns)} FROM scores WHERE feature_id = ?", (old[0],))}
+        self._count(old[1], old[2], old[3], old[4], scores, -1)
+
+    def rebuild_aggregates(self):
+        """Recompute every cohort aggregate from the features and scores tables"""
+        with self._lock:
+            self._db.execute("DELETE FROM cohort_counts")
+            self._db.execute(
+                "INSERT INTO cohort_counts (cohort, kind, key, count) "
+                "SELECT COALESCE(cohort, ''), 'rows', 'submissions', COUNT(*) FROM features GROUP BY 1 UNION ALL "
+                "SELECT COALESCE(cohort, ''), 'rows', 'topics', COUNT(*) FROM features "
+                "WHERE topic_mask IS NOT NULL GROUP BY 1 UNION ALL "
+                "SELECT COALESCE(cohort, ''), 'rows', 'grammar', COUNT(*) FROM features "
+                "WHERE grammar_available = 1 GROUP BY 1"
+            )
+            for topic, bit in self._topic_bits.items():
+                self._db.execute(
+                    "INSERT INTO cohort_counts (cohort, kind, key, count) "
+                    "SELECT COALESCE(cohort, ''), 'topic', ?, COUNT(*) FROM features "
+                    "WHERE (topic_mask >> ?) & 1 GROUP BY 1", (topic, bit)
+                )
+            self._db.execute(
+                "INSERT INTO cohort_counts (cohort, kind, key, count) "
+                "SELECT COALESCE(f.cohort, ''), 'rule', r.value, COUNT(*) FROM features f, json_each(f.grammar_rules) r "
+                "WHERE f.grammar_available = 1 GROUP BY 1, 3"
+            )
+            self._rebuild_score_aggregates()
+            self._db.commit()
+
+    def _rebuild_score_aggregates(self, rubric=None):
+        if rubric is None:
+            self._db.execute("DELETE FROM cohort_scores")
+        else:
+            self._db.execute("DELETE FROM cohort_scores WHERE rubric = ?", (rubric,))
+        for category in SCORE_COLUMNS + ["total"]:
+            self._db.execute(
+                "INSERT INTO cohort_scores (cohort, rubric, category, score, count) "
+                f"SELECT COALESCE(f.cohort, ''), s.rubric, ?, s.{category}, COUNT(*) "
+                "FROM scores s JOIN features f ON f.id = s.feature_id "
+                f"WHERE s.{category} IS NOT NULL AND (? IS NULL OR s.rubric = ?) GROUP BY 1, 2, 4",
+                (category, rubric, rubric)
+            )
+
+    def _insert_scores(self, feature_ids, scores, fingerprint):
+        columns = SCORE_COLUMNS + ["total"]
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO scores (feature_id, rubric, {', '.join(columns)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(columns))})",
+            zip(feature_ids, [fingerprint] * len(feature_ids), *(scores[name] for name in columns))
+        )
+
+    def save_scores(self, feature_ids, scores, rubric):
+        """
+        Store scores for many submissions under one rubric.
+
+        Args:
+            feature_ids: Row ids
+            scores: column -> sequence of scores, aligned with feature_ids
+            rubric: Rubric the scores were computed with
+        """
+        with self._lock:
+            self._save_rubric(rubric)
+            self._insert_scores([int(i) for i in feature_ids],
+                                {name: [None if v is None else int(v) for v in values]
+                                 for name, values in scores.items()}, rubric.fingerprint)
+            # Bulk writes replace rows wholesale, so the rubric's histograms are recounted in SQL
+            self._rebuild_score_aggregates(rubric.fingerprint)
+            self._db.commit()
+
+    def set_semantic(self, feature_id, overall, similarities):
+        """Attach semantic similarities computed after the submission was stored"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE features SET semantic_overall = ?, semantic_similarities = ? WHERE id = ?",
+                (overall, json.dumps(similarities), feature_id)
+            )
+            self._db.commit()
+
+    def fetch_columns(self, columns, cohort=None):
+        """
+        Read feature columns of every stored submission (optionally one cohort).
+
+        Returns:
+            dict of column -> list of values, plus 'id'
+        """
+        names = ["id"] + list(columns)
+        query = f"SELECT {', '.join(names)} FROM features"
+        params = ()
+        if cohort is not None:
+            query += " WHERE cohort = ?"
+            params = (cohort,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY id", params).fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: list(column) for name, column in zip(names, values)}
+
+    def iter_rows(self, rubric, cohort=None, batch_rows=4096):
+        """
+        Yield stored submissions as lists of up to batch_rows dicts: row id, metadata, raw feature
+        columns (JSON columns still encoded) and their scores under the rubric fingerprint
+        (None where they were never scored under it).
+        """
+        names = ["id", "submission_id", "student_id", "student_name", "cohort", "source", "created_at"] + \
+            list(FEATURE_COLUMNS)
+        columns = [f"f.{name}" for name in names] + [f"s.{name}" for name in SCORE_COLUMNS + ["total"]]
+        query = (f"SELECT {', '.join(columns)} FROM features f "
+                 "LEFT JOIN scores s ON s.feature_id = f.id AND s.rubric = ?")
+        params = [rubric]
+        if cohort is not None:
+            query += " WHERE f.cohort = ?"
+            params.append(cohort)
+        names += SCORE_COLUMNS + ["total"]
+        with self._lock:
+            cursor = self._db.execute(query + " ORDER BY f.id", params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                return
+            yield [dict(zip(names, row)) for row in rows]
+
+    def cohorts(self):
+        """Cohort name -> stored submissions ('' collects submissions without a cohort)"""
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT cohort, count FROM cohort_counts WHERE kind = 'rows' AND key = 'submissions' "
+                "AND count > 0 ORDER BY cohort"
+            ))
+
+    def cohort_aggregates(self, rubric, cohorts=None):
+        """
+        Read the precomputed aggregates of some cohorts (all of them by default), summed.
+
+        Args:
+            rubric: Rubric fingerprint of the score histograms
+            cohorts: Cohort names ('' for submissions without a cohort)
+
+        Returns:
+            dict with 'rows' (submissions / topics / grammar row counts), 'topics' and 'rules'
+            (key -> count) and 'scores' (category -> {score: count})
+        """
+        where, params = "", []
+        if cohorts is not None:
+            where = f" AND cohort IN ({', '.join('?' * len(cohorts))})"
+            params = list(cohorts)
+        aggregates = {"rows": {}, "topic": {}, "rule": {}, "scores": {}}
+        with self._lock:
+            for kind, key, count in self._db.execute(
+                    f"SELECT kind, key, SUM(count) FROM cohort_counts WHERE count != 0{where} GROUP BY kind, key",
+                    params):
+                aggregates[kind][key] = count
+            for category, score, count in self._db.execute(
+                    f"SELECT category, score, SUM(count) FROM cohort_scores WHERE rubric = ? AND count != 0{where} "
+                    "GROUP BY category, score ORDER BY score", [rubric] + params):
+                aggregates["scores"].setdefault(category, {})[score] = count
+        return {"rows": aggregates["rows"], "topics": aggregates["topic"], "rules": aggregates["rule"],
+                "scores": aggregates["scores"]}
+
+    def history(self, student_id=None, student_name=None, rubric=None, since=None, until=None, limit=None,
+                columns=("word_count", "error_count", "filler_rate", "ttr", "wpm", "topic_mask")):
+        """
+        One student's stored submissions, newest first, read through the student index.
+
+        Args:
+            student_id: Student id (takes precedence over the name)
+            student_name: Student name, matched case-insensitively
+            rubric: Rubric fingerprint of the scores (defaults to the config rubric)
+            since: Only submissions at or after this Unix time
+            until: Only submissions before this Unix time
+            limit: At most this many submissions
+            columns: Feature columns to return with each submission
+
+        Returns:
+            list of dicts with id, created_at, cohort, source, the feature columns and the
+            scores under rubric (None where the submission was never scored under it)
+        """
+        if student_id is None and not (student_name or "").strip():
+            return []
+        rubric = rubric or get_rubric().fingerprint
+        score_columns = SCORE_COLUMNS + ["total"]
+        names = ["id", "created_at", "cohort", "source"] + list(columns) + score_columns
+        query = (f"SELECT {', '.join(f'f.{name}' for name in names[:-len(score_columns)])}, "
+                 f"{', '.join(f's.{name}' for name in score_columns)} "
+                 "FROM features f LEFT JOIN scores s ON s.feature_id = f.id AND s.rubric = ? "
+                 f"WHERE {STUDENT_KEY} = COALESCE(?, lower(trim(?))) "
+                 "AND f.created_at >= ? AND f.created_at < ? ORDER BY f.created_at DESC")
+        params = [rubric, student_id, student_name, since if since is not None else float("-inf"),
+                  until if until is not None else float("inf")]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [dict(zip(names, row)) for row in rows]
+
+    def _ranked(self, query, params, extra):
+        names = RANKING_COLUMNS + extra
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [dict(zip(names, row)) for row in rows]
+
+    def top_scores(self, category="total", n=10, rubric=None, cohorts=None, bottom=False):
+        """
+        Highest (or with bottom, lowest) scored submissions in one category, read in order
+        from the category's score index.
+
+        Args:
+            category: Score column or 'total'
+            n: Submissions returned
+            rubric: Rubric fingerprint of the scores (defaults to the config rubric)
+            cohorts: Cohort names to rank within ('' for submissions without a cohort)
+            bottom: Lowest scores first instead of highest
+
+        Returns:
+            list of dicts with the submission's details, its 'score' and 'total'
+        """
+        if category not in SCORE_COLUMNS + ["total"]:
+            raise ValueError(f"Unknown score category '{category}'")
+        where, params = "", [rubric or get_rubric().fingerprint]
+        if cohorts is not None:
+            condition, names = _cohort_condition(cohorts)
+            where = f" AND {condition}"
+            params += names
+        query = (f"SELECT {', '.join(f'f.{name}' for name in RANKING_COLUMNS)}, s.{category}, s.total "
+                 "FROM scores s JOIN features f ON f.id = s.feature_id "
+                 f"WHERE s.rubric = ? AND s.{category} IS NOT NULL{where} "
+                 f"ORDER BY s.{category} {'ASC' if bottom else 'DESC'} LIMIT ?")
+        return self._ranked(query, params + [n], ["score", "total"])
+
+    def _range_where(self, column, low, high, strict, cohorts, require=()):
+        for name in (column,) + tuple(require):
+            if name not in FEATURE_COLUMNS:
+                raise ValueError(f"Unknown feature column '{name}'")
+        conditions, params = [f"f.{name} IS NOT NULL" for name in (column,) + tuple(require)], []
+        if low is not None:
+            conditions.append(f"f.{column} {'>' if strict else '>='} ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"f.{column} {'<' if strict else '<='} ?")
+            params.append(high)
+        if cohorts is not None:
+            condition, names = _cohort_condition(cohorts)
+            conditions.append(condition)
+            params += names
+        return " AND ".join(conditions), params
+
+    def feature_range(self, column, low=None, high=None, strict=False, rubric=None, cohorts=None, limit=100,
+                      require=()):
+        """
+        Submissions whose feature column lies between low and high (either may be None),
+        largest values first. Columns in RANGE_COLUMNS are read through their index.
+
+        Args:
+            column: Feature column, e.g. 'wpm'
+            low, high: Bounds, included unless strict
+            strict: Exclude values equal to a bound
+            rubric: Rubric fingerprint of the total score returned (defaults to the config rubric)
+            cohorts: Cohort names to search ('' for submissions without a cohort)
+            limit: Submissions returned
+            require: Other feature columns that must be set, e.g. audio_duration so that wpm
+                is a measured speaking rate rather than a text-only estimate
+
+        Returns:
+            list of dicts with the submission's details, its 'value' and 'total'
+        """
+        where, params = self._range_where(column, low, high, strict, cohorts, require)
+        query = (f"SELECT {', '.join(f'f.{name}' for name in RANKING_COLUMNS)}, f.{column}, s.total "
+                 "FROM features f LEFT JOIN scores s ON s.feature_id = f.id AND s.rubric = ? "
+                 f"WHERE {where} ORDER BY f.{column} DESC LIMIT ?")
+        return self._ranked(query, [rubric or get_rubric().fingerprint] + params + [limit], ["value", "total"])
+
+    def count_range(self, column, low=None, high=None, strict=False, cohorts=None, require=()):
+        """Number of submissions feature_range would return without a limit"""
+        where, params = self._range_where(column, low, high, strict, cohorts, require)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM features f WHERE {where}", params).fetchone()[0]
+
+    def has_submission(self, submission_id):
+        """Whether a row with this submission_id is already stored"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM features WHERE submission_id = ?", (submission_id,)).fetchone() is not None
+
+    def count(self, cohort=None):
+        with self._lock:
+            if cohort is None:
+                return self._db.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM features WHERE cohort = ?", (cohort,)).fetchone()[0]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_feature_store():
+    """Process-wide feature store backed by config.FEATURE_STORE_PATH"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FeatureStore()
+        return _store
+
+def is_new_submission(submission_id):
+    """
+    Whether storing submission_id adds a submission rather than replacing a stored one.
+    Submissions without an id are always new.
+    """
+    if submission_id is None or not config.FEATURE_STORE_ENABLED:
+        return True
+    return not get_feature_store().has_submission(submission_id)
+
+def record_evaluation(text, results, audio_duration=None, features=None, rank=True, **metadata):
+    """
+    Store an evaluation's features and scores in the shared feature store, and (with rank)
+    set result.percentiles against the submission's cohort and add it to the cohort sketches.
+    A resubmitted submission_id replaces its row but is not added to the sketches again, as a
+    sketch cannot drop the earlier value.
+    When the features carry a MinHash signature, result.near_duplicates is set too, and their
+    tokens are added to the search index.
+
+    Does nothing (and returns None) when the store is turned off with AIE_FEATURE_STORE=0.
+
+    Args:
+        text: The evaluated text
+        results: EvaluationResult, or its result_to_dict form
+        audio_duration: Audio duration in minutes
+        features: Precomputed extract_features() output (e.g. from a worker process)
+        rank: Rank the evaluation with src.store.percentiles
+        metadata: submission_id, student_id, student_name, cohort, source
+
+    Returns:
+        Row id of the stored submission, or None
+    """
+    if not config.FEATURE_STORE_ENABLED:
+        return None
+    if features is None:
+        features = extract_features(text, results, audio_duration)
+    store = get_feature_store()
+    new = is_new_submission(metadata.get("submission_id"))
+    feature_id = store.record(features, scores_from_results(results), **metadata)
+    if rank:
+        from src.store.percentiles import rank_evaluation
+        rank_evaluation(results, metadata.get("cohort"), add=new)
+    flag_near_duplicates(feature_id, features.get("minhash"), results, student_id=metadata.get("student_id"),
+                         student_name=metadata.get("student_name"))
+    index_submission(feature_id, features.get("tokens"))
+    return feature_id
@@ -0,0 +1,34 @@
+"""
+Student History Module
+Per-student progress across stored attempts: score trend and changes since the previous attempt
+"""
+
+from src.store.features import SCORE_COLUMNS
+
+def student_progress(store, student_id=None, student_name=None, limit=50, rubric=None):
+    """
+    A student's recent attempts and how the latest one compares with the one before it.
+
+    Args:
+        store: FeatureStore
+        student_id: Student id (takes precedence over the name)
+        student_name: Student name, matched case-insensitively
+        limit: Most recent attempts to include
+        rubric: Rubric fingerprint of the scores (defaults to the config rubric)
+
+    Returns:
+        dict with 'attempts' (oldest first), 'latest', 'previous' (None for a first attempt)
+        and 'deltas' (score column -> latest minus previous, None where either is missing)
+    """
+    attempts = list(reversed(store.history(student_id=student_id, student_name=student_name, rubric=rubric,
+                                           limit=limit)))
+    latest = attempts[-1] if attempts else None
+    previous = attempts[-2] if len(attempts) > 1 else None
+    deltas = {}
+    if previous is not None:
+        for column in SCORE_COLUMNS + ["total"]:
+            if latest[column] is not None and previous[column] is not None:
+                deltas[column] = latest[column] - previous[column]
+            else:
+                deltas[column] = None
+    return {"attempts": attempts, "latest": latest, "previous": previous, "deltas": deltas}
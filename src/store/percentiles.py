@@ -0,0 +1,171 @@
+"""
+Percentiles Module
+Per-cohort KLL sketches of every score category, persisted next to the feature store, so a
+report can say where a submission stands in its class without scanning past results
+"""
+
+import json
+import sqlite3
+import threading
+
+from src import config
+from src.store.features import SCORE_COLUMNS, scores_from_results
+from src.utils.rubric import get_rubric
+from src.utils.sketch import KLLSketch
+
+PERCENTILE_METRICS = SCORE_COLUMNS + ["total"]
+
+# Sketch key of the population across every cohort
+ALL_COHORTS = "*"
+
+def metric_values(results):
+    """Score of every percentile metric in an evaluation (None where not computed)"""
+    return scores_from_results(results)
+
+class CohortSketches:
+    """In-memory sketches keyed by (cohort, metric), e.g. one batch chunk's worth of evaluations"""
+
+    def __init__(self, sketches=None):
+        self.sketches = dict(sketches or {})
+
+    def add(self, values, cohort=None):
+        """Add one evaluation's metric values to its cohort and to the all-cohorts population"""
+        for key in {cohort or "", ALL_COHORTS}:
+            for metric in PERCENTILE_METRICS:
+                if values.get(metric) is not None:
+                    self.sketches.setdefault((key, metric), KLLSketch()).update(values[metric])
+
+    def to_list(self):
+        """JSON-ready form, for sending across processes"""
+        return [[cohort, metric, sketch.to_dict()] for (cohort, metric), sketch in self.sketches.items()]
+
+    @classmethod
+    def from_list(cls, items):
+        return cls({(cohort, metric): KLLSketch.from_dict(data) for cohort, metric, data in items})
+
+class PercentileIndex:
+    """
+    SQLite table of serialized sketches per (cohort, rubric, metric).
+
+    Writes read the stored sketch, merge into it and write it back in one transaction, so
+    several processes (the app, CLI runs, a batch parent) can share the file. Reads keep
+    parsed sketches in memory and only re-read those whose version changed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.FEATURE_STORE_PATH
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sketches ("
+            " cohort TEXT NOT NULL, rubric TEXT NOT NULL, metric TEXT NOT NULL, version INTEGER NOT NULL,"
+            " count INTEGER NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (cohort, rubric, metric))"
+        )
+        # (cohort, rubric, metric) -> (version, KLLSketch)
+        self._cache = {}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _load(self, cohort, rubric):
+        versions = dict(self._db.execute(
+            "SELECT metric, version FROM sketches WHERE cohort = ? AND rubric = ?", (cohort, rubric)))
+        stale = [metric for metric, version in versions.items()
+                 if self._cache.get((cohort, rubric, metric), (None,))[0] != version]
+        for metric in stale:
+            version, payload = self._db.execute(
+                "SELECT version, payload FROM sketches WHERE cohort = ? AND rubric = ? AND metric = ?",
+                (cohort, rubric, metric)).fetchone()
+            self._cache[(cohort, rubric, metric)] = (version, KLLSketch.from_dict(json.loads(payload)))
+        return {metric: self._cache[(cohort, rubric, metric)][1] for metric in versions}
+
+    def percentiles(self, values, cohort=None, rubric=None):
+        """
+        Percentile of each metric value within a cohort (or among all submissions when
+        cohort is None). Metrics without values or without a sketch yet map to None.
+        """
+        rubric = rubric or get_rubric().fingerprint
+        with self._lock:
+            sketches = self._load(cohort or ALL_COHORTS, rubric)
+        return {metric: (sketches[metric].percentile(values[metric])
+                         if values.get(metric) is not None and metric in sketches else None)
+                for metric in PERCENTILE_METRICS}
+
+    def merge(self, partial, rubric=None):
+        """Fold a CohortSketches (e.g. from a batch worker) into the stored sketches"""
+        rubric = rubric or get_rubric().fingerprint
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for (cohort, metric), sketch in partial.sketches.items():
+                    row = self._db.execute(
+                        "SELECT version, payload FROM sketches WHERE cohort = ? AND rubric = ? AND metric = ?",
+                        (cohort, rubric, metric)).fetchone()
+                    version = 0
+                    if row is not None:
+                        version = row[0]
+                        sketch = KLLSketch.from_dict(json.loads(row[1])).merge(sketch)
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO sketches (cohort, rubric, metric, version, count, payload) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (cohort, rubric, metric, version + 1, sketch.count, json.dumps(sketch.to_dict()))
+                    )
+                    self._cache[(cohort, rubric, metric)] = (version + 1, sketch)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def rank(self, values, cohort=None, rubric=None):
+        """
+        Percentiles of an evaluation against the classmates evaluated before it,
+        then add it to the sketches.
+        """
+        percentiles = self.percentiles(values, cohort, rubric)
+        partial = CohortSketches()
+        partial.add(values, cohort)
+        self.merge(partial, rubric)
+        return percentiles
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_percentile_index():
+    """Process-wide percentile index in the feature store's SQLite file"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from src.store.features import get_feature_store
+            # The feature store creates the directory and file
+            _index = PercentileIndex(get_feature_store().path)
+        return _index
+
+def rank_evaluation(results, cohort=None, add=True):
+    """
+    Percentile of each score of an evaluation within its cohort, attached to the result
+    as result.percentiles when it is an EvaluationResult.
+
+    Args:
+        results: EvaluationResult, or its result_to_dict form
+        cohort: Cohort to rank within (None ranks among all submissions)
+        add: Add the evaluation to the sketches afterwards (batch runs merge worker sketches instead)
+
+    Returns:
+        dict of metric -> percentile (None where unknown), or {} when the feature store is off
+    """
+    if not config.FEATURE_STORE_ENABLED:
+        return {}
+    index = get_percentile_index()
+    values = metric_values(results)
+    percentiles = index.rank(values, cohort) if add else index.percentiles(values, cohort)
+    if hasattr(results, "percentiles"):
+        results.percentiles = percentiles
+    return percentiles
+
+def ordinal(percentile):
+    """'72nd' style label of a percentile, kept within 1st to 99th"""
+    value = min(max(int(round(percentile)), 1), 99)
+    suffix = "th" if 10 <= value % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(value % 10, "th")
+    return f"{value}{suffix}"
@@ -0,0 +1,120 @@
+"""
+Rankings Module
+Top and bottom submissions per class on every score category, and outliers found by feature
+range, for end-of-term reviews; read from indexes or in one streamed pass, never all at once
+"""
+
+import heapq
+
+from src.store.features import SCORE_COLUMNS
+from src.utils.rubric import get_rubric
+
+RANKING_CATEGORIES = ["total"] + SCORE_COLUMNS
+
+# Outlier name -> feature range (see FeatureStore.feature_range). Text-only submissions have no
+# audio and their wpm assumes one minute of speech, so speaking rates require an audio duration.
+OUTLIERS = {
+    "fast_speech": {"label": "Speaking faster than 200 WPM", "column": "wpm", "low": 200, "strict": True,
+                    "require": ("audio_duration",)},
+    "no_topics": {"label": "No keyword topics found", "column": "topic_mask", "low": 0, "high": 0},
+    "very_short": {"label": "Fewer than 30 words", "column": "word_count", "high": 30, "strict": True}
+}
+
+class TopK:
+    """The n items with the largest keys pushed so far, kept in a size-n min-heap"""
+
+    def __init__(self, n):
+        self.n = n
+        self.heap = []
+        self._pushed = 0
+
+    def accepts(self, key):
+        """Whether an item with this key would be kept (cheap to check before building the item)"""
+        return len(self.heap) < self.n or key > self.heap[0][0]
+
+    def push(self, key, item):
+        # The push counter breaks ties (the earlier item stays) and keeps items out of comparisons
+        entry = (key, -self._pushed, item)
+        self._pushed += 1
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def items(self):
+        """Items by key, largest first"""
+        return [item for _, _, item in sorted(self.heap, reverse=True)]
+
+def top_and_bottom(store, n=5, cohorts=None, categories=None, rubric=None):
+    """
+    Top and bottom n submissions of some cohorts (every cohort by default) in each category,
+    each list read from the category's score index.
+
+    Returns:
+        dict of category -> {'top': [...], 'bottom': [...]} (see FeatureStore.top_scores)
+    """
+    fingerprint = (rubric or get_rubric()).fingerprint
+    return {category: {"top": store.top_scores(category, n, fingerprint, cohorts),
+                       "bottom": store.top_scores(category, n, fingerprint, cohorts, bottom=True)}
+            for category in categories or RANKING_CATEGORIES}
+
+def term_review(store, n=5, cohort=None, categories=None, rubric=None):
+    """
+    Top and bottom n submissions of every cohort in each category, from a single streamed pass
+    over the stored submissions with two bounded heaps per cohort and category.
+
+    Args:
+        store: FeatureStore
+        n: Submissions per list
+        cohort: Only review this cohort
+        categories: Score categories (defaults to the total and every sub-score)
+        rubric: Rubric of the scores (defaults to the config rubric)
+
+    Returns:
+        dict of cohort ('' for no cohort) -> category -> {'top': [...], 'bottom': [...]}, each
+        entry a dict with id, submission_id, student_name, created_at, 'score' and 'total'
+    """
+    categories = categories or RANKING_CATEGORIES
+    fingerprint = (rubric or get_rubric()).fingerprint
+    heaps = {}
+    for rows in store.iter_rows(fingerprint, cohort=cohort):
+        for row in rows:
+            group = heaps.setdefault(row["cohort"] or "", {})
+            for category in categories:
+                score = row[category]
+                if score is None:
+                    continue
+                if category not in group:
+                    group[category] = (TopK(n), TopK(n))
+                top, bottom = group[category]
+                # Most rows make neither list once the heaps are full
+                if top.accepts(score) or bottom.accepts(-score):
+                    item = {"id": row["id"], "submission_id": row["submission_id"],
+                            "student_name": row["student_name"], "created_at": row["created_at"],
+                            "score": score, "total": row["total"]}
+                    top.push(score, item)
+                    bottom.push(-score, item)
+    return {name: {category: {"top": top.items(), "bottom": bottom.items()}
+                   for category, (top, bottom) in group.items()}
+            for name, group in sorted(heaps.items())}
+
+def find_outliers(store, cohorts=None, rubric=None, limit=50):
+    """
+    Submissions in each OUTLIERS range.
+
+    Returns:
+        dict of outlier name -> {'label', 'count', 'rows' (up to limit, see FeatureStore.feature_range)}
+    """
+    fingerprint = (rubric or get_rubric()).fingerprint
+    found = {}
+    for name, outlier in OUTLIERS.items():
+        bounds = {key: outlier.get(key) for key in ("low", "high")}
+        bounds["strict"] = outlier.get("strict", False)
+        bounds["require"] = outlier.get("require", ())
+        found[name] = {
+            "label": outlier["label"],
+            "count": store.count_range(outlier["column"], cohorts=cohorts, **bounds),
+            "rows": store.feature_range(outlier["column"], rubric=fingerprint, cohorts=cohorts, limit=limit,
+                                        **bounds)
+        }
+    return found
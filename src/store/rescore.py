@@ -0,0 +1,142 @@
+"""
+Re-scoring Module
+Applies a rubric to the raw features in the feature store with vectorized NumPy scoring,
+without running any analyzer
+"""
+
+import time
+
+import numpy as np
+
+from src.config import KEYWORDS
+from src.store.features import FLOW_SECTIONS, SCORE_COLUMNS
+from src.utils.rubric import get_rubric
+
+FLOW_COLUMNS = [f"flow_{section.lower()}" for section in FLOW_SECTIONS]
+
+RESCORE_COLUMNS = ["word_count", "unique_words", "grammar_available", "error_count", "filler_rate", "ttr", "compound", "wpm",
+                   "topic_mask", "salutation_type"] + FLOW_COLUMNS
+
+# Keyword group of every topic
+TOPIC_GROUPS = {topic: group for group, topics in KEYWORDS.items() for topic in topics}
+
+def _floats(values):
+    # None becomes NaN
+    return np.array(values, dtype=float)
+
+def score_features(columns, topic_bits, rubric=None):
+    """
+    Score raw feature columns under a rubric.
+
+    Args:
+        columns: dict of feature column -> list or array of values (FeatureStore.fetch_columns output)
+        topic_bits: Topic name -> bit position in topic_mask
+        rubric: Rubric to apply (defaults to the config rubric)
+
+    Returns:
+        dict of score column (and 'total') -> float array, NaN where an input was not computed
+    """
+    rubric = rubric or get_rubric()
+    word_count = _floats(columns["word_count"])
+    rows = len(word_count)
+    scores = {}
+
+    # Grammar: without LanguageTool, or for an empty text, the analyzer scores 0
+    available = _floats(columns["grammar_available"])
+    errors = _floats(columns["error_count"])
+    known = (available == 1) & (word_count > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g_index = 1 - np.minimum(errors / word_count * 100 / 10, 1)
+    scores["grammar"] = np.where(np.isnan(available), np.nan,
+                                 np.where(known, rubric.score("grammar", np.where(known, g_index, 0)), 0))
+
+    # Vocabulary: an empty text has a TTR of 0
+    unique = _floats(columns["unique_words"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ttr = np.where(word_count > 0, unique / word_count, 0)
+    scores["vocabulary"] = rubric.score("vocabulary", ttr).astype(float)
+
+    for column, metric, transform in (("filler_rate", "filler", None),
+                                      ("compound", "sentiment", lambda v: np.maximum(v, 0)),
+                                      ("wpm", "speech_rate", None)):
+        values = _floats(columns[column])
+        missing = np.isnan(values)
+        if transform is not None:
+            values = transform(values)
+        scores[metric] = np.where(missing, np.nan, rubric.score(metric, np.where(missing, 0, values)))
+
+    masks = _floats(columns["topic_mask"])
+    missing = np.isnan(masks)
+    masks = np.where(missing, 0, masks).astype(np.int64)
+    keywords = np.zeros(rows)
+    for topic, bit in topic_bits.items():
+        points = rubric.keyword_points.get(TOPIC_GROUPS.get(topic), 0)
+        keywords += ((masks >> bit) & 1) * points
+    scores["keywords"] = np.where(missing, np.nan, keywords)
+
+    salutation_points = rubric.salutation_points
+    scores["salutation"] = _floats([salutation_points.get(level, np.nan) if level is not None else np.nan
+                                    for level in columns["salutation_type"]])
+
+    # Flow: full points when every section is present and they appear in order
+    flow = np.column_stack([_floats(columns[column]) for column in FLOW_COLUMNS]) if rows else np.zeros((0, 4))
+    missing = np.isnan(flow).any(axis=1)
+    complete = (flow >= 0).all(axis=1) & (np.diff(flow, axis=1) >= 0).all(axis=1)
+    scores["flow"] = np.where(missing, np.nan, np.where(complete, rubric.flow_points, 0))
+
+    scores["total"] = np.nansum(np.column_stack([scores[column] for column in SCORE_COLUMNS]), axis=1) \
+        if rows else np.zeros(0)
+    return scores
+
+def _to_ints(values):
+    return [None if np.isnan(v) else int(v) for v in values]
+
+def rescore(store, rubric=None, cohort=None, save=True, baseline=None):
+    """
+    Re-score every stored submission (or one cohort) under rubric.
+
+    Args:
+        store: FeatureStore
+        rubric: Rubric to apply (defaults to the config rubric)
+        cohort: Only re-score this cohort
+        save: Store the new scores under the rubric's fingerprint
+        baseline: Rubric to compare against (defaults to the config rubric)
+
+    Returns:
+        dict with row count, timings, mean scores under both rubrics and how many totals changed
+    """
+    rubric = rubric or get_rubric()
+    baseline = baseline or get_rubric()
+
+    start = time.perf_counter()
+    columns = store.fetch_columns(RESCORE_COLUMNS, cohort=cohort)
+    topic_bits = store.topic_bits()
+    loaded = time.perf_counter()
+
+    scores = score_features(columns, topic_bits, rubric)
+    scored = time.perf_counter()
+    before = score_features(columns, topic_bits, baseline)
+
+    if save and columns["id"]:
+        store.save_scores(columns["id"], {column: _to_ints(values) for column, values in scores.items()}, rubric)
+    saved = time.perf_counter()
+
+    rows = len(columns["id"])
+
+    def means(table):
+        return {column: (float(np.nanmean(table[column])) if rows and not np.isnan(table[column]).all() else None)
+                for column in SCORE_COLUMNS + ["total"]}
+
+    return {
+        "rubric": rubric.fingerprint,
+        "baseline": baseline.fingerprint,
+        "cohort": cohort,
+        "rows": rows,
+        "load_seconds": loaded - start,
+        "score_seconds": scored - loaded,
+        "save_seconds": saved - scored if save else None,
+        "means": means(scores),
+        "baseline_means": means(before),
+        "changed": int(np.count_nonzero(scores["total"] != before["total"])),
+        "saved": bool(save)
+    }
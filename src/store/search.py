@@ -0,0 +1,515 @@
+"""
+Search Module
+Positional inverted index over stored submissions (same words as tokenize_text), with postings kept
+as delta-encoded blocks in the feature store's SQLite file, so term and phrase queries combined with
+feature filters (e.g. topic "Goals" not found) answer without scanning every submission
+"""
+
+import collections
+import operator
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from src import config
+from src.utils.rubric import get_rubric
+from src.utils.text_utils import tokenize_text
+
+# Documents per postings block; appending a document rewrites only its term's last block
+BLOCK_SIZE = 128
+
+# Feature columns usable in filters besides topics (text columns compare as strings)
+FILTER_COLUMNS = ["word_count", "unique_words", "grammar_available", "error_count", "filler_count",
+                  "filler_rate", "ttr", "compound", "wpm", "audio_duration", "flow_salutation", "flow_name",
+                  "flow_details", "flow_closing"]
+TEXT_FILTER_COLUMNS = ["cohort", "salutation_type", "source"]
+
+OPERATORS = {"==": operator.eq, "=": operator.eq, "!=": operator.ne, ">=": operator.ge, "<=": operator.le,
+             ">": operator.gt, "<": operator.lt}
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_PARAMS = 900
+
+# Terms in at least this many documents keep their decoded postings in memory, up to _CACHE_BYTES
+_CACHED_FREQUENCY = 4 * BLOCK_SIZE
+_CACHE_BYTES = 64 << 20
+
+# Phrase matching keys each occurrence as doc * _POSITION_SPAN + position
+_POSITION_SPAN = 1 << 24
+
+# Topic names filters accept, as listed in config.KEYWORDS
+_TOPICS = [topic for topics in config.KEYWORDS.values() for topic in topics]
+
+_WIDTHS = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+
+def pack(values):
+    """Non-negative ints as bytes: a width byte, then the values at the narrowest width that fits"""
+    values = np.asarray(values, dtype=np.int64)
+    largest = int(values.max()) if len(values) else 0
+    width = 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4
+    return bytes([width]) + values.astype(_WIDTHS[width]).tobytes()
+
+def unpack(blob):
+    return np.frombuffer(blob, dtype=_WIDTHS[blob[0]], offset=1).astype(np.int64)
+
+def extend(blob, values):
+    """Append non-negative ints to a pack() blob, widening all of it only when they don't fit"""
+    width = blob[0]
+    if max(values) < 1 << (8 * width):
+        return blob + np.array(values, dtype=_WIDTHS[width]).tobytes()
+    return pack(np.concatenate([unpack(blob), values]))
+
+def position_gaps(positions):
+    """A document's increasing token positions as the first position, then the gap to each next one"""
+    return [positions[0]] + [after - before for before, after in zip(positions, positions[1:])]
+
+def decode_blocks(bases, docs, tfs, positions=None):
+    """
+    Decode consecutive postings blocks of one term together. A block stores its documents
+    as gaps from the block's first document number (so the first gap is 0), each document's
+    term frequency, and each document's positions as position_gaps.
+
+    Args:
+        bases: Each block's first document number
+        docs, tfs: Each block's docs and tfs blobs
+        positions: Each block's positions blob, or None to skip positions
+
+    Returns:
+        (docs, tfs, positions) arrays, positions None when not requested
+    """
+    parts = [unpack(blob) for blob in docs]
+    counts = np.array([len(part) for part in parts], dtype=np.int64)
+    running = np.cumsum(np.concatenate(parts))
+    # Each block's doc deltas start again from its base
+    before = np.concatenate([[0], running[np.cumsum(counts)[:-1] - 1]])
+    docs = running - np.repeat(before - np.asarray(bases, dtype=np.int64), counts)
+    tfs = np.concatenate([unpack(blob) for blob in tfs])
+    if positions is None:
+        return docs, tfs, None
+    running = np.cumsum(np.concatenate([unpack(blob) for blob in positions]))
+    before = np.concatenate([[0], running[np.cumsum(tfs)[:-1] - 1]])
+    return docs, tfs, running - np.repeat(before, tfs)
+
+def intersect_sorted(first, second):
+    """Values of two sorted arrays of unique values that are in both"""
+    if len(first) > len(second):
+        first, second = second, first
+    if not len(first):
+        return first
+    index = np.minimum(np.searchsorted(second, first), len(second) - 1)
+    return first[second[index] == first]
+
+def difference_sorted(first, second):
+    """Values of sorted unique first that are not in sorted second"""
+    if not len(first) or not len(second):
+        return first
+    index = np.minimum(np.searchsorted(second, first), len(second) - 1)
+    return first[second[index] != first]
+
+def parse_query(query):
+    """
+    Split a query into words, quoted phrases and excluded words (prefixed with '-'),
+    tokenized like the stored texts.
+
+    Returns:
+        (terms, phrases, excluded) where phrases are lists of at least two words
+    """
+    terms, phrases, excluded = [], [], []
+    for phrase in re.findall(r'"([^"]*)"', query or ""):
+        words = tokenize_text(phrase)
+        if len(words) > 1:
+            phrases.append(words)
+        else:
+            terms.extend(words)
+    for word in re.sub(r'"[^"]*"', " ", query or "").split():
+        if word.startswith("-"):
+            excluded.extend(tokenize_text(word))
+        else:
+            terms.extend(tokenize_text(word))
+    return list(dict.fromkeys(terms)), phrases, list(dict.fromkeys(excluded))
+
+def parse_filter(expression):
+    """
+    Parse a filter such as 'Goals == false', 'wpm > 200' or 'cohort = 8B' into a
+    (name, operator, value) tuple; the value is converted when the filter is applied.
+    """
+    match = re.match(r"\s*(.+?)\s*(==|!=|>=|<=|=|>|<)\s*(.*?)\s*$", expression)
+    if match is None:
+        raise ValueError(f"Invalid filter '{expression}' (expected NAME OP VALUE, e.g. 'wpm > 200')")
+    name, op, value = match.groups()
+    return name, op, value.strip("'\"")
+
+class SearchIndex:
+    """
+    SQLite tables of indexed documents (one per submission, numbered in indexing order),
+    per-term document frequencies and postings blocks of up to BLOCK_SIZE documents with
+    delta-encoded document numbers, term frequencies and positions.
+
+    Re-indexing a submission (a resubmitted submission_id) gives it a new document number and
+    takes the old one out of its terms' document frequencies; postings of the old one are
+    ignored from then on. Filters run on an in-memory copy of the
+    indexed submissions' feature columns, which each process extends with the documents added
+    since its last query.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.FEATURE_STORE_PATH
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS search_docs (
+                doc INTEGER PRIMARY KEY, feature_id INTEGER UNIQUE NOT NULL);
+            CREATE TABLE IF NOT EXISTS search_terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS search_postings (
+                term TEXT NOT NULL, first_doc INTEGER NOT NULL, last_doc INTEGER NOT NULL, count INTEGER NOT NULL,
+                docs BLOB NOT NULL, tfs BLOB NOT NULL, positions BLOB NOT NULL,
+                PRIMARY KEY (term, first_doc)) WITHOUT ROWID;
+        """)
+        self._columns = None
+        # PRAGMA data_version moves when another connection commits; own commits set _changed
+        self._data_version = None
+        self._changed = False
+        self._cache = collections.OrderedDict()
+        self._cache_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
+
+    def add(self, feature_id, tokens):
+        """Index the tokens of a feature store row (replacing an earlier version) and return its document number"""
+        return self.add_many([(feature_id, tokens)])[0]
+
+    def add_many(self, items):
+        """
+        Index several submissions in one transaction.
+
+        Args:
+            items: (feature_id, tokens) pairs, tokens as returned by tokenize_text
+
+        Returns:
+            list of document numbers
+        """
+        items = list(items)
+        postings = {}
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                doc = self._db.execute("SELECT COALESCE(MAX(doc), 0) FROM search_docs").fetchone()[0]
+                docs, replaced = [], []
+                for feature_id, tokens in items:
+                    doc += 1
+                    old = self._db.execute("SELECT doc FROM search_docs WHERE feature_id = ?",
+                                           (feature_id,)).fetchone()
+                    if old is not None:
+                        self._db.execute("DELETE FROM search_docs WHERE doc = ?", old)
+                        if old[0] in docs:
+                            # Indexed earlier in this call, so nothing of it is stored yet
+                            for term, entry in list(postings.items()):
+                                if entry.pop(old[0], None) and not entry:
+                                    del postings[term]
+                        else:
+                            replaced.append(old[0])
+                    self._db.execute("INSERT INTO search_docs (doc, feature_id) VALUES (?, ?)", (doc, feature_id))
+                    docs.append(doc)
+                    for position, term in enumerate(tokens):
+                        entry = postings.setdefault(term, {})
+                        entry.setdefault(doc, []).append(position)
+                if replaced:
+                    self._forget(replaced)
+                for term, entry in postings.items():
+                    self._append(term, entry)
+                self._db.executemany(
+                    "INSERT INTO search_terms (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + ?",
+                    [(term, len(entry), len(entry)) for term, entry in postings.items()])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._changed = True
+        return docs
+
+    def _forget(self, replaced):
+        # Take replaced documents out of the document frequencies of their terms, found by scanning
+        # the postings blocks whose document range covers one of them
+        replaced = np.array(sorted(replaced), dtype=np.int64)
+        counts = collections.Counter()
+        rows = self._db.execute("SELECT term, first_doc, docs, tfs FROM search_postings "
+                                "WHERE first_doc <= ? AND last_doc >= ?", (int(replaced[-1]), int(replaced[0])))
+        for term, first_doc, docs, tfs in rows:
+            found = len(intersect_sorted(decode_blocks([first_doc], [docs], [tfs])[0], replaced))
+            if found:
+                counts[term] += found
+        self._db.executemany("UPDATE search_terms SET df = df - ? WHERE term = ?",
+                             [(count, term) for term, count in counts.items()])
+        self._db.execute("DELETE FROM search_terms WHERE df <= 0")
+
+    def _append(self, term, entry):
+        # entry: doc -> positions, every doc newer than the term's existing postings. New postings
+        # go on the end of the last block while it has room (without decoding it), then into new blocks.
+        docs = list(entry)
+        tfs = [len(positions) for positions in entry.values()]
+        gaps = [position_gaps(positions) for positions in entry.values()]
+        last = self._db.execute(
+            "SELECT first_doc, last_doc, count, docs, tfs, positions FROM search_postings WHERE term = ? "
+            "ORDER BY first_doc DESC LIMIT 1", (term,)).fetchone()
+        start = 0
+        if last is not None and last[2] < BLOCK_SIZE:
+            first_doc, last_doc, count = last[:3]
+            start = min(BLOCK_SIZE - count, len(docs))
+            self._db.execute(
+                "UPDATE search_postings SET last_doc = ?, count = ?, docs = ?, tfs = ?, positions = ? "
+                "WHERE term = ? AND first_doc = ?",
+                (docs[start - 1], count + start,
+                 extend(last[3], [after - before for before, after in zip([last_doc] + docs, docs[:start])]),
+                 extend(last[4], tfs[:start]), extend(last[5], [gap for doc in gaps[:start] for gap in doc]),
+                 term, first_doc))
+        for begin in range(start, len(docs), BLOCK_SIZE):
+            end = min(begin + BLOCK_SIZE, len(docs))
+            block = docs[begin:end]
+            self._db.execute(
+                "INSERT INTO search_postings (term, first_doc, last_doc, count, docs, tfs, positions) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (term, block[0], block[-1], len(block),
+                 pack([after - before for before, after in zip(block[:1] + block, block)]), pack(tfs[begin:end]),
+                 pack([gap for doc in gaps[begin:end] for gap in doc])))
+
+    def _postings(self, term, candidates=None, positions=False, frequency=0):
+        # Documents (and positions) of a term, reading only blocks that can contain a candidate
+        if frequency >= _CACHED_FREQUENCY:
+            return self._cached_postings(term)
+        if candidates is None:
+            rows = self._db.execute(
+                f"SELECT first_doc, docs, tfs{', positions' if positions else ''} FROM search_postings "
+                "WHERE term = ? ORDER BY first_doc", (term,)).fetchall()
+        else:
+            ranges = self._db.execute("SELECT first_doc, last_doc FROM search_postings WHERE term = ? "
+                                      "ORDER BY first_doc", (term,)).fetchall()
+            if not ranges or not len(candidates):
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+            bounds = np.array(ranges, dtype=np.int64)
+            hit = np.searchsorted(candidates, bounds[:, 0]) < np.searchsorted(candidates, bounds[:, 1], side="right")
+            firsts = bounds[hit, 0].tolist()
+            rows = []
+            for start in range(0, len(firsts), _MAX_PARAMS):
+                chunk = firsts[start:start + _MAX_PARAMS]
+                rows.extend(self._db.execute(
+                    f"SELECT first_doc, docs, tfs{', positions' if positions else ''} FROM search_postings "
+                    f"WHERE term = ? AND first_doc IN ({', '.join('?' * len(chunk))}) ORDER BY first_doc",
+                    [term] + chunk).fetchall())
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        columns = list(zip(*rows))
+        return decode_blocks(columns[0], columns[1], columns[2], columns[3] if positions else None)
+
+    def _cached_postings(self, term):
+        # Decoded postings of a frequent term, kept across queries. Postings only ever grow at the
+        # end, so a new last document (the document frequency can stay the same when a re-indexed
+        # submission replaces one) means re-reading from the last cached block on.
+        entry = self._cache.pop(term, None)
+        last = self._db.execute("SELECT last_doc FROM search_postings WHERE term = ? ORDER BY first_doc DESC LIMIT 1",
+                                (term,)).fetchone()
+        if entry is None or entry["last"] != last:
+            tail = entry["tail"] if entry is not None else -1
+            rows = self._db.execute("SELECT first_doc, docs, tfs, positions FROM search_postings "
+                                    "WHERE term = ? AND first_doc >= ? ORDER BY first_doc", (term, tail)).fetchall()
+            if rows:
+                columns = list(zip(*rows))
+                docs, tfs, positions = decode_blocks(*columns)
+                if entry is not None:
+                    keep = np.searchsorted(entry["docs"], tail)
+                    kept_positions = int(entry["tfs"][:keep].sum())
+                    docs = np.concatenate([entry["docs"][:keep], docs])
+                    tfs = np.concatenate([entry["tfs"][:keep], tfs])
+                    positions = np.concatenate([entry["positions"][:kept_positions], positions])
+                entry = {"last": last, "tail": columns[0][-1], "docs": docs, "tfs": tfs,
+                         "positions": positions, "bytes": docs.nbytes + tfs.nbytes + positions.nbytes}
+            elif entry is None:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self._cache[term] = entry
+        self._cache_bytes = sum(item["bytes"] for item in self._cache.values())
+        while self._cache_bytes > _CACHE_BYTES and len(self._cache) > 1:
+            self._cache_bytes -= self._cache.popitem(last=False)[1]["bytes"]
+        return entry["docs"], entry["tfs"], entry["positions"]
+
+    def _phrase(self, words, candidates, frequencies):
+        # Candidates where the words occur consecutively: (doc, position - offset) keys common to every word.
+        # _postings may return whole blocks (or a cached term's every document), so positions of
+        # documents outside the candidates are dropped before keying.
+        keys = None
+        for offset, word in sorted(enumerate(words), key=lambda item: frequencies.get(item[1], 0)):
+            docs, tfs, positions = self._postings(word, candidates, positions=True,
+                                                  frequency=frequencies.get(word, 0))
+            keep = positions >= offset
+            if candidates is not None:
+                keep &= np.repeat(np.isin(docs, candidates, assume_unique=True), tfs)
+            owners = np.repeat(docs, tfs)
+            word_keys = owners[keep] * _POSITION_SPAN + positions[keep] - offset
+            keys = word_keys if keys is None else intersect_sorted(keys, word_keys)
+            owners = keys // _POSITION_SPAN
+            owners = owners[np.concatenate([[True], owners[1:] != owners[:-1]])] if len(owners) else owners
+            candidates = owners if candidates is None else intersect_sorted(candidates, owners)
+            if not len(candidates):
+                break
+        return candidates
+
+    def _frequencies(self, terms):
+        frequencies = {}
+        for start in range(0, len(terms), _MAX_PARAMS):
+            chunk = terms[start:start + _MAX_PARAMS]
+            frequencies.update(self._db.execute(
+                f"SELECT term, df FROM search_terms WHERE term IN ({', '.join('?' * len(chunk))})", chunk))
+        return frequencies
+
+    def _sync_columns(self):
+        # Extend the filter columns with new documents; start over when one was replaced
+        data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if self._columns is not None and data_version == self._data_version and not self._changed:
+            return
+        self._data_version, self._changed = data_version, False
+        count, last = self._db.execute("SELECT COUNT(*), COALESCE(MAX(doc), 0) FROM search_docs").fetchone()
+        if self._columns is not None and count == len(self._columns["doc"]) and last == self._last_doc:
+            return
+        after = self._last_doc if self._columns is not None else 0
+        names = ["topic_mask"] + FILTER_COLUMNS + TEXT_FILTER_COLUMNS
+        query = (f"SELECT d.doc, d.feature_id, {', '.join('f.' + name for name in names)} FROM search_docs d "
+                 "JOIN features f ON f.id = d.feature_id WHERE d.doc > ? ORDER BY d.doc")
+        rows = self._db.execute(query, (after,)).fetchall()
+        if self._columns is not None and len(self._columns["doc"]) + len(rows) != count:
+            self._columns = None
+            rows = self._db.execute(query, (0,)).fetchall()
+        values = list(zip(*rows)) if rows else [()] * (len(names) + 2)
+        added = {"doc": np.array(values[0], dtype=np.int64), "feature_id": np.array(values[1], dtype=np.int64),
+                 "topic_mask": np.array([-1 if v is None else v for v in values[2]], dtype=np.int64)}
+        for name, column in zip(FILTER_COLUMNS, values[3:]):
+            added[name] = np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+        for name, column in zip(TEXT_FILTER_COLUMNS, values[3 + len(FILTER_COLUMNS):]):
+            added[name] = np.array(column, dtype=object)
+        if self._columns is None:
+            self._columns = added
+        else:
+            self._columns = {name: np.concatenate([self._columns[name], added[name]]) for name in added}
+        self._last_doc = last
+        self._topic_bits = {name.lower(): bit for name, bit in self._db.execute("SELECT name, bit FROM topics")}
+
+    def _filter(self, filters):
+        # Boolean mask over the filter columns' rows
+        columns = self._columns
+        mask = np.ones(len(columns["doc"]), dtype=bool)
+        for name, op, value in filters:
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown filter operator '{op}'")
+            compare = OPERATORS[op]
+            if name in FILTER_COLUMNS:
+                column = columns[name]
+                mask &= ~np.isnan(column) & compare(column, float(value))
+            elif name in TEXT_FILTER_COLUMNS:
+                if op not in ("==", "=", "!="):
+                    raise ValueError(f"'{name}' only supports == and !=")
+                mask &= compare(columns[name], str(value))
+            elif name.lower() in {topic.lower() for topic in _TOPICS}:
+                if op not in ("==", "=", "!="):
+                    raise ValueError(f"Topic filters only support == and != (e.g. '{name} == false')")
+                bit = self._topic_bits.get(name.lower())
+                topic_masks = columns["topic_mask"]
+                found = (topic_masks >> bit) & 1 == 1 if bit is not None else np.zeros(len(topic_masks), dtype=bool)
+                # Submissions evaluated without the keyword analyzer match neither way
+                mask &= (topic_masks >= 0) & compare(found, _truth(value))
+            else:
+                raise ValueError(f"Unknown filter '{name}' (use a topic, "
+                                 f"{', '.join(FILTER_COLUMNS + TEXT_FILTER_COLUMNS)})")
+        return mask
+
+    def search(self, query="", filters=None, limit=20, rubric=None):
+        """
+        Stored submissions containing every word and quoted phrase of a query (and none of
+        its '-' words) that pass every filter, newest first.
+
+        Args:
+            query: e.g. 'cricket "my name is" -football' (empty matches every indexed submission)
+            filters: (name, operator, value) tuples or parse_filter() strings; names are topics
+                (value true / false), FILTER_COLUMNS or TEXT_FILTER_COLUMNS
+            limit: Maximum matches returned
+            rubric: Rubric of the total scores shown (defaults to the config rubric)
+
+        Returns:
+            dict with 'count' (all matches) and 'matches' (dicts with feature_id, submission_id,
+            student_name, cohort, source, created_at and total)
+        """
+        terms, phrases, excluded = parse_query(query)
+        filters = [parse_filter(item) if isinstance(item, str) else item for item in filters or []]
+        with self._lock:
+            self._sync_columns()
+            columns = self._columns
+            allowed = self._filter(filters)
+            candidates = columns["doc"][allowed] if filters else None
+            frequencies = self._frequencies(terms + excluded + [word for phrase in phrases for word in phrase])
+            # Rarest first, so later terms only read the blocks that can still match
+            for term in sorted(terms, key=lambda term: frequencies.get(term, 0)):
+                docs = self._postings(term, candidates, frequency=frequencies.get(term, 0))[0]
+                candidates = docs if candidates is None else intersect_sorted(candidates, docs)
+            for phrase in phrases:
+                candidates = self._phrase(phrase, candidates, frequencies)
+            if candidates is None:
+                candidates = columns["doc"]
+            for term in excluded:
+                docs = self._postings(term, candidates, frequency=frequencies.get(term, 0))[0]
+                candidates = difference_sorted(candidates, docs)
+            # Drop documents of replaced submissions and those failing the filters
+            rows = np.searchsorted(columns["doc"], candidates)
+            live = rows < len(columns["doc"])
+            live[live] = columns["doc"][rows[live]] == candidates[live]
+            rows = rows[live]
+            rows = rows[allowed[rows]]
+            newest = columns["feature_id"][rows[::-1][:limit]].tolist()
+        return {"count": int(len(rows)), "matches": self._details(newest, rubric)}
+
+    def _details(self, feature_ids, rubric=None):
+        if not feature_ids:
+            return []
+        fingerprint = (rubric or get_rubric()).fingerprint
+        details = {}
+        for start in range(0, len(feature_ids), _MAX_PARAMS):
+            chunk = feature_ids[start:start + _MAX_PARAMS]
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT f.id, f.submission_id, f.student_name, f.cohort, f.source, f.created_at, s.total "
+                    "FROM features f LEFT JOIN scores s ON s.feature_id = f.id AND s.rubric = ? "
+                    f"WHERE f.id IN ({', '.join('?' * len(chunk))})", [fingerprint] + chunk).fetchall()
+            for row in rows:
+                details[row[0]] = {"feature_id": row[0], "submission_id": row[1], "student_name": row[2],
+                                   "cohort": row[3], "source": row[4], "created_at": row[5], "total": row[6]}
+        return [details[feature_id] for feature_id in feature_ids if feature_id in details]
+
+def _truth(value):
+    if isinstance(value, str):
+        if value.lower() not in ("true", "yes", "1", "false", "no", "0"):
+            raise ValueError(f"Expected true or false, got '{value}'")
+        return value.lower() in ("true", "yes", "1")
+    return bool(value)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_search_index():
+    """Process-wide search index in the feature store's SQLite file"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from src.store.features import get_feature_store
+            # The feature store creates the directory, the file and the features table
+            _index = SearchIndex(get_feature_store().path)
+        return _index
+
+def index_submission(feature_id, tokens):
+    """Add a stored submission's words to the search index (nothing without an id or words)"""
+    if feature_id is None or tokens is None:
+        return None
+    return get_search_index().add(feature_id, tokens)
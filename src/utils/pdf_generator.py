@@ -13,7 +13,12 @@ from reportlab.pdfgen import canvas
 from datetime import datetime
 import io
 
-def generate_pdf_report(student_name, text_input, results, total_score):
+from src.store.percentiles import ordinal
+
+# Score table rows, in order
+SCORE_ROWS = ['salutation', 'keywords', 'flow', 'speech_rate', 'grammar', 'vocabulary', 'filler', 'sentiment']
+
+def generate_pdf_report(student_name, text_input, results, total_score, percentiles=None):
     """
     Generate a professional PDF report
     
@@ -22,6 +27,8 @@ def generate_pdf_report(student_name, text_input, results, total_score):
         text_input: The original introduction text
         results: Dictionary containing all evaluation results
         total_score: Overall score out of 100
+        percentiles: Score category -> percentile within the class
+            (defaults to results.percentiles when results is an EvaluationResult)
         
     Returns:
         BytesIO object containing the PDF
@@ -127,7 +134,21 @@ def generate_pdf_report(student_name, text_input, results, total_score):
         ['', 'Total:', f'{total_score}/100', '']
     ]
     
-    score_table = Table(score_data, colWidths=[2.5*inch, 0.8*inch, 0.8*inch, 1.2*inch])
+    # Where the student stands in the class, when past submissions have been ranked
+    if percentiles is None:
+        percentiles = getattr(results, 'percentiles', None) or {}
+    if any(value is not None for value in percentiles.values()):
+        score_data[0].append('Class Percentile')
+        for row, category in zip(score_data[1:-1], SCORE_ROWS):
+            value = percentiles.get(category)
+            row.append(ordinal(value) if value is not None else '-')
+        total_percentile = percentiles.get('total')
+        score_data[-1].append(ordinal(total_percentile) if total_percentile is not None else '')
+        col_widths = [2.2*inch, 0.7*inch, 0.9*inch, 1.0*inch, 1.2*inch]
+    else:
+        col_widths = [2.5*inch, 0.8*inch, 0.8*inch, 1.2*inch]
+    
+    score_table = Table(score_data, colWidths=col_widths)
     score_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
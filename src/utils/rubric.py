@@ -0,0 +1,131 @@
+"""
+Rubric Module
+Turns raw metrics into rubric scores with breakpoint tables (config.RUBRIC_BANDS) compiled to
+NumPy arrays, so one document and a whole cohort's feature matrix are scored the same way
+"""
+
+import hashlib
+import json
+import threading
+
+import numpy as np
+
+from src import config
+
+# Raw feature behind each banded metric, as stored in that metric's result dict
+METRIC_FEATURES = {
+    "grammar": "g_index",
+    "speech_rate": "wpm",
+    "vocabulary": "ttr",
+    "filler": "rate",
+    "sentiment": "positivity_score"
+}
+
+class ScoreBand:
+    """Breakpoint/score table for one metric"""
+
+    def __init__(self, breakpoints, scores, inclusive="lower"):
+        """
+        Args:
+            breakpoints: Increasing band edges
+            scores: One score per band, len(breakpoints) + 1 of them
+            inclusive: "lower" puts a value equal to a breakpoint in the band above it,
+                "upper" in the band below it
+        """
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.scores = np.asarray(scores)
+        if len(self.scores) != len(self.breakpoints) + 1:
+            raise ValueError("A score band needs exactly one more score than breakpoints")
+        if np.any(np.diff(self.breakpoints) <= 0):
+            raise ValueError("Score band breakpoints must be strictly increasing")
+        if inclusive not in ("lower", "upper"):
+            raise ValueError(f"Unknown inclusive side '{inclusive}', expected 'lower' or 'upper'")
+        self.inclusive = inclusive
+        self._side = "right" if inclusive == "lower" else "left"
+
+    def score(self, values):
+        """Score one value (returns an int) or an array of values (returns an array)"""
+        scores = self.scores[np.searchsorted(self.breakpoints, values, side=self._side)]
+        return scores.item() if scores.ndim == 0 else scores
+
+class Rubric:
+    """
+    Compiled score bands for every metric in a RUBRIC_BANDS-style table, plus the point
+    tables of the content metrics. Anything not given comes from src/config.py.
+    """
+
+    def __init__(self, bands=None, keyword_points=None, salutation_points=None, flow_points=None):
+        # Tables given here may cover only some metrics/levels; the rest keep the config values
+        self.definition = {
+            "bands": dict(config.RUBRIC_BANDS, **(bands or {})),
+            "keyword_points": dict(config.KEYWORD_POINTS, **(keyword_points or {})),
+            "salutation_points": dict(config.SALUTATION_POINTS, **(salutation_points or {})),
+            "flow_points": config.FLOW_POINTS if flow_points is None else flow_points
+        }
+        self.bands = {metric: ScoreBand(**table) for metric, table in self.definition["bands"].items()}
+        self.keyword_points = self.definition["keyword_points"]
+        self.salutation_points = self.definition["salutation_points"]
+        self.flow_points = self.definition["flow_points"]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a rubric from a JSON file with any of the keys bands, keyword_points,
+        salutation_points and flow_points.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        unknown = set(data) - {"bands", "keyword_points", "salutation_points", "flow_points"}
+        if unknown:
+            raise ValueError(f"Unknown rubric keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @property
+    def fingerprint(self):
+        """Short hash identifying this rubric's scoring rules"""
+        payload = json.dumps(self.definition, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def score(self, metric, values):
+        """Score one value or an array of values of one metric"""
+        return self.bands[metric].score(values)
+
+    def score_matrix(self, features, metrics):
+        """
+        Score a feature matrix in one pass per metric.
+
+        Args:
+            features: Array of shape (rows, len(metrics)), one column per metric
+            metrics: Metric name of each column
+
+        Returns:
+            Integer array of the same shape with the score of every cell
+        """
+        features = np.asarray(features, dtype=float)
+        if features.ndim != 2 or features.shape[1] != len(metrics):
+            raise ValueError(f"Expected a (rows, {len(metrics)}) feature matrix, got shape {features.shape}")
+        scores = np.empty(features.shape, dtype=int)
+        for column, metric in enumerate(metrics):
+            scores[:, column] = self.bands[metric].score(features[:, column])
+        return scores
+
+def features_from_results(results, metrics=None):
+    """Raw feature values of the banded metrics in an evaluation result, as metric -> value"""
+    metrics = metrics or list(METRIC_FEATURES)
+    return {metric: results[metric].get(METRIC_FEATURES[metric]) for metric in metrics
+            if isinstance(results.get(metric), dict)}
+
+_rubric = None
+_rubric_lock = threading.Lock()
+
+def get_rubric():
+    """Rubric compiled from config.RUBRIC_BANDS, built on first use"""
+    global _rubric
+    with _rubric_lock:
+        if _rubric is None:
+            _rubric = Rubric()
+        return _rubric
+
+def band_score(metric, value):
+    """Rubric score of one raw metric value"""
+    return get_rubric().score(metric, value)
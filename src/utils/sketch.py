@@ -0,0 +1,124 @@
+"""
+Quantile Sketch Module
+KLL sketch: a mergeable, fixed-size summary of a stream of numbers that answers rank and
+quantile queries within about 1.7/k of the true rank, however many values it has seen
+"""
+
+import math
+import random
+
+import numpy as np
+
+DEFAULT_K = 200
+
+class KLLSketch:
+    """
+    Compactor hierarchy of Karnin, Lang and Liberty (2016). Level h holds items that each
+    stand for 2**h values; a full level is sorted and every other item (random offset)
+    is promoted, which keeps the sketch at O(k) items.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        """
+        Args:
+            k: Accuracy parameter; rank error shrinks and size grows linearly with k
+            seed: Seed for the compaction coin flips (for reproducible sketches)
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self._random = random.Random(seed)
+        self._cdf = None
+
+    def __len__(self):
+        return self.count
+
+    def _capacity(self, level):
+        # Lower levels get geometrically smaller buffers (ratio 2/3), the top level gets k
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    @property
+    def size(self):
+        """Items retained across all levels"""
+        return sum(len(items) for items in self.levels)
+
+    def _compress(self):
+        while self.size > sum(self._capacity(level) for level in range(len(self.levels))):
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                    items.sort()
+                    # An odd item out stays behind at this level
+                    kept = [items.pop()] if len(items) % 2 else []
+                    offset = self._random.getrandbits(1)
+                    self.levels[level + 1].extend(items[offset::2])
+                    self.levels[level] = kept
+                    break
+
+    def update(self, value):
+        """Add one value"""
+        self.levels[0].append(float(value))
+        self.count += 1
+        self._cdf = None
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch's values into this one"""
+        if other.count == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.k = max(self.k, other.k)
+        self._cdf = None
+        self._compress()
+        return self
+
+    def _sorted(self):
+        # Retained items in order with the running weight up to each, rebuilt after updates
+        if self._cdf is None:
+            values = np.array([value for items in self.levels for value in items])
+            weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.int64)
+                                      for level, items in enumerate(self.levels)]) if values.size else \
+                np.zeros(0, dtype=np.int64)
+            order = np.argsort(values, kind="stable")
+            self._cdf = (values[order], np.cumsum(weights[order]))
+        return self._cdf
+
+    def percentile(self, value):
+        """
+        Percentage of values below value, counting values equal to it as half below
+        (None for an empty sketch).
+        """
+        if self.count == 0:
+            return None
+        values, cumulative = self._sorted()
+        total = cumulative[-1]
+        below = np.searchsorted(values, value, side="left")
+        at_or_below = np.searchsorted(values, value, side="right")
+        weight_below = cumulative[below - 1] if below else 0
+        weight_at_or_below = cumulative[at_or_below - 1] if at_or_below else 0
+        return float((weight_below + weight_at_or_below) / 2 / total * 100)
+
+    def quantile(self, q):
+        """Approximate value at quantile q (0 to 1), or None for an empty sketch"""
+        if self.count == 0:
+            return None
+        values, cumulative = self._sorted()
+        index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[min(index, len(values) - 1)])
+
+    def to_dict(self):
+        return {"k": self.k, "count": self.count, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [list(items) for items in data["levels"]] or [[]]
+        return sketch
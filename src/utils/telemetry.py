@@ -0,0 +1,338 @@
+"""
+Telemetry Module
+Per-stage latency histograms, counters, cache hit ratios and memory high-water marks,
+exported as Prometheus text and a JSON snapshot
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src import config
+from src.utils import tracing
+
+# Histogram upper bounds in seconds (Prometheus 'le' labels)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "aie_"
+
+METRIC_HELP = {
+    "stage_seconds": ("histogram", "Wall time per evaluation stage"),
+    "stage_errors_total": ("counter", "Stage calls that raised"),
+    "cache_requests_total": ("counter", "Cache lookups by cache and outcome"),
+    "cache_hit_ratio": ("gauge", "Share of cache lookups that hit"),
+    "coalesced_total": ("counter", "Evaluations served from an identical in-flight call"),
+    "queue_depth": ("gauge", "Work items in flight"),
+    "memory_rss_bytes": ("gauge", "Resident set size of this process"),
+    "memory_peak_bytes": ("gauge", "Peak resident set size of this process"),
+}
+
+def memory_usage():
+    """
+    Current and peak resident memory of this process in bytes.
+    Values the platform does not report are None.
+    """
+    rss = None
+    try:
+        with open("/proc/self/statm", "r") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        if sys.platform != "darwin":
+            peak *= 1024
+    return {"rss_bytes": rss, "peak_bytes": peak}
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0-100) of a list of numbers, or None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """(upper bound, cumulative count) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+class Telemetry:
+    """
+    Process-wide metrics registry.
+
+    Every observation also goes into a bounded ring buffer of recent events, which is what
+    the JSON snapshot (and the admin dashboard reading it) computes percentiles from.
+    """
+
+    def __init__(self, ring_size=None, directory=None):
+        """
+        Args:
+            ring_size: Number of recent events kept for percentiles and the event log
+            directory: Where flush() writes metrics.prom and telemetry.json
+        """
+        self.directory = directory or config.TELEMETRY_DIR
+        self.export = True
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._events = deque(maxlen=ring_size or config.TELEMETRY_RING_SIZE)
+        self._last_flush = 0.0
+        self._trailing_flush = None
+        self.started_at = time.time()
+
+    def observe(self, stage, seconds, error=False):
+        """Record one timed call of stage"""
+        kind = stage.split(".", 1)[0]
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            if error:
+                key = ("stage_errors_total", (("stage", stage),))
+                self._counters[key] = self._counters.get(key, 0) + 1
+            self._events.append({"ts": time.time(), "kind": kind, "stage": stage,
+                                 "seconds": seconds, "error": error})
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def record_cache(self, cache, hit):
+        """Count one lookup in the named cache"""
+        self.increment("cache_requests_total", cache=cache, outcome="hit" if hit else "miss")
+
+    @contextmanager
+    def timer(self, stage):
+        """Context manager timing the enclosed block as one call of stage (and tracing it as a span)"""
+        start = time.perf_counter()
+        error = False
+        try:
+            with tracing.span(stage):
+                yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, error=error)
+
+    def cache_ratios(self):
+        """Hit ratio per cache name"""
+        totals = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                if name != "cache_requests_total":
+                    continue
+                labels = dict(labels)
+                hits, lookups = totals.get(labels["cache"], (0, 0))
+                if labels["outcome"] == "hit":
+                    hits += value
+                totals[labels["cache"]] = (hits, lookups + value)
+        return {cache: hits / lookups if lookups else 0.0 for cache, (hits, lookups) in totals.items()}
+
+    def snapshot(self):
+        """
+        JSON-ready view of every metric.
+
+        Returns:
+            dict with stages (count, sum, max and p50/p95/p99 of recent calls per stage),
+            counters, gauges, cache hit ratios, memory usage and the recent event log
+        """
+        memory = memory_usage()
+        ratios = self.cache_ratios()
+        with self._lock:
+            events = list(self._events)
+            recent = {}
+            for event in events:
+                recent.setdefault(event["stage"], []).append(event["seconds"])
+            stages = {}
+            for stage, histogram in sorted(self._histograms.items()):
+                samples = recent.get(stage, [])
+                stages[stage] = {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "max": histogram.max,
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99)
+                }
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            gauges = [{"name": name, "labels": dict(labels), "value": value}
+                      for (name, labels), value in sorted(self._gauges.items())]
+        return {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "stages": stages,
+            "counters": counters,
+            "gauges": gauges,
+            "cache_hit_ratio": ratios,
+            "memory": memory,
+            "events": events
+        }
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        families = {}
+
+        def add(family, labels, value, suffix=""):
+            families.setdefault(family, []).append(
+                f"{METRIC_PREFIX}{family}{suffix}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+        ratios = self.cache_ratios()
+        memory = memory_usage()
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                for bound, count in histogram.cumulative():
+                    add("stage_seconds", (("stage", stage), ("le", _format_value(bound))), count, "_bucket")
+                add("stage_seconds", (("stage", stage),), histogram.sum, "_sum")
+                add("stage_seconds", (("stage", stage),), histogram.count, "_count")
+            for (name, labels), value in sorted(self._counters.items()):
+                add(name, labels, value)
+            for (name, labels), value in sorted(self._gauges.items()):
+                add(name, labels, value)
+        for cache, ratio in sorted(ratios.items()):
+            add("cache_hit_ratio", (("cache", cache),), ratio)
+        for key, value in memory.items():
+            if value is not None:
+                add(f"memory_{key}", (), value)
+
+        lines = []
+        for family in sorted(families):
+            kind, help_text = METRIC_HELP.get(family, ("untyped", family.replace("_", " ")))
+            lines.append(f"# HELP {METRIC_PREFIX}{family} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}{family} {kind}")
+            lines.extend(families[family])
+        return "\n".join(lines) + "\n"
+
+    def flush(self, force=False):
+        """
+        Write metrics.prom and telemetry.json to the telemetry directory.
+        Calls within config.TELEMETRY_FLUSH_INTERVAL seconds of the last write are deferred
+        to one trailing write at the end of the interval unless force is True, so the files
+        are never more than an interval behind. Does nothing when export is disabled.
+
+        Returns:
+            True if the files were written
+        """
+        if not self.export:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            wait_for = config.TELEMETRY_FLUSH_INTERVAL - (now - self._last_flush)
+            if not force and wait_for > 0:
+                if self._trailing_flush is None:
+                    self._trailing_flush = threading.Timer(wait_for, self._flush_trailing)
+                    self._trailing_flush.daemon = True
+                    self._trailing_flush.start()
+                return False
+            self._last_flush = now
+
+        os.makedirs(self.directory, exist_ok=True)
+        _write_atomic(os.path.join(self.directory, "metrics.prom"), self.to_prometheus())
+        _write_atomic(os.path.join(self.directory, "telemetry.json"), json.dumps(self.snapshot()))
+        return True
+
+    def _flush_trailing(self):
+        with self._lock:
+            self._trailing_flush = None
+        self.flush(force=True)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._events.clear()
+
+def _write_atomic(path, content):
+    # Readers (the dashboard, a Prometheus textfile collector) never see a half-written file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def load_snapshot(directory=None):
+    """Read the last telemetry.json written by flush(), or None if there is none"""
+    path = os.path.join(directory or config.TELEMETRY_DIR, "telemetry.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+def get_telemetry():
+    """Process-wide Telemetry instance"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = Telemetry()
+        return _telemetry
+
+def stage_timer(stage):
+    """Shortcut for get_telemetry().timer(stage)"""
+    return get_telemetry().timer(stage)
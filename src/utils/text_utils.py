@@ -30,3 +30,24 @@ def get_sentences(text):
     sentences = re.split(r'(?<=[.!?])\s+', text)
     return [s.strip() for s in sentences if s.strip()]
 
+
+def sentence_spans(text):
+    """
+    Splits text into sentences the same way as get_sentences, keeping positions.
+    Returns a list of (start_offset, sentence) tuples.
+    """
+    if not text:
+        return []
+    spans = []
+    start = 0
+    for separator in re.finditer(r'(?<=[.!?])\s+', text):
+        spans.append((start, text[start:separator.start()]))
+        start = separator.end()
+    spans.append((start, text[start:]))
+    # Drop empty pieces, keeping offsets of the stripped sentence
+    result = []
+    for offset, sentence in spans:
+        stripped = sentence.strip()
+        if stripped:
+            result.append((offset + len(sentence) - len(sentence.lstrip()), stripped))
+    return result
@@ -0,0 +1,209 @@
+"""
+Tracing Module
+Lightweight parent/child span tracing exported as OpenTelemetry-shaped JSON lines to a rotating file
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from src import config
+
+SERVICE_NAME = "ai-intro-evaluator"
+
+SpanContext = namedtuple("SpanContext", ["trace_id", "span_id"])
+
+# Span the code currently runs under, and the list finished spans are collected into (if any)
+_current_span = contextvars.ContextVar("aie_current_span", default=None)
+_collector = contextvars.ContextVar("aie_span_collector", default=None)
+
+def _new_id(length):
+    return os.urandom(length // 2).hex()
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+class Span:
+    """One timed operation; finished spans are exported (or collected) on end()"""
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.context = SpanContext(parent.trace_id if parent else _new_id(32), _new_id(16))
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self._collector = _collector.get()
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        data = self.to_dict()
+        if self._collector is not None:
+            self._collector.append(data)
+        else:
+            get_exporter().export(data)
+
+    def to_dict(self):
+        """The span in the shape of an OTLP/JSON span, with its resource inlined"""
+        return {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items()],
+            "status": ({"code": "STATUS_CODE_ERROR", "message": self.error} if self.error
+                       else {"code": "STATUS_CODE_OK"}),
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME),
+                                        _attribute("process.pid", os.getpid()),
+                                        _attribute("thread.name", threading.current_thread().name)]}
+        }
+
+class _NoopSpan:
+    context = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class JsonlExporter:
+    """Appends finished spans to a size-rotated JSONL file (path, path.1, ... path.N)"""
+
+    def __init__(self, path=None, max_bytes=None, backup_count=None):
+        self.path = path or config.TRACE_PATH
+        self.max_bytes = max_bytes or config.TRACE_MAX_BYTES
+        self.backup_count = backup_count or config.TRACE_BACKUP_COUNT
+        self.enabled = True
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def _get_logger(self):
+        with self._lock:
+            if self._logger is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes,
+                                              backupCount=self.backup_count, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger(f"aie.tracing.{id(self)}")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                self._logger = logger
+            return self._logger
+
+    def export(self, span_dict):
+        if self.enabled:
+            self._get_logger().info(json.dumps(span_dict, separators=(",", ":")))
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+def get_exporter():
+    """Process-wide span exporter writing to config.TRACE_PATH"""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = JsonlExporter()
+        return _exporter
+
+def current_context():
+    """SpanContext of the active span (picklable, can be handed to another process), or None"""
+    return _current_span.get()
+
+def start_span(name, parent=None, **attributes):
+    """
+    Start a span that the caller ends explicitly with span.end().
+    It does not become the active span; use span() for that.
+
+    Args:
+        name: Span name
+        parent: SpanContext of the parent (defaults to the active span)
+        attributes: Span attributes
+    """
+    if not config.TRACE_ENABLED:
+        return NOOP_SPAN
+    return Span(name, parent or _current_span.get(), attributes)
+
+@contextmanager
+def span(name, **attributes):
+    """Run the enclosed block as a child span of the active span"""
+    if not config.TRACE_ENABLED:
+        yield NOOP_SPAN
+        return
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current.context)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+@contextmanager
+def attach(context):
+    """Make context (e.g. received from another process) the active span context"""
+    token = _current_span.set(context)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+@contextmanager
+def collect_spans():
+    """
+    Collect the spans finished inside the block (including in pool threads started
+    with submit_in_context) into the yielded list instead of exporting them.
+    Worker processes use it to send their spans back to the parent with the result.
+    """
+    spans = []
+    token = _collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _collector.reset(token)
+
+def export_spans(spans):
+    """Export spans collected in another process"""
+    exporter = get_exporter()
+    for span_dict in spans:
+        exporter.export(span_dict)
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """executor.submit that runs fn under a copy of the caller's trace context"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
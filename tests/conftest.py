@@ -0,0 +1,15 @@
+"""
+Test Configuration
+Points every data file the package writes at a temporary directory before src.config is imported
+"""
+
+import os
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="aie-tests-")
+
+os.environ.setdefault("AIE_FEATURE_STORE_PATH", os.path.join(_DATA_DIR, "store", "features.sqlite"))
+os.environ.setdefault("AIE_CACHE_PATH", os.path.join(_DATA_DIR, "cache", "results.sqlite"))
+os.environ.setdefault("AIE_TELEMETRY_DIR", os.path.join(_DATA_DIR, "telemetry"))
+os.environ.setdefault("AIE_PROFILE_DIR", os.path.join(_DATA_DIR, "profiles"))
+os.environ.setdefault("AIE_TRACE_PATH", os.path.join(_DATA_DIR, "traces", "traces.jsonl"))
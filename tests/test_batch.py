@@ -0,0 +1,51 @@
+"""
+Batch Evaluation Tests
+Input normalization, per-record errors and worker processes of batch runs
+"""
+
+import json
+
+import pytest
+
+from src.engine import evaluate_text
+from src.engine.batch import normalize_record, parse_duration, run_batch
+
+@pytest.mark.parametrize("value, expected", [(None, None), ("", None), (" ", None), ("1.5", 1.5), (2, 2.0), ("0", 0.0)])
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+@pytest.mark.parametrize("value", ["abc", "-1", "nan", "inf", [1]])
+def test_parse_duration_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+def test_normalize_record():
+    record = normalize_record({"student_id": 7, "text": "Hi.", "audio_duration": "0.5", "cohort": "8A"}, "row-1")
+    assert record == {"id": "7", "text": "Hi.", "audio_duration": 0.5, "cohort": "8A"}
+    bad = normalize_record({"text": "Hi.", "audio_duration": "abc"}, "row-2")
+    assert bad["id"] == "row-2" and bad["audio_duration"] is None
+    assert bad["error"] == "Invalid input: audio_duration must be a number of minutes, got 'abc'"
+
+def test_bad_duration_becomes_an_error_line(tmp_path):
+    source = tmp_path / "intros.csv"
+    source.write_text('id,text,audio_duration\n'
+                      'a,"Hello, my name is Asha. Thank you.",1.5\n'
+                      'b,"I am Ravi. I like chess.",abc\n'
+                      'c,"I am Meera.",\n', encoding="utf-8")
+    output = str(tmp_path / "results.jsonl")
+    stats = run_batch(str(source), output, workers=1, tier="fast", log=lambda message: None)
+    assert stats["processed"] == 3 and stats["failed"] == 1
+    with open(output, encoding="utf-8") as f:
+        lines = {line["id"]: line for line in map(json.loads, f)}
+    assert "error" not in lines["a"] and "error" not in lines["c"]
+    assert lines["b"]["error"].startswith("Invalid input: audio_duration")
+    assert "results" not in lines["b"]
+
+def test_workers_forked_after_evaluating_in_process(tmp_path):
+    # Starts the shared analyzer thread pool, whose threads forked workers do not inherit
+    for text in ("Hello, my name is Asha. Thank you.", "I am Meera.", "Good morning, I am Ravi."):
+        evaluate_text(text, tier="fast", cache=False)
+    source = tmp_path / "intros.jsonl"
+    source.write_text('{"id": "a", "text": "I am Ravi. I like chess."}\n', encoding="utf-8")
+    stats = run_batch(str(source), str(tmp_path / "results.jsonl"), workers=1, tier="fast", log=lambda message: None)
+    assert stats["processed"] == 1 and stats["failed"] == 0
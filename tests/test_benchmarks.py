@@ -0,0 +1,59 @@
+"""
+Benchmark Suite Tests
+Determinism and shape of the synthetic corpus, and regression detection between runs
+"""
+
+import pytest
+
+from src.analyzers.content import ContentAnalyzer
+from src.analyzers.grammar import GrammarAnalyzer
+from src.benchmarks.corpus import generate_corpus, generate_intro, keyword_topics
+from src.benchmarks.suite import compare_runs, load_run, save_run
+from src.utils.text_utils import tokenize_text
+
+def test_intro_is_deterministic():
+    assert generate_intro(300, filler_rate=0.05, seed=4) == generate_intro(300, filler_rate=0.05, seed=4)
+    assert generate_intro(300, seed=4) != generate_intro(300, seed=5)
+    corpus = generate_corpus(20, 100, seed=7)
+    assert corpus == generate_corpus(20, 100, seed=7)
+    # Distinct texts, so a batch benchmark never hits the result cache
+    assert len(set(corpus)) == 20
+
+@pytest.mark.parametrize("word_count", [100, 1000])
+def test_intro_length_and_filler_rate(word_count):
+    text = generate_intro(word_count, filler_rate=0.05, seed=1)
+    assert len(tokenize_text(text)) == word_count
+    fillers = GrammarAnalyzer(text).count_filler_words()
+    assert fillers["count"] == round(0.05 * word_count)
+    assert GrammarAnalyzer(generate_intro(word_count, filler_rate=0, seed=1)).count_filler_words()["count"] == 0
+
+@pytest.mark.parametrize("coverage", [0, 0.5, 1])
+def test_keyword_coverage(coverage):
+    topics = ContentAnalyzer(generate_intro(200, keyword_coverage=coverage, seed=2)).check_keywords()["topics"]
+    expected = keyword_topics()[:int(round(coverage * len(keyword_topics())))]
+    assert {topic for topic, found in topics.items() if found} == {topic for _, topic in expected}
+
+def _run(**medians):
+    return {"meta": {}, "results": {name: ({"error": "boom"} if median is None else {"median": median})
+                                    for name, median in medians.items()}}
+
+def test_compare_runs_flags_only_real_slowdowns():
+    baseline = _run(fast=0.010, slow=0.010, tiny=0.0001, broken=0.010, removed=0.010, zero=0.0)
+    current = _run(fast=0.0115, slow=0.013, tiny=0.0005, broken=None, added=0.010, zero=0.001)
+    rows = {row["name"]: row for row in compare_runs(baseline, current)}
+    assert set(rows) == {"fast", "slow", "tiny", "zero"}
+    assert rows["slow"]["ratio"] == pytest.approx(1.3) and rows["slow"]["regression"]
+    # 15% slower is within the 20% threshold
+    assert not rows["fast"]["regression"]
+    # Five times slower, but by less than the minimum delta
+    assert not rows["tiny"]["regression"]
+    assert rows["zero"]["ratio"] == float("inf") and rows["zero"]["regression"]
+    stricter = {row["name"]: row for row in compare_runs(baseline, current, threshold=0.1)}
+    assert stricter["fast"]["regression"]
+
+def test_run_round_trip(tmp_path):
+    run = _run(evaluate=0.25)
+    path = str(tmp_path / "nested" / "run.json")
+    save_run(run, path)
+    assert load_run(path) == run
+    assert not any(row["regression"] for row in compare_runs(run, load_run(path)))
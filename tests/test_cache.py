@@ -0,0 +1,143 @@
+"""
+Result Cache Tests
+Cache keys and their invalidation, the two cache tiers, and coalescing of identical evaluations
+"""
+
+import threading
+import time
+
+import pytest
+
+from src import config
+from src.engine import evaluate_text
+from src.engine.cache import ResultCache, duration_bucket, make_cache_key, rubric_fingerprint
+from src.engine.registry import get_analyzer_specs
+from src.engine.result import EvaluationResult
+from src.engine.singleflight import SingleFlight
+
+TEXT = "Hello everyone, my name is Asha. I am 13 years old. I love cricket. Thank you."
+
+# Analyzers that need neither LanguageTool nor a downloaded model
+OFFLINE = ["content", "filler", "sentiment", "metrics"]
+
+class _Spec:
+    def __init__(self, name, version):
+        self.name = name
+        self.version = version
+
+def test_key_ignores_whitespace_but_not_text():
+    specs = get_analyzer_specs()
+    key = make_cache_key(TEXT, None, specs)
+    assert make_cache_key("  " + TEXT.replace(" ", "\n  "), None, specs) == key
+    assert make_cache_key(TEXT + " Bye.", None, specs) != key
+
+def test_key_follows_duration_and_analyzers():
+    specs = get_analyzer_specs()
+    key = make_cache_key(TEXT, None, specs)
+    assert duration_bucket(1.004) == duration_bucket(1.0) == "60"
+    assert make_cache_key(TEXT, 1.004, specs) == make_cache_key(TEXT, 1.0, specs) != key
+    assert make_cache_key(TEXT, None, get_analyzer_specs(OFFLINE)) != key
+    assert make_cache_key(TEXT, None, list(reversed(specs))) == key
+    bumped = [_Spec(spec.name, spec.version + "-next" if spec.name == "grammar" else spec.version) for spec in specs]
+    assert make_cache_key(TEXT, None, bumped) != key
+
+@pytest.mark.parametrize("name, value", [
+    ("RUBRIC_VERSION", "next"),
+    ("FLOW_POINTS", 7),
+    ("RUBRIC_BANDS", dict(config.RUBRIC_BANDS, filler={"breakpoints": [5], "scores": [15, 3], "inclusive": "upper"})),
+    ("FILLER_WORDS", config.FILLER_WORDS + ["basically"])
+])
+def test_rubric_changes_invalidate_keys(monkeypatch, name, value):
+    specs = get_analyzer_specs()
+    fingerprint, key = rubric_fingerprint(), make_cache_key(TEXT, None, specs)
+    monkeypatch.setattr(config, name, value)
+    assert rubric_fingerprint() != fingerprint
+    assert make_cache_key(TEXT, None, specs) != key
+
+def test_memory_tier_is_lru_and_returns_copies():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, EvaluationResult({"filler": {"score": 15}}))
+    first = cache.get("a")
+    assert first.cache_hit and first["filler"]["score"] == 15
+    first["filler"]["score"] = 0
+    assert cache.get("a")["filler"]["score"] == 15
+    cache.put("c", EvaluationResult({}))
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.hits == 3 and cache.misses == 1
+
+def test_disk_tier_survives_restart_until_the_rubric_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / "results.sqlite")
+    ResultCache(path).put("key", EvaluationResult({"sentiment": {"score": 12}}))
+    assert ResultCache(path).get("key")["sentiment"]["score"] == 12
+    monkeypatch.setattr(config, "RUBRIC_VERSION", config.RUBRIC_VERSION + "-next")
+    assert ResultCache(path).get("key") is None
+    monkeypatch.undo()
+    # Entries of the other rubric were deleted when the cache was opened under it
+    assert ResultCache(path).get("key") is None
+
+def test_evaluate_text_hits_cache():
+    cache = ResultCache()
+    first = evaluate_text(TEXT, analyzers=OFFLINE, cache=cache)
+    second = evaluate_text("  " + TEXT, analyzers=OFFLINE, cache=cache)
+    assert not first.cache_hit and second.cache_hit
+    assert second.total_score == first.total_score
+    assert not evaluate_text(TEXT, audio_duration=0.5, analyzers=OFFLINE, cache=cache).cache_hit
+
+def test_single_flight_runs_identical_calls_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def work(value):
+        calls.append(value)
+        release.wait(5)
+        return {"value": value}
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", work, 1))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while flight.coalesced < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert sorted(shared for _, shared in results) == [False] + [True] * 5
+    values = [value for value, _ in results]
+    assert all(value == {"value": 1} for value in values)
+    # Waiters get copies, not the leader's object
+    assert len({id(value) for value in values}) == 6
+    assert flight.in_flight() == 0
+
+def test_single_flight_shares_errors_and_forgets_finished_keys():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("analyzer crashed")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while flight.coalesced < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ["analyzer crashed"] * 3
+    assert flight.do("key", lambda: 42) == (42, False)
@@ -0,0 +1,70 @@
+"""
+Near-Duplicate Tests
+MinHash similarity estimates and the LSH index's threshold and exclusions
+"""
+
+import numpy as np
+
+from src.store.dedup import (
+    NearDuplicateIndex, band_keys, estimated_similarity, shingles, student_key, text_signature
+)
+from src.store.features import FeatureStore
+from src.utils.text_utils import tokenize_text
+
+BASE = ("Good morning everyone. My name is Rohan Mehta and I am fourteen years old. I study in class nine "
+        "at Green Valley School. I live with my parents and my younger sister in Pune. In my free time I "
+        "enjoy playing the guitar, reading mystery novels and going on long cycle rides with my friends. "
+        "My favourite subject is physics because I like to understand how things work. When I grow up I "
+        "want to become an engineer. Thank you for listening.")
+
+OTHER = ("Hello, I am Priya. I am twelve and I love painting and dancing. My family has four members and we "
+         "have a dog named Bruno. I want to be a doctor one day because I like helping people. Thank you.")
+
+def _jaccard(first, second):
+    first, second = shingles(tokenize_text(first)), shingles(tokenize_text(second))
+    return len(first & second) / len(first | second)
+
+def _edit(text, every):
+    # Replace every n-th word, a light rewording of the text
+    words = text.split()
+    return " ".join("changed" if index % every == 0 else word for index, word in enumerate(words, 1))
+
+def test_signature_estimates_jaccard():
+    for every in (5, 10, 20, 40):
+        edited = _edit(BASE, every)
+        estimate = estimated_similarity(text_signature(BASE), text_signature(edited))
+        # 128 permutations: standard error below 0.045
+        assert abs(estimate - _jaccard(BASE, edited)) < 0.15, every
+    assert estimated_similarity(text_signature(BASE), text_signature(BASE.upper())) == 1.0
+    assert text_signature("") is None
+
+def test_band_keys_agree_only_where_bands_agree():
+    signature = text_signature(BASE)
+    changed = signature.copy()
+    changed[0] += 1
+    first, second = band_keys(signature), band_keys(changed)
+    assert len(first) == 32
+    assert first[0] != second[0] and first[1:] == second[1:]
+
+def test_index_threshold_and_exclusions(tmp_path):
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    index = NearDuplicateIndex(path)
+    original = store.record({"word_count": 80}, submission_id="rohan", student_name="Rohan Mehta")
+    index.add(text_signature(BASE), feature_id=original, student=student_key(student_name="Rohan Mehta"))
+    index.add(text_signature(OTHER), template="priya.txt")
+
+    matches = index.query(text_signature(_edit(BASE, 20)))
+    assert [match.get("submission_id") for match in matches] == ["rohan"]
+    assert matches[0]["similarity"] >= 0.5
+    assert index.query(text_signature(_edit(BASE, 2))) == []
+    assert index.query(text_signature(OTHER))[0] == {"similarity": 1.0, "template": "priya.txt"}
+
+    # A student's own earlier attempt, and the submission itself, are not flagged
+    assert index.query(text_signature(BASE), exclude_student=student_key(student_name=" rohan mehta ")) == []
+    assert index.query(text_signature(BASE), exclude_feature=original) == []
+    # Re-adding replaces the old signature and its buckets
+    index.add(text_signature(OTHER), feature_id=original)
+    assert index.query(text_signature(BASE)) == []
+    assert index.count() == 2
+    assert np.all(text_signature(BASE) == text_signature(" ".join(BASE.split())))
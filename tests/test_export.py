@@ -0,0 +1,64 @@
+"""
+Export Tests
+Features and scores written to Parquet and Arrow IPC read back unchanged
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.store.export import EXPORT_SCHEMA, export_format, export_store
+from src.store.features import SCORE_COLUMNS, FeatureStore
+from src.utils.rubric import Rubric, get_rubric
+
+@pytest.fixture
+def store(tmp_path):
+    store = FeatureStore(str(tmp_path / "features.sqlite"))
+    for number in range(25):
+        scores = {column: number % 7 for column in SCORE_COLUMNS}
+        scores["total"] = sum(scores.values())
+        features = {"word_count": 50 + number, "unique_words": 40, "grammar_available": number % 2,
+                    "grammar_rules": ["UPPERCASE_SENTENCE_START"] if number % 3 == 0 else [],
+                    "filler_rate": number / 10, "wpm": 120.5, "topics": ["Name", "Age"] if number % 2 else ["Name"],
+                    "salutation_type": "Normal", "flow_salutation": 0, "flow_name": 5, "flow_details": 9,
+                    "flow_closing": -1, "semantic_similarities": [0.25, 0.5]}
+        store.record(features, scores, submission_id=f"s{number}", student_name=f"Student {number}",
+                     cohort="8A" if number < 20 else None, source="batch")
+    yield store
+    store.close()
+
+def _read(path):
+    if export_format(path) == "arrow":
+        with pa.ipc.open_file(path) as reader:
+            return reader.read_all()
+    return pq.read_table(path)
+
+@pytest.mark.parametrize("name", ["features.parquet", "features.arrow"])
+def test_round_trip(store, tmp_path, name):
+    path = str(tmp_path / name)
+    summary = export_store(store, path, batch_rows=10)
+    assert summary["rows"] == 25 and summary["batches"] == 3
+    table = _read(path)
+    assert table.schema.remove_metadata().equals(EXPORT_SCHEMA.remove_metadata())
+    assert table.schema.metadata[b"rubric"] == get_rubric().fingerprint.encode()
+    rows = {row["submission_id"]: row for row in table.to_pylist()}
+    assert len(rows) == 25
+    row = rows["s3"]
+    assert row["student_name"] == "Student 3" and row["cohort"] == "8A" and row["source"] == "batch"
+    assert row["word_count"] == 53 and row["grammar_available"] is True
+    assert row["grammar_rules"] == ["UPPERCASE_SENTENCE_START"]
+    assert sorted(row["topics"]) == ["Age", "Name"]
+    assert row["filler_rate"] == pytest.approx(0.3)
+    assert row["flow_closing"] == -1
+    assert row["semantic_similarities"] == [0.25, 0.5]
+    assert row["score_total"] == 3 * len(SCORE_COLUMNS)
+    assert rows["s22"]["cohort"] is None and rows["s22"]["grammar_rules"] == []
+
+def test_cohort_and_unscored_rubric(store, tmp_path):
+    path = str(tmp_path / "cohort.parquet")
+    assert export_store(store, path, cohort="8A")["rows"] == 20
+    table = pq.read_table(path)
+    assert set(table.column("cohort").to_pylist()) == {"8A"}
+
+    export_store(store, path, rubric=Rubric(flow_points=9))
+    assert set(pq.read_table(path).column("score_total").to_pylist()) == {None}
@@ -0,0 +1,38 @@
+"""
+Incremental Evaluation Tests
+Results rebuilt from sentence partials against a full evaluation of the same text
+"""
+
+import pytest
+
+from src.engine import evaluate_text
+from src.engine.incremental import IncrementalEvaluator
+
+# Successive edits of one introduction; negations, "but" and emoticons sit next to sentence boundaries
+EDITS = [
+    "I am not. Happy to be here! Thank you.",
+    "Hello everyone, my name is Asha. I am not. Happy to be here! Thank you.",
+    "Hello everyone, my name is Asha. I am 13 years old. I love cricket but I hate running. Thank you.",
+    "Hello everyone, my name is Asha. I am 13 years old. I do not. Love cricket :) Um, thank you.",
+    "Good morning. Myself Asha, from Pune. I never. Liked maths, but science is great! My dream is to fly.",
+    ""
+]
+
+@pytest.mark.parametrize("audio_duration", [None, 0.5])
+def test_edits_match_full_evaluation(audio_duration):
+    evaluator = IncrementalEvaluator(grammar=False)
+    for text in EDITS:
+        incremental = evaluator.update(text, audio_duration)
+        full = evaluate_text(text, audio_duration=audio_duration, tier="fast", cache=False)
+        assert set(incremental) == set(full)
+        for name in full:
+            assert incremental[name] == full[name], (text, name)
+        assert incremental.total_score == full.total_score
+
+def test_unchanged_sentences_are_reused():
+    evaluator = IncrementalEvaluator(grammar=False)
+    evaluator.update(EDITS[1])
+    evaluator.update(EDITS[2])
+    assert evaluator.last_stats["sentences"] == 4
+    # "I am 13 years old." and "I love cricket but I hate running." are new
+    assert evaluator.last_stats["recomputed"] == 2
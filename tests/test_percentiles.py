@@ -0,0 +1,40 @@
+"""
+Percentile Tests
+Cohort sketches count each submission once, however often it is resubmitted
+"""
+
+import sqlite3
+
+from src.engine import evaluate_text
+from src.engine.batch import run_batch
+from src.store.features import get_feature_store, record_evaluation
+from src.utils.rubric import get_rubric
+
+TEXTS = [
+    "Hello everyone, my name is Asha. I am 13 years old. I love cricket. Thank you.",
+    "Good morning. I am Ravi and I like chess. My goal is to become a pilot.",
+    "Hi, I am Meera from Delhi. I have one brother and I want to be a scientist. Thank you."
+]
+
+def _sketch_count(cohort, metric="total"):
+    with sqlite3.connect(get_feature_store().path) as db:
+        row = db.execute("SELECT count FROM sketches WHERE cohort = ? AND rubric = ? AND metric = ?",
+                         (cohort, get_rubric().fingerprint, metric)).fetchone()
+    return row[0] if row else 0
+
+def test_resubmission_is_counted_once():
+    for text in TEXTS:
+        result = evaluate_text(text, tier="fast", cache=False)
+        record_evaluation(text, result, submission_id="resubmitted", cohort="resubmit")
+    assert _sketch_count("resubmit") == 1
+    record_evaluation(TEXTS[0], evaluate_text(TEXTS[0], tier="fast", cache=False), cohort="resubmit")
+    assert _sketch_count("resubmit") == 2
+
+def test_batch_rerun_is_counted_once(tmp_path):
+    source = tmp_path / "intros.jsonl"
+    source.write_text("".join(f'{{"id": "rerun-{number}", "text": "{text}", "cohort": "rerun"}}\n'
+                              for number, text in enumerate(TEXTS)), encoding="utf-8")
+    output = str(tmp_path / "results.jsonl")
+    for _ in range(2):
+        run_batch(str(source), output, workers=1, tier="fast", resume=False, log=lambda message: None)
+        assert _sketch_count("rerun") == len(TEXTS)
@@ -0,0 +1,28 @@
+"""
+Live Preview Tests
+Preview checks of the editor text, recomputed only when the text changes
+"""
+
+from src.engine.incremental import IncrementalEvaluator
+from src.engine.preview import LivePreview
+
+TEXT = "Good morning everyone. Um, my name is Asha and I am 13 years old. I like, um, cricket. Thank you."
+
+def test_preview_checks():
+    preview = LivePreview().update(TEXT)
+    assert preview["word_count"] == 20
+    assert preview["salutation"]["present"] and preview["closing"]
+    assert preview["filler"]["count"] == 3
+    assert "Name" not in preview["keywords"]["missing"] and "Age" not in preview["keywords"]["missing"]
+    assert preview["keywords"]["found"] + len(preview["keywords"]["missing"]) == preview["keywords"]["total"]
+
+def test_recomputed_only_when_the_text_changes():
+    evaluator = IncrementalEvaluator(grammar=False)
+    live_preview = LivePreview(evaluator)
+    first = live_preview.update(TEXT)
+    assert live_preview.update(TEXT) is first
+    edited = live_preview.update(TEXT.replace("cricket", "chess"))
+    assert edited is not first and edited["word_count"] == first["word_count"]
+    # The edit re-analyzed its own sentence, and evaluating reuses every partial
+    evaluator.update(TEXT.replace("cricket", "chess"))
+    assert evaluator.last_stats["recomputed"] == 0
@@ -0,0 +1,72 @@
+"""
+Rankings Tests
+TopK heaps, index-based top/bottom lists against the streamed term review, and outlier ranges
+"""
+
+import random
+
+import pytest
+
+from src.store.features import SCORE_COLUMNS, FeatureStore
+from src.store.rankings import RANKING_CATEGORIES, TopK, find_outliers, term_review, top_and_bottom
+from src.utils.rubric import get_rubric
+
+@pytest.fixture
+def store(tmp_path):
+    """60 scored submissions in two cohorts (and some without one); a third have audio"""
+    store = FeatureStore(str(tmp_path / "features.sqlite"))
+    generator = random.Random(3)
+    for number in range(60):
+        scores = {name: generator.randint(0, 10) for name in SCORE_COLUMNS}
+        scores["total"] = sum(scores.values())
+        audio = number % 3 == 0
+        word_count = 20 + 7 * number
+        features = {"word_count": word_count, "audio_duration": 1.5 if audio else None,
+                    "wpm": word_count / 1.5 if audio else float(word_count),
+                    "topics": [] if number % 5 == 0 else ["Family"]}
+        store.record(features, scores, student_name=f"Student {number}",
+                     cohort=[None, "8A", "8B"][number % 3])
+    yield store
+    store.close()
+
+def test_top_k_keeps_largest_and_earliest_on_ties():
+    heap = TopK(3)
+    for key, item in [(5, "a"), (1, "b"), (9, "c"), (5, "d"), (7, "e"), (0, "f")]:
+        heap.push(key, item)
+    assert heap.items() == ["c", "e", "a"]
+    assert not heap.accepts(5)
+    assert heap.accepts(6)
+
+def test_index_rankings_match_streamed_review(store):
+    review = term_review(store, n=4)
+    assert set(review) == {"", "8A", "8B"}
+    for cohort, categories in review.items():
+        indexed = top_and_bottom(store, n=4, cohorts=[cohort])
+        assert set(categories) == set(RANKING_CATEGORIES)
+        for category, lists in categories.items():
+            for side in ("top", "bottom"):
+                assert [row["score"] for row in lists[side]] == [row["score"] for row in indexed[category][side]]
+    totals = [row["score"] for row in top_and_bottom(store, n=60, categories=["total"])["total"]["top"]]
+    assert totals == sorted(totals, reverse=True) and len(totals) == 60
+
+def test_top_scores_rejects_unknown_category(store):
+    with pytest.raises(ValueError):
+        store.top_scores("spelling", rubric=get_rubric().fingerprint)
+
+def test_fast_speech_only_counts_audio_submissions(store):
+    outliers = find_outliers(store)
+    fast = outliers["fast_speech"]
+    # Text-only word counts run far past 200 but have no measured speaking rate
+    assert fast["count"] == len(fast["rows"]) > 0
+    assert all(row["value"] > 200 for row in fast["rows"])
+    audio_ids = {row["id"] for row in store.feature_range("audio_duration", low=0, limit=1000)}
+    assert {row["id"] for row in fast["rows"]} <= audio_ids
+    assert store.count_range("wpm", low=200, strict=True) > fast["count"]
+
+def test_other_outliers_and_cohort_filter(store):
+    outliers = find_outliers(store, cohorts=["8A"])
+    assert outliers["no_topics"]["count"] == 4
+    assert all(row["cohort"] == "8A" and row["value"] == 0 for row in outliers["no_topics"]["rows"])
+    assert find_outliers(store)["very_short"]["count"] == 2
+    with pytest.raises(ValueError):
+        store.count_range("wpm", low=1, require=("colour",))
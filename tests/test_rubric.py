@@ -0,0 +1,136 @@
+"""
+Rubric Tests
+Score bands against the if/elif ladders they replaced, and rubric loading and fingerprints
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.rubric import Rubric, ScoreBand, band_score, features_from_results
+
+# The ladders of the original analyzers, kept here as the reference
+
+def _grammar(g_index):
+    if g_index > 0.9:
+        return 10
+    if 0.7 <= g_index <= 0.89:
+        return 8
+    if 0.5 <= g_index <= 0.69:
+        return 6
+    if 0.3 <= g_index <= 0.49:
+        return 4
+    return 2
+
+def _speech_rate(wpm):
+    if wpm > 161:
+        return 2
+    if 141 <= wpm <= 160:
+        return 6
+    if 111 <= wpm <= 140:
+        return 10
+    if 81 <= wpm <= 110:
+        return 6
+    return 2
+
+def _vocabulary(ttr):
+    if 0.9 <= ttr <= 1.0:
+        return 10
+    if 0.7 <= ttr <= 0.89:
+        return 8
+    if 0.5 <= ttr <= 0.69:
+        return 6
+    if 0.3 <= ttr <= 0.49:
+        return 4
+    return 2
+
+def _filler(rate):
+    if 0 <= rate <= 3:
+        return 15
+    if 4 <= rate <= 6:
+        return 12
+    if 7 <= rate <= 9:
+        return 9
+    if 10 <= rate <= 12:
+        return 6
+    return 3
+
+def _sentiment(positivity):
+    if positivity >= 0.9:
+        return 15
+    if 0.7 <= positivity <= 0.89:
+        return 12
+    if 0.5 <= positivity <= 0.69:
+        return 9
+    if 0.3 <= positivity <= 0.49:
+        return 6
+    return 3
+
+RATIOS = [round(step / 100, 2) for step in range(0, 101)]
+
+@pytest.mark.parametrize("metric, ladder, values", [
+    # g_index 0.9 fell through every rung of the old ladder to 2; the band gives it 10
+    ("grammar", _grammar, [value for value in RATIOS if value != 0.9]),
+    ("speech_rate", _speech_rate, list(range(0, 301))),
+    ("vocabulary", _vocabulary, RATIOS),
+    ("filler", _filler, list(range(0, 40))),
+    ("sentiment", _sentiment, RATIOS)
+])
+def test_bands_match_old_ladders(metric, ladder, values):
+    for value in values:
+        assert band_score(metric, value) == ladder(value), (metric, value)
+
+def test_ladder_gaps_now_score_their_band():
+    assert band_score("grammar", 0.9) == 10
+    assert band_score("vocabulary", 0.895) == 8
+    assert band_score("filler", 3.5) == 12
+
+def test_score_matrix_matches_single_scores():
+    rubric = Rubric()
+    metrics = ["speech_rate", "vocabulary", "filler"]
+    generator = np.random.default_rng(0)
+    features = np.column_stack([generator.uniform(0, 250, 200), generator.uniform(0, 1, 200),
+                                generator.uniform(0, 20, 200)])
+    scores = rubric.score_matrix(features, metrics)
+    for row in range(len(features)):
+        assert scores[row].tolist() == [rubric.score(metric, features[row, column])
+                                        for column, metric in enumerate(metrics)]
+    with pytest.raises(ValueError):
+        rubric.score_matrix(features[:, :2], metrics)
+
+def test_upper_inclusive_band():
+    band = ScoreBand([3, 6], [15, 12, 9], inclusive="upper")
+    assert band.score(3) == 15
+    assert band.score(3.01) == 12
+    assert band.score(np.array([0, 6, 7])).tolist() == [15, 12, 9]
+
+@pytest.mark.parametrize("breakpoints, scores, inclusive", [
+    ([1, 2], [1, 2], "lower"),
+    ([2, 1], [1, 2, 3], "lower"),
+    ([1, 2], [1, 2, 3], "middle")
+])
+def test_invalid_bands(breakpoints, scores, inclusive):
+    with pytest.raises(ValueError):
+        ScoreBand(breakpoints, scores, inclusive)
+
+def test_fingerprint_follows_definition(tmp_path):
+    default = Rubric()
+    assert Rubric().fingerprint == default.fingerprint
+    stricter = Rubric(bands={"speech_rate": {"breakpoints": [90, 120, 150, 170], "scores": [2, 6, 10, 6, 2],
+                                             "inclusive": "lower"}})
+    assert stricter.fingerprint != default.fingerprint
+    assert stricter.score("speech_rate", 85) == 2
+    assert stricter.score("vocabulary", 0.95) == default.score("vocabulary", 0.95)
+
+    path = tmp_path / "rubric.json"
+    path.write_text(json.dumps({"flow_points": 10}), encoding="utf-8")
+    loaded = Rubric.load(str(path))
+    assert loaded.flow_points == 10 and loaded.fingerprint != default.fingerprint
+    path.write_text(json.dumps({"flow": 10}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        Rubric.load(str(path))
+
+def test_features_from_results():
+    results = {"speech_rate": {"wpm": 120, "score": 10}, "grammar": {"score": 0}, "vocabulary": "n/a"}
+    assert features_from_results(results) == {"speech_rate": 120, "grammar": None}
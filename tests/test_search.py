@@ -0,0 +1,175 @@
+"""
+Search Index Tests
+Term, phrase, exclusion and filter semantics of SearchIndex, checked against a brute-force scan
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.store.features import FeatureStore
+from src.store.search import (
+    SearchIndex, decode_blocks, difference_sorted, extend, intersect_sorted, pack, parse_filter, parse_query,
+    position_gaps, unpack
+)
+from src.utils.text_utils import tokenize_text
+
+SPORTS = ["cricket", "football", "chess", "swimming"]
+
+def _text(number):
+    # Every text has "my name is"; sports and the word "family" vary, so queries combine differently
+    sport = SPORTS[number % len(SPORTS)]
+    family = " I live with my family." if number % 3 == 0 else ""
+    return f"Hello everyone, my name is Student {number}. I am in class 8. I love {sport}.{family}"
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A store and index of n texts, with wpm growing with the text number"""
+    def build(n):
+        path = str(tmp_path / "features.sqlite")
+        store = FeatureStore(path)
+        index = SearchIndex(path)
+        texts = {}
+        for number in range(n):
+            text = _text(number)
+            feature_id = store.record({"word_count": len(tokenize_text(text)), "wpm": 100 + number,
+                                       "topics": ["Hobbies"] if number % 2 else []},
+                                      cohort="8A" if number % 2 else "8B")
+            index.add(feature_id, tokenize_text(text))
+            texts[feature_id] = (number, text)
+        return store, index, texts
+    yield build
+
+def _expected(texts, words=(), phrase=None, excluded=(), wpm_above=None):
+    matches = []
+    for feature_id, (number, text) in texts.items():
+        tokens = tokenize_text(text)
+        joined = " " + " ".join(tokens) + " "
+        if any(word not in tokens for word in words) or any(word in tokens for word in excluded):
+            continue
+        if phrase is not None and f" {phrase} " not in joined:
+            continue
+        if wpm_above is not None and not 100 + number > wpm_above:
+            continue
+        matches.append(feature_id)
+    return sorted(matches, reverse=True)
+
+def _found(index, query, filters=None):
+    result = index.search(query, filters, limit=100000)
+    ids = [match["feature_id"] for match in result["matches"]]
+    assert result["count"] == len(ids)
+    return ids
+
+def test_pack_round_trip_and_extend():
+    values = [0, 3, 255]
+    assert unpack(pack(values)).tolist() == values
+    widened = extend(pack(values), [70000])
+    assert widened[0] == 4
+    assert unpack(widened).tolist() == values + [70000]
+    assert unpack(extend(pack(values), [7])).tolist() == values + [7]
+
+def test_decode_blocks_restarts_deltas_per_block():
+    first = [10, 12, 15]
+    second = [20, 21]
+    positions = [[1, 4], [0], [2, 3, 9], [5], [6, 7]]
+    tfs = [len(item) for item in positions]
+    docs, decoded_tfs, decoded_positions = decode_blocks(
+        [10, 20],
+        [pack([0, 2, 3]), pack([0, 1])],
+        [pack(tfs[:3]), pack(tfs[3:])],
+        [pack([gap for item in positions[:3] for gap in position_gaps(item)]),
+         pack([gap for item in positions[3:] for gap in position_gaps(item)])]
+    )
+    assert docs.tolist() == first + second
+    assert decoded_tfs.tolist() == tfs
+    assert decoded_positions.tolist() == [position for item in positions for position in item]
+
+def test_sorted_set_helpers():
+    first, second = np.array([1, 3, 5, 7]), np.array([3, 4, 7, 9])
+    assert intersect_sorted(first, second).tolist() == [3, 7]
+    assert difference_sorted(first, second).tolist() == [1, 5]
+    assert difference_sorted(first, np.array([], dtype=np.int64)).tolist() == [1, 3, 5, 7]
+
+def test_parse_query_and_filter():
+    assert parse_query('cricket "my name is" -football "solo"') == (
+        ["solo", "cricket"], [["my", "name", "is"]], ["football"])
+    assert parse_filter("wpm > 200") == ("wpm", ">", "200")
+    assert parse_filter("cohort = '8B'") == ("cohort", "=", "8B")
+    with pytest.raises(ValueError):
+        parse_filter("wpm")
+
+@pytest.mark.parametrize("n", [40, 700])
+def test_term_phrase_and_filter_combined(corpus, n):
+    # 700 texts push "my name is" past the cached-postings frequency, whose documents ignore candidates
+    store, index, texts = corpus(n)
+    assert _found(index, 'cricket "my name"') == _expected(texts, ["cricket"], "my name")
+    assert _found(index, '"my name" cricket', ["wpm > 120"]) == _expected(texts, ["cricket"], "my name",
+                                                                          wpm_above=120)
+    assert _found(index, '"live with my family" -chess') == _expected(texts, phrase="live with my family",
+                                                                       excluded=["chess"])
+    assert _found(index, '"name my"') == []
+
+def test_random_queries_match_brute_force(corpus):
+    store, index, texts = corpus(120)
+    generator = random.Random(7)
+    for _ in range(30):
+        words = generator.sample(SPORTS + ["family", "class"], generator.randint(0, 2))
+        phrase = generator.choice([None, "my name is", "i love chess", "with my family"])
+        excluded = generator.sample(SPORTS, generator.randint(0, 1))
+        wpm_above = generator.choice([None, 150])
+        query = " ".join(words + [f'"{phrase}"' if phrase else ""] + [f"-{word}" for word in excluded])
+        filters = [f"wpm > {wpm_above}"] if wpm_above is not None else None
+        if not query.strip() and filters is None:
+            continue
+        assert _found(index, query, filters) == _expected(texts, words, phrase, excluded, wpm_above), query
+
+def test_topic_and_text_filters(corpus):
+    store, index, texts = corpus(20)
+    with_hobbies = [feature_id for feature_id, (number, _) in texts.items() if number % 2]
+    assert sorted(_found(index, "", ["Hobbies == true"])) == with_hobbies
+    assert sorted(_found(index, "", ["cohort == 8A"])) == with_hobbies
+    assert sorted(_found(index, "", ["hobbies == false"])) == sorted(set(texts) - set(with_hobbies))
+    with pytest.raises(ValueError):
+        index.search("", ["wpm ~ 3"])
+    with pytest.raises(ValueError):
+        index.search("", ["colour == red"])
+
+def test_reindexed_submission_matches_new_text_only(tmp_path):
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    index = SearchIndex(path)
+    feature_id = store.record({"word_count": 3}, submission_id="s1")
+    index.add(feature_id, tokenize_text("I love cricket"))
+    index.add(feature_id, tokenize_text("I love chess"))
+    assert _found(index, "cricket") == []
+    assert _found(index, "chess") == [feature_id]
+
+def _document_frequencies(index):
+    return dict(index._db.execute("SELECT term, df FROM search_terms"))
+
+def test_reindexing_keeps_document_frequencies_of_live_documents(tmp_path):
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    index = SearchIndex(path)
+    first, second = (store.record({"word_count": 3}, submission_id=f"s{number}") for number in (1, 2))
+    index.add_many([(first, tokenize_text("I love cricket")), (second, tokenize_text("I love chess"))])
+    index.add(first, tokenize_text("I love football"))
+    # The same submission twice in one call counts once, with its last text
+    index.add_many([(second, tokenize_text("I like chess")), (second, tokenize_text("I like swimming"))])
+    assert _document_frequencies(index) == {"i": 2, "love": 1, "football": 1, "like": 1, "swimming": 1}
+    assert _found(index, "i") == [second, first]
+    assert _found(index, "chess") == [] and _found(index, "swimming") == [second]
+
+def test_cached_postings_follow_a_replacement_with_unchanged_frequency(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.store.search._CACHED_FREQUENCY", 2)
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    index = SearchIndex(path)
+    feature_ids = [store.record({"word_count": 3}, submission_id=f"s{number}") for number in range(3)]
+    for feature_id in feature_ids:
+        index.add(feature_id, tokenize_text("I love cricket"))
+    assert _found(index, "cricket") == feature_ids[::-1]
+    index.add(feature_ids[0], tokenize_text("I love cricket too"))
+    assert _document_frequencies(index)["cricket"] == 3
+    assert _found(index, "cricket") == [feature_ids[0], feature_ids[2], feature_ids[1]]
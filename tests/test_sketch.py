@@ -0,0 +1,67 @@
+"""
+Quantile Sketch Tests
+KLL rank error against exact percentiles, for single and merged sketches
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.sketch import DEFAULT_K, KLLSketch
+
+# Documented rank error of the sketch, in percentile points
+BOUND = 1.7 / DEFAULT_K * 100
+
+def _exact(ordered, value):
+    return np.searchsorted(ordered, value) / len(ordered) * 100
+
+def _max_error(sketch, ordered):
+    queries = np.linspace(ordered[100], ordered[-100], 200)
+    return max(abs(sketch.percentile(value) - _exact(ordered, value)) for value in queries)
+
+def _sketch(values, seed):
+    sketch = KLLSketch(seed=seed)
+    for value in values:
+        sketch.update(value)
+    return sketch
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_percentile_error_within_bound(seed):
+    values = np.random.default_rng(seed).normal(50, 15, 50000)
+    sketch = _sketch(values, seed)
+    assert len(sketch) == len(values)
+    assert sketch.size < 4 * DEFAULT_K
+    assert _max_error(sketch, np.sort(values)) <= BOUND
+
+def test_merged_sketches_within_bound():
+    generator = np.random.default_rng(5)
+    # Two cohorts with different distributions, as when worker sketches are merged
+    first, second = generator.normal(40, 10, 30000), generator.uniform(0, 100, 20000)
+    merged = _sketch(first, 1).merge(_sketch(second, 2))
+    assert len(merged) == 50000
+    assert _max_error(merged, np.sort(np.concatenate([first, second]))) <= BOUND
+
+def test_quantile_rank_error_within_bound():
+    values = np.random.default_rng(9).exponential(20, 50000)
+    ordered = np.sort(values)
+    sketch = _sketch(values, 9)
+    for q in np.linspace(0.01, 0.99, 99):
+        assert abs(np.searchsorted(ordered, sketch.quantile(q)) / len(ordered) - q) <= BOUND / 100
+
+def test_small_sketches_are_exact():
+    sketch = _sketch([10, 20, 30, 40], 0)
+    assert sketch.percentile(5) == 0
+    assert sketch.percentile(20) == 37.5
+    assert sketch.percentile(50) == 100
+    assert sketch.quantile(0.5) == 20
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.percentile(1) is None and sketch.quantile(0.5) is None
+    assert len(KLLSketch().merge(sketch)) == 0
+
+def test_dict_round_trip():
+    sketch = _sketch(np.random.default_rng(3).uniform(0, 10, 5000), 3)
+    restored = KLLSketch.from_dict(sketch.to_dict())
+    assert len(restored) == len(sketch)
+    for value in (1, 5, 9):
+        assert restored.percentile(value) == sketch.percentile(value)
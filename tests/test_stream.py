@@ -0,0 +1,27 @@
+"""
+Streaming Evaluation Tests
+Bad input lines become error lines in input order instead of stopping the stream
+"""
+
+import io
+import json
+
+from src.engine.stream import run_stream
+
+def test_bad_lines_become_error_lines():
+    infile = io.StringIO(
+        '{"id": "a", "transcript": "Hi.", "audio_duration": "abc"}\n'
+        '{"id": "b", "text": "Hello, my name is Asha. Thank you.", "audio_duration": 0.5}\n'
+        'not json\n'
+        '["a", "list"]\n'
+        '{"id": "c", "text": "I am Meera."}\n'
+    )
+    outfile = io.StringIO()
+    assert run_stream(infile, outfile, workers=1, tier="fast") == 5
+    lines = [json.loads(line) for line in outfile.getvalue().splitlines()]
+    assert [line["id"] for line in lines] == ["a", "b", "line-3", "line-4", "c"]
+    assert lines[0]["error"] == "Invalid input: audio_duration must be a number of minutes, got 'abc'"
+    assert lines[2]["error"].startswith("Invalid input:")
+    assert lines[3]["error"] == "Invalid input: expected a JSON object"
+    assert "error" not in lines[1] and "error" not in lines[4]
+    assert lines[1]["total_score"] > 0